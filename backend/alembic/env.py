@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.database import Base
 from app.core.config import settings
-from app.models import User, Supplier, TireInventory, Sales, SalesItem
+from app.models import *  # Import all models, so autogenerate sees every table
 
 config = context.config
 config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
@@ -32,6 +32,12 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 def run_migrations_online() -> None:
+    # A caller may hand over its own connection (e.g. tests migrating a scratch database)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -39,12 +45,15 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        _run_migrations(connection)
+
+def _run_migrations(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
 
-        with context.begin_transaction():
-            context.run_migrations()
+    with context.begin_transaction():
+        context.run_migrations()
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,390 @@
+"""baseline schema
+
+Every table as Base.metadata.create_all built it before migrations were
+introduced. A database created that way keeps its tables: only missing tables
+are created, and the columns the old migrate_sales_discount.py,
+migrate_sales_gst.py and migrate_customers.py scripts added are added and
+backfilled here.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 12:19:12.130406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables a create_all-built database already has are kept as they are
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'customers' not in existing:
+        op.create_table('customers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('mobile', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('visit_count', sa.Integer(), nullable=False),
+        sa.Column('lifetime_spend', sa.Float(), nullable=False),
+        sa.Column('first_visit', sa.DateTime(), nullable=True),
+        sa.Column('last_visit', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_customers_id'), 'customers', ['id'], unique=False)
+        op.create_index(op.f('ix_customers_lifetime_spend'), 'customers', ['lifetime_spend'], unique=False)
+        op.create_index(op.f('ix_customers_mobile'), 'customers', ['mobile'], unique=True)
+        op.create_index(op.f('ix_customers_visit_count'), 'customers', ['visit_count'], unique=False)
+    if 'gst_monthly_snapshots' not in existing:
+        op.create_table('gst_monthly_snapshots',
+        sa.Column('month', sa.String(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('month')
+        )
+    if 'job_runs' not in existing:
+        op.create_table('job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_name', sa.String(), nullable=False),
+        sa.Column('scheduled_for', sa.DateTime(), nullable=False),
+        sa.Column('worker', sa.String(), nullable=False),
+        sa.Column('status', sa.Enum('RUNNING', 'SUCCEEDED', 'FAILED', name='jobrunstatus'), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_name', 'scheduled_for')
+        )
+        op.create_index(op.f('ix_job_runs_id'), 'job_runs', ['id'], unique=False)
+        op.create_index(op.f('ix_job_runs_job_name'), 'job_runs', ['job_name'], unique=False)
+    if 'purchases' not in existing:
+        op.create_table('purchases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('supplier_name', sa.String(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('purchase_date', sa.Date(), nullable=False),
+        sa.Column('payment_status', sa.Enum('PAID', 'PENDING', name='paymentstatus'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_purchases_id'), 'purchases', ['id'], unique=False)
+    if 'suppliers' not in existing:
+        op.create_table('suppliers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('contact_person', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_suppliers_id'), 'suppliers', ['id'], unique=False)
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('role', sa.Enum('ADMIN', 'STAFF', name='userrole'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+        op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    if 'whatsapp_broadcasts' not in existing:
+        op.create_table('whatsapp_broadcasts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('criteria', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'CANCELLED', name='broadcaststatus'), nullable=False),
+        sa.Column('total_recipients', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_whatsapp_broadcasts_id'), 'whatsapp_broadcasts', ['id'], unique=False)
+        op.create_index(op.f('ix_whatsapp_broadcasts_status'), 'whatsapp_broadcasts', ['status'], unique=False)
+    if 'sales' not in existing:
+        op.create_table('sales',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('invoice_id', sa.String(), nullable=False),
+        sa.Column('customer_name', sa.String(), nullable=False),
+        sa.Column('customer_mobile', sa.String(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=True),
+        sa.Column('subtotal', sa.Float(), nullable=False),
+        sa.Column('discount_type', sa.String(), nullable=True),
+        sa.Column('discount_value', sa.Float(), nullable=True),
+        sa.Column('discount_amount', sa.Float(), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('taxable_value', sa.Float(), nullable=True),
+        sa.Column('cgst_amount', sa.Float(), nullable=True),
+        sa.Column('sgst_amount', sa.Float(), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('payment_mode', sa.Enum('CASH', 'UPI', 'CARD', name='paymentmode'), nullable=False),
+        sa.Column('sale_date', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_sales_customer_id'), 'sales', ['customer_id'], unique=False)
+        op.create_index(op.f('ix_sales_id'), 'sales', ['id'], unique=False)
+        op.create_index(op.f('ix_sales_invoice_id'), 'sales', ['invoice_id'], unique=True)
+    if 'tire_inventory' not in existing:
+        op.create_table('tire_inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('brand', sa.String(), nullable=False),
+        sa.Column('tire_size', sa.String(), nullable=False),
+        sa.Column('tire_type', sa.Enum('TUBE', 'TUBELESS', name='tiretype'), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('purchase_price', sa.Float(), nullable=False),
+        sa.Column('selling_price', sa.Float(), nullable=False),
+        sa.Column('supplier_id', sa.Integer(), nullable=True),
+        sa.Column('purchase_date', sa.Date(), nullable=False),
+        sa.Column('hsn_code', sa.String(), nullable=False),
+        sa.Column('gst_rate', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_tire_inventory_brand'), 'tire_inventory', ['brand'], unique=False)
+        op.create_index(op.f('ix_tire_inventory_id'), 'tire_inventory', ['id'], unique=False)
+    if 'whatsapp_broadcast_recipients' not in existing:
+        op.create_table('whatsapp_broadcast_recipients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('broadcast_id', sa.Integer(), nullable=False),
+        sa.Column('mobile', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'SENDING', 'SENT', 'FAILED', 'SKIPPED', name='recipientstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('provider_message_id', sa.String(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['broadcast_id'], ['whatsapp_broadcasts.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('broadcast_id', 'mobile')
+        )
+        op.create_index(op.f('ix_whatsapp_broadcast_recipients_broadcast_id'), 'whatsapp_broadcast_recipients', ['broadcast_id'], unique=False)
+        op.create_index(op.f('ix_whatsapp_broadcast_recipients_id'), 'whatsapp_broadcast_recipients', ['id'], unique=False)
+        op.create_index(op.f('ix_whatsapp_broadcast_recipients_status'), 'whatsapp_broadcast_recipients', ['status'], unique=False)
+    if 'purchase_items' not in existing:
+        op.create_table('purchase_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('purchase_id', sa.Integer(), nullable=False),
+        sa.Column('tire_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('purchase_price', sa.Float(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['purchase_id'], ['purchases.id'], ),
+        sa.ForeignKeyConstraint(['tire_id'], ['tire_inventory.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_purchase_items_id'), 'purchase_items', ['id'], unique=False)
+    if 'sales_items' not in existing:
+        op.create_table('sales_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sale_id', sa.Integer(), nullable=False),
+        sa.Column('tire_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_price', sa.Float(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.Column('hsn_code', sa.String(), nullable=True),
+        sa.Column('gst_rate', sa.Float(), nullable=True),
+        sa.Column('taxable_value', sa.Float(), nullable=True),
+        sa.Column('cgst_amount', sa.Float(), nullable=True),
+        sa.Column('sgst_amount', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['sale_id'], ['sales.id'], ),
+        sa.ForeignKeyConstraint(['tire_id'], ['tire_inventory.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_sales_items_id'), 'sales_items', ['id'], unique=False)
+    if 'whatsapp_outbox' not in existing:
+        op.create_table('whatsapp_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('to_number', sa.String(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('sale_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'SENDING', 'SENT', 'DEAD', name='messagestatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('provider_message_id', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['sale_id'], ['sales.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_whatsapp_outbox_id'), 'whatsapp_outbox', ['id'], unique=False)
+        op.create_index(op.f('ix_whatsapp_outbox_next_attempt_at'), 'whatsapp_outbox', ['next_attempt_at'], unique=False)
+        op.create_index(op.f('ix_whatsapp_outbox_sale_id'), 'whatsapp_outbox', ['sale_id'], unique=False)
+        op.create_index(op.f('ix_whatsapp_outbox_status'), 'whatsapp_outbox', ['status'], unique=False)
+
+
+    _bring_up_legacy_tables(existing)
+
+# Frozen copies of app.core.gst.DEFAULT_HSN_CODE / DEFAULT_GST_RATE
+DEFAULT_HSN_CODE = "4011"
+DEFAULT_GST_RATE = 18.0
+
+# Same rule as app.core.phone.normalize_mobile: digits only, last 10 kept
+NORMALIZED_MOBILE = "RIGHT(regexp_replace(customer_mobile, '[^0-9]', '', 'g'), 10)"
+
+
+def _bring_up_legacy_tables(existing) -> None:
+    """Columns that create_all never added to tables created before them"""
+    if 'sales' not in existing:
+        return
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    postgres = bind.dialect.name == "postgresql"
+
+    def add_missing(table, *columns):
+        present = {column["name"] for column in inspector.get_columns(table)}
+        added = [column.name for column in columns if column.name not in present]
+        for column in columns:
+            if column.name in added:
+                op.add_column(table, column)
+        return added
+
+    # Discounts (was migrate_sales_discount.py)
+    if 'subtotal' in add_missing('sales',
+        sa.Column('subtotal', sa.Float(), server_default='0'),
+        sa.Column('discount_type', sa.String(), nullable=True),
+        sa.Column('discount_value', sa.Float(), server_default='0'),
+        sa.Column('discount_amount', sa.Float(), server_default='0'),
+        sa.Column('notes', sa.String(), nullable=True),
+    ):
+        op.execute("UPDATE sales SET subtotal = total_amount WHERE subtotal = 0 OR subtotal IS NULL")
+
+    # Stored GST (was migrate_sales_gst.py)
+    add_missing('tire_inventory',
+        sa.Column('hsn_code', sa.String(), nullable=False, server_default=DEFAULT_HSN_CODE),
+        sa.Column('gst_rate', sa.Float(), nullable=False, server_default=str(DEFAULT_GST_RATE)),
+    )
+    # A Column belongs to one table, so each table gets its own set
+    def tax_columns():
+        return [sa.Column(name, sa.Float(), nullable=True) for name in ('taxable_value', 'cgst_amount', 'sgst_amount')]
+    add_missing('sales', *tax_columns())
+    add_missing('sales_items',
+        sa.Column('hsn_code', sa.String(), nullable=True),
+        sa.Column('gst_rate', sa.Float(), nullable=True),
+        *tax_columns()
+    )
+
+    # Customers (was migrate_customers.py); the table itself is created above
+    if 'customer_id' in add_missing('sales', sa.Column('customer_id', sa.Integer(), nullable=True)):
+        op.create_index(op.f('ix_sales_customer_id'), 'sales', ['customer_id'], unique=False)
+        if postgres:
+            op.create_foreign_key('sales_customer_id_fkey', 'sales', 'customers', ['customer_id'], ['id'])
+
+    # The backfills use Postgres SQL; development SQLite databases are reseeded instead
+    if not postgres:
+        return
+
+    # GST per line, the sale discount spread in proportion to line value, then sale totals
+    op.execute("""
+        UPDATE sales_items si
+        SET hsn_code = t.hsn_code,
+            gst_rate = t.gst_rate,
+            taxable_value = ROUND((si.total_price * CASE
+                WHEN s.subtotal > 0 THEN (s.subtotal - COALESCE(s.discount_amount, 0)) / s.subtotal
+                ELSE 1 END)::numeric, 2)
+        FROM sales s, tire_inventory t
+        WHERE s.id = si.sale_id AND t.id = si.tire_id AND si.taxable_value IS NULL
+    """)
+    op.execute("""
+        UPDATE sales_items
+        SET cgst_amount = ROUND((taxable_value * gst_rate / 200)::numeric, 2),
+            sgst_amount = ROUND((taxable_value * gst_rate / 200)::numeric, 2)
+        WHERE cgst_amount IS NULL AND taxable_value IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE sales s
+        SET taxable_value = agg.taxable_value,
+            cgst_amount = agg.cgst_amount,
+            sgst_amount = agg.sgst_amount
+        FROM (
+            SELECT sale_id,
+                   SUM(taxable_value) AS taxable_value,
+                   SUM(cgst_amount) AS cgst_amount,
+                   SUM(sgst_amount) AS sgst_amount
+            FROM sales_items
+            GROUP BY sale_id
+        ) agg
+        WHERE agg.sale_id = s.id AND s.taxable_value IS NULL
+    """)
+
+    # One customer per normalised mobile, named after their latest sale
+    op.execute(f"""
+        INSERT INTO customers (mobile, name, visit_count, lifetime_spend, first_visit, last_visit)
+        SELECT mobile,
+               (ARRAY_AGG(customer_name ORDER BY sale_date DESC))[1],
+               COUNT(*),
+               COALESCE(SUM(total_amount), 0),
+               MIN(sale_date),
+               MAX(sale_date)
+        FROM (
+            SELECT {NORMALIZED_MOBILE} AS mobile, customer_name, total_amount, sale_date
+            FROM sales
+            WHERE customer_id IS NULL
+        ) s
+        WHERE mobile <> ''
+        GROUP BY mobile
+        ON CONFLICT (mobile) DO NOTHING
+    """)
+    op.execute(f"""
+        UPDATE sales
+        SET customer_id = c.id
+        FROM customers c
+        WHERE sales.customer_id IS NULL AND c.mobile = {NORMALIZED_MOBILE}
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_whatsapp_outbox_status'), table_name='whatsapp_outbox')
+    op.drop_index(op.f('ix_whatsapp_outbox_sale_id'), table_name='whatsapp_outbox')
+    op.drop_index(op.f('ix_whatsapp_outbox_next_attempt_at'), table_name='whatsapp_outbox')
+    op.drop_index(op.f('ix_whatsapp_outbox_id'), table_name='whatsapp_outbox')
+    op.drop_table('whatsapp_outbox')
+    op.drop_index(op.f('ix_sales_items_id'), table_name='sales_items')
+    op.drop_table('sales_items')
+    op.drop_index(op.f('ix_purchase_items_id'), table_name='purchase_items')
+    op.drop_table('purchase_items')
+    op.drop_index(op.f('ix_whatsapp_broadcast_recipients_status'), table_name='whatsapp_broadcast_recipients')
+    op.drop_index(op.f('ix_whatsapp_broadcast_recipients_id'), table_name='whatsapp_broadcast_recipients')
+    op.drop_index(op.f('ix_whatsapp_broadcast_recipients_broadcast_id'), table_name='whatsapp_broadcast_recipients')
+    op.drop_table('whatsapp_broadcast_recipients')
+    op.drop_index(op.f('ix_tire_inventory_id'), table_name='tire_inventory')
+    op.drop_index(op.f('ix_tire_inventory_brand'), table_name='tire_inventory')
+    op.drop_table('tire_inventory')
+    op.drop_index(op.f('ix_sales_invoice_id'), table_name='sales')
+    op.drop_index(op.f('ix_sales_id'), table_name='sales')
+    op.drop_index(op.f('ix_sales_customer_id'), table_name='sales')
+    op.drop_table('sales')
+    op.drop_index(op.f('ix_whatsapp_broadcasts_status'), table_name='whatsapp_broadcasts')
+    op.drop_index(op.f('ix_whatsapp_broadcasts_id'), table_name='whatsapp_broadcasts')
+    op.drop_table('whatsapp_broadcasts')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_suppliers_id'), table_name='suppliers')
+    op.drop_table('suppliers')
+    op.drop_index(op.f('ix_purchases_id'), table_name='purchases')
+    op.drop_table('purchases')
+    op.drop_index(op.f('ix_job_runs_job_name'), table_name='job_runs')
+    op.drop_index(op.f('ix_job_runs_id'), table_name='job_runs')
+    op.drop_table('job_runs')
+    op.drop_table('gst_monthly_snapshots')
+    op.drop_index(op.f('ix_customers_visit_count'), table_name='customers')
+    op.drop_index(op.f('ix_customers_mobile'), table_name='customers')
+    op.drop_index(op.f('ix_customers_lifetime_spend'), table_name='customers')
+    op.drop_index(op.f('ix_customers_id'), table_name='customers')
+    op.drop_table('customers')
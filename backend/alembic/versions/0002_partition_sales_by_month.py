@@ -0,0 +1,197 @@
+"""partition sales by month
+
+Copies the sale date onto sales_items, then (Postgres only) rebuilds sales
+and sales_items as tables range-partitioned by month of sale_date:
+
+- Partition keys must be part of every unique constraint, so the keys become
+  (id, sale_date) and sales can no longer keep invoice_id unique on its own.
+  Every issued invoice id is recorded in the unpartitioned invoice_numbers
+  table instead (on every dialect), whose primary key rejects duplicates.
+- sales_items references sales through (sale_id, sale_date), which lets a
+  month of items be detached together with its month of sales.
+- whatsapp_outbox loses its foreign key to sales: a partitioned table can only
+  be referenced through its full key.
+
+create_sales_partitions(from, through) creates the monthly partitions of both
+tables; the sales_partitions scheduled job keeps months ahead of today ready.
+Sales outside every monthly partition go to sales_default and
+sales_items_default until their month is created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 13:02:44.512731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.core.config import settings
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_sales_partitions(from_month date, through_month date)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month);
+    month_end date;
+    suffix text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= through_month LOOP
+        suffix := to_char(month_start, '"y"YYYY"m"MM');
+        month_end := month_start + interval '1 month';
+        IF to_regclass('public.sales_' || suffix) IS NULL THEN
+            -- Sales that landed in the default partitions while this month was
+            -- missing must leave them before the month can be attached
+            CREATE TEMP TABLE IF NOT EXISTS pending_sales_items (LIKE public.sales_items) ON COMMIT DROP;
+            CREATE TEMP TABLE IF NOT EXISTS pending_sales (LIKE public.sales) ON COMMIT DROP;
+            WITH moved AS (
+                DELETE FROM public.sales_items_default
+                WHERE sale_date >= month_start AND sale_date < month_end RETURNING *
+            ) INSERT INTO pending_sales_items SELECT * FROM moved;
+            WITH moved AS (
+                DELETE FROM public.sales_default
+                WHERE sale_date >= month_start AND sale_date < month_end RETURNING *
+            ) INSERT INTO pending_sales SELECT * FROM moved;
+
+            EXECUTE format(
+                'CREATE TABLE public.%I PARTITION OF public.sales FOR VALUES FROM (%L) TO (%L)',
+                'sales_' || suffix, month_start, month_end
+            );
+            EXECUTE format(
+                'CREATE TABLE public.%I PARTITION OF public.sales_items FOR VALUES FROM (%L) TO (%L)',
+                'sales_items_' || suffix, month_start, month_end
+            );
+
+            INSERT INTO public.sales SELECT * FROM pending_sales;
+            INSERT INTO public.sales_items SELECT * FROM pending_sales_items;
+            TRUNCATE pending_sales, pending_sales_items;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("sales_items")}
+    if "sale_date" not in columns:
+        op.add_column('sales_items', sa.Column('sale_date', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE sales_items SET sale_date = "
+        "(SELECT sales.sale_date FROM sales WHERE sales.id = sales_items.sale_id) "
+        "WHERE sale_date IS NULL"
+    )
+
+    op.create_table(
+        'invoice_numbers',
+        sa.Column('invoice_id', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('invoice_id')
+    )
+    op.execute("INSERT INTO invoice_numbers (invoice_id) SELECT invoice_id FROM sales")
+
+    if bind.dialect.name != "postgresql":
+        return  # SQLite in development keeps plain tables
+
+    op.alter_column('sales_items', 'sale_date', nullable=False)
+    op.execute("ALTER TABLE whatsapp_outbox DROP CONSTRAINT IF EXISTS whatsapp_outbox_sale_id_fkey")
+
+    sales_seq = bind.execute(sa.text("SELECT pg_get_serial_sequence('sales', 'id')")).scalar()
+    items_seq = bind.execute(sa.text("SELECT pg_get_serial_sequence('sales_items', 'id')")).scalar()
+
+    op.execute("ALTER TABLE sales_items RENAME TO sales_items_unpartitioned")
+    op.execute("ALTER TABLE sales RENAME TO sales_unpartitioned")
+
+    # LIKE copies columns (in order), NOT NULLs and defaults, including the id sequences
+    op.execute("CREATE TABLE sales (LIKE sales_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (sale_date)")
+    op.execute("ALTER TABLE sales ADD CONSTRAINT pk_sales PRIMARY KEY (id, sale_date)")
+    op.execute("ALTER TABLE sales ADD CONSTRAINT uq_sales_invoice_id UNIQUE (invoice_id, sale_date)")
+    op.execute("ALTER TABLE sales ADD CONSTRAINT fk_sales_customer FOREIGN KEY (customer_id) REFERENCES customers (id)")
+
+    op.execute("CREATE TABLE sales_items (LIKE sales_items_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (sale_date)")
+    op.execute("ALTER TABLE sales_items ADD CONSTRAINT pk_sales_items PRIMARY KEY (id, sale_date)")
+    op.execute(
+        "ALTER TABLE sales_items ADD CONSTRAINT fk_sales_items_sale FOREIGN KEY (sale_id, sale_date) "
+        "REFERENCES sales (id, sale_date) ON DELETE CASCADE"
+    )
+    op.execute(
+        "ALTER TABLE sales_items ADD CONSTRAINT fk_sales_items_tire FOREIGN KEY (tire_id) "
+        "REFERENCES tire_inventory (id)"
+    )
+
+    # Catch-all for sales outside every monthly partition (say the partition job
+    # stopped running), so they are still accepted; creating their month later
+    # moves them out
+    op.execute("CREATE TABLE sales_default PARTITION OF sales DEFAULT")
+    op.execute("CREATE TABLE sales_items_default PARTITION OF sales_items DEFAULT")
+
+    op.execute(CREATE_PARTITIONS_FUNCTION)
+    op.execute(
+        "SELECT create_sales_partitions("
+        "COALESCE((SELECT min(sale_date) FROM sales_unpartitioned), now())::date, "
+        f"(now() + interval '{settings.SALES_PARTITION_MONTHS_AHEAD} months')::date)"
+    )
+
+    op.execute("INSERT INTO sales SELECT * FROM sales_unpartitioned")
+    op.execute("INSERT INTO sales_items SELECT * FROM sales_items_unpartitioned")
+
+    # Keep the id sequences when their original tables go
+    op.execute(f"ALTER SEQUENCE {sales_seq} OWNED BY sales.id")
+    op.execute(f"ALTER SEQUENCE {items_seq} OWNED BY sales_items.id")
+    op.execute("DROP TABLE sales_items_unpartitioned")
+    op.execute("DROP TABLE sales_unpartitioned")
+
+    # Indexes on a partitioned table are created on every partition, present and future
+    op.create_index('ix_sales_id', 'sales', ['id'])
+    op.create_index('ix_sales_invoice_id', 'sales', ['invoice_id'])
+    op.create_index('ix_sales_customer_id', 'sales', ['customer_id'])
+    op.create_index('ix_sales_sale_date', 'sales', ['sale_date'])
+    op.create_index('ix_sales_items_id', 'sales_items', ['id'])
+    op.create_index('ix_sales_items_sale_id', 'sales_items', ['sale_id'])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        sales_seq = bind.execute(sa.text("SELECT pg_get_serial_sequence('sales', 'id')")).scalar()
+        items_seq = bind.execute(sa.text("SELECT pg_get_serial_sequence('sales_items', 'id')")).scalar()
+
+        # Months already archived stay in sales_archive as plain tables
+        op.execute("DROP VIEW IF EXISTS sales_archive.sales, sales_archive.sales_items")
+        op.execute("ALTER TABLE sales_items RENAME TO sales_items_partitioned")
+        op.execute("ALTER TABLE sales RENAME TO sales_partitioned")
+        op.execute("CREATE TABLE sales (LIKE sales_partitioned INCLUDING DEFAULTS)")
+        op.execute("CREATE TABLE sales_items (LIKE sales_items_partitioned INCLUDING DEFAULTS)")
+        op.execute("INSERT INTO sales SELECT * FROM sales_partitioned")
+        op.execute("INSERT INTO sales_items SELECT * FROM sales_items_partitioned")
+        op.execute(f"ALTER SEQUENCE {sales_seq} OWNED BY sales.id")
+        op.execute(f"ALTER SEQUENCE {items_seq} OWNED BY sales_items.id")
+        op.execute("DROP TABLE sales_items_partitioned")
+        op.execute("DROP TABLE sales_partitioned")
+        op.execute("DROP FUNCTION IF EXISTS create_sales_partitions(date, date)")
+
+        op.create_primary_key('sales_pkey', 'sales', ['id'])
+        op.create_index('ix_sales_id', 'sales', ['id'])
+        op.create_index('ix_sales_invoice_id', 'sales', ['invoice_id'], unique=True)
+        op.create_index('ix_sales_customer_id', 'sales', ['customer_id'])
+        op.create_foreign_key('sales_customer_id_fkey', 'sales', 'customers', ['customer_id'], ['id'])
+        op.create_primary_key('sales_items_pkey', 'sales_items', ['id'])
+        op.create_index('ix_sales_items_id', 'sales_items', ['id'])
+        op.create_foreign_key('sales_items_sale_id_fkey', 'sales_items', 'sales', ['sale_id'], ['id'])
+        op.create_foreign_key('sales_items_tire_id_fkey', 'sales_items', 'tire_inventory', ['tire_id'], ['id'])
+        # NOT VALID: messages may point at sales of archived months
+        op.execute(
+            "ALTER TABLE whatsapp_outbox ADD CONSTRAINT whatsapp_outbox_sale_id_fkey "
+            "FOREIGN KEY (sale_id) REFERENCES sales (id) NOT VALID"
+        )
+
+    op.drop_table('invoice_numbers')
+    op.drop_column('sales_items', 'sale_date')
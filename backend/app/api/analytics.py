@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+from app.core.database import get_db
+from app.schemas.analytics import PeriodComparison, TopProductsResponse, SalesHeatmap
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+@router.get("/compare", response_model=PeriodComparison)
+def compare_periods(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    previous_start: Optional[date] = Query(default=None),
+    previous_end: Optional[date] = Query(default=None),
+    db: Session = Depends(get_db)
+):
+    analytics_service = AnalyticsService(db)
+    return analytics_service.compare_periods(start_date, end_date, previous_start, previous_end)
+
+@router.get("/top-products", response_model=TopProductsResponse)
+def get_top_products(
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    dimension: str = Query("sku", pattern="^(sku|brand|size)$"),
+    by: str = Query("revenue", pattern="^(units|revenue|profit)$"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    analytics_service = AnalyticsService(db)
+    return analytics_service.get_top_products(start_date, end_date, dimension, by, limit)
+
+@router.get("/heatmap", response_model=SalesHeatmap)
+def get_sales_heatmap(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: Session = Depends(get_db)
+):
+    analytics_service = AnalyticsService(db)
+    return analytics_service.get_sales_heatmap(start_date, end_date)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+from app.core.database import get_db
+from app.schemas.customer import CustomerResponse
+from app.services.customer_service import CustomerService
+
+router = APIRouter(prefix="/customers", tags=["Customers"])
+
+@router.get("/top", response_model=List[CustomerResponse])
+def get_top_customers(
+    limit: int = Query(10, ge=1, le=500),
+    by: str = Query("spend", pattern="^(spend|visits)$"),
+    db: Session = Depends(get_db)
+):
+    customer_service = CustomerService(db)
+    return customer_service.get_top_customers(limit, by)
+
+@router.get("/{mobile}", response_model=CustomerResponse)
+def get_customer(
+    mobile: str,
+    db: Session = Depends(get_db)
+):
+    customer_service = CustomerService(db)
+    return customer_service.get_customer_by_mobile(mobile)
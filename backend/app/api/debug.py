@@ -1,10 +1,28 @@
 from fastapi import APIRouter
 from sqlalchemy import text
-from app.core.database import SessionLocal, engine
+from app.core.database import SessionLocal, engine, async_engine, read_engine
+from app.core.pool_metrics import pool_status
 import traceback
 
 router = APIRouter(prefix="/debug", tags=["Debug"])
 
+@router.get("/pool")
+def connection_pool_status():
+    """
+    Connection pool occupancy and checkout stats for this worker process.
+    
+    checked_out / overflow_in_use show current load; a rising wait_ms_avg,
+    wait_ms_max or any timeouts mean requests are queuing for connections and
+    DB_POOL_SIZE / DB_MAX_OVERFLOW should grow (within the server's limit).
+    """
+    pools = {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine)
+    }
+    if read_engine is not engine:
+        pools["read_replica"] = pool_status(read_engine)
+    return pools
+
 @router.get("/db_status")
 def database_status():
     """
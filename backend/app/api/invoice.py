@@ -1,50 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from datetime import date
 from app.core.database import get_db
 from app.services.invoice_service import InvoiceService
-from app.services.whatsapp_service import WhatsAppService
-import os
+from app.services.invoice_batch import stream_invoice_zip
+from app.services.receipt_template import RECEIPT_WIDTHS
+from app.services.whatsapp_outbox_service import WhatsAppOutboxService
+from app.schemas.whatsapp import WhatsAppMessageResponse
 
 router = APIRouter(prefix="/invoice", tags=["Invoice"])
 
 @router.get("/generate/{sale_id}")
 def generate_invoice(
     sale_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
+    # Weak validators (W/"...") match too: If-None-Match uses weak comparison
+    cached_digests = [
+        tag.strip().removeprefix("W/").strip('"')
+        for tag in request.headers.get("if-none-match", "").split(",")
+        if tag.strip()
+    ]
     invoice_service = InvoiceService(db)
-    filename = invoice_service.generate_invoice_pdf(sale_id)
+    invoice = invoice_service.get_invoice_pdf(sale_id, cached_digests)
     
-    if not os.path.exists(filename):
-        raise HTTPException(status_code=404, detail="Invoice file not found")
+    # The digest covers sale contents, shop config and template version
+    headers = {"ETag": f'"{invoice.digest}"', "Cache-Control": "private, no-cache"}
+    if invoice.not_modified:
+        return Response(status_code=304, headers=headers)
     
-    return FileResponse(
-        filename,
+    headers["Content-Disposition"] = f'attachment; filename="invoice_{invoice.invoice_id}.pdf"'
+    return StreamingResponse(
+        invoice_service.iter_invoice_pdf(invoice),
         media_type='application/pdf',
-        filename=os.path.basename(filename)
+        headers=headers
     )
 
-@router.post("/send-whatsapp/{sale_id}")
-def send_invoice_whatsapp(
+@router.get("/receipt/{sale_id}")
+def get_receipt(
     sale_id: int,
-    customer_mobile: str,
+    format: str = Query("text", pattern="^(text|escpos)$"),
+    width: int = Query(48, description="Characters per line: 40 (58mm) or 48 (80mm)"),
     db: Session = Depends(get_db)
 ):
-    # Generate invoice first
-    invoice_service = InvoiceService(db)
-    filename = invoice_service.generate_invoice_pdf(sale_id)
+    if width not in RECEIPT_WIDTHS:
+        raise HTTPException(status_code=400, detail="width must be 40 or 48")
     
-    # Get sale details for invoice ID
-    from app.repositories.sales_repository import SalesRepository
-    sales_repo = SalesRepository(db)
-    sale = sales_repo.get_by_id(sale_id)
+    invoice_service = InvoiceService(db)
+    content = invoice_service.get_receipt(sale_id, format, width)
     
-    if not sale:
-        raise HTTPException(status_code=404, detail="Sale not found")
+    if format == "escpos":
+        return Response(content, media_type="application/octet-stream")
+    return Response(content, media_type="text/plain")
+
+@router.get("/batch")
+def download_invoice_batch(
+    start: date = Query(...),
+    end: date = Query(...),
+    db: Session = Depends(get_db)
+):
+    """ZIP of every invoice for sales between start and end (inclusive)"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
     
-    # Send via WhatsApp
-    whatsapp_service = WhatsAppService()
-    result = whatsapp_service.send_invoice(customer_mobile, filename, sale.invoice_id)
+    # Plan while the session is open; the ZIP is streamed after it closes
+    invoice_service = InvoiceService(db)
+    entries = invoice_service.plan_batch(start, end)
     
-    return result
+    return StreamingResponse(
+        stream_invoice_zip(entries, invoice_service.shop_config, invoice_service.storage),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="invoices_{start}_{end}.zip"'}
+    )
+
+@router.post("/send-whatsapp/{sale_id}", response_model=WhatsAppMessageResponse, status_code=202)
+def send_invoice_whatsapp(
+    sale_id: int,
+    customer_mobile: str,
+    db: Session = Depends(get_db)
+):
+    """Queue the invoice for WhatsApp delivery; poll /whatsapp/messages/{id} for the outcome"""
+    outbox_service = WhatsAppOutboxService(db)
+    return outbox_service.queue_invoice(sale_id, customer_mobile)
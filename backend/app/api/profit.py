@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.schemas.profit import ProfitSummary, SaleProfitDetail, DailyClosingReport
 from app.services.profit_service import ProfitService
 
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/profit", tags=["Profit"])
 
 @router.get("/summary", response_model=ProfitSummary)
 def get_profit_summary(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     profit_service = ProfitService(db)
     return profit_service.get_profit_summary()
@@ -19,7 +19,7 @@ def get_profit_summary(
 def get_profit_details(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     profit_service = ProfitService(db)
     return profit_service.get_sale_profit_details(skip, limit)
@@ -27,7 +27,7 @@ def get_profit_details(
 @router.get("/daily-closing", response_model=DailyClosingReport)
 def get_daily_closing_report(
     report_date: date = Query(default=None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     profit_service = ProfitService(db)
     return profit_service.get_daily_closing_report(report_date)
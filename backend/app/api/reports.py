@@ -1,27 +1,79 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
-from app.core.database import get_db
+import os
+from app.core.database import get_db, get_read_db
 from app.schemas.sales import SalesResponse
 from app.schemas.inventory import TireInventoryResponse
+from app.schemas.gst import GstMonthlySummary
+from app.schemas.report_job import ReportJobSpec, ReportJobStatus
 from app.services.sales_service import SalesService
 from app.services.inventory_service import InventoryService
+from app.services.report_export_service import ReportExportService, XLSX_MEDIA_TYPE
+from app.services.gst_service import GstService
+from app.services.report_job_service import report_jobs
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+def _xlsx_response(path: str, filename: str) -> FileResponse:
+    # The workbook is a temp file; remove it once it has been sent
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=filename,
+        background=BackgroundTask(os.remove, path)
+    )
+
 @router.get("/sales", response_model=List[SalesResponse])
 def get_sales_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
-    db: Session = Depends(get_db)
+    format: str = Query("json", pattern="^(json|xlsx)$"),
+    db: Session = Depends(get_read_db)
 ):
+    if format == "xlsx":
+        path = ReportExportService(db).sales_report_xlsx(start_date, end_date)
+        return _xlsx_response(path, f"sales_report_{start_date}_{end_date}.xlsx")
+
     sales_service = SalesService(db)
     return sales_service.get_sales_report(start_date, end_date)
 
 @router.get("/inventory", response_model=List[TireInventoryResponse])
 def get_inventory_report(
-    db: Session = Depends(get_db)
+    format: str = Query("json", pattern="^(json|xlsx)$"),
+    db: Session = Depends(get_read_db)
 ):
+    if format == "xlsx":
+        path = ReportExportService(db).inventory_report_xlsx()
+        return _xlsx_response(path, f"inventory_report_{date.today()}.xlsx")
+
     inventory_service = InventoryService(db)
     return inventory_service.get_all_inventory(limit=10000)
+
+@router.get("/gst", response_model=GstMonthlySummary)
+def get_gst_report(
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$", description="YYYY-MM"),
+    db: Session = Depends(get_db)
+):
+    gst_service = GstService(db)
+    return gst_service.get_monthly_summary(month)
+
+@router.post("/jobs", response_model=ReportJobStatus, status_code=202)
+def submit_report_job(
+    spec: ReportJobSpec,
+    db: Session = Depends(get_db)
+):
+    """Queue a report for background rendering; identical pending requests share one job"""
+    return report_jobs.submit(db, spec)
+
+@router.get("/jobs/{job_id}", response_model=ReportJobStatus)
+def get_report_job(job_id: str):
+    return report_jobs.get_status(job_id)
+
+@router.get("/jobs/{job_id}/download")
+def download_report_job(job_id: str):
+    path, media_type = report_jobs.get_result(job_id)
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
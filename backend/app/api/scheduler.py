@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.repositories.job_run_repository import JobRunRepository
+from app.schemas.scheduler import JobRunResponse, ScheduledJobResponse
+from app.services.scheduled_jobs import scheduler
+
+router = APIRouter(prefix="/scheduler", tags=["Scheduler"])
+
+@router.get("/jobs", response_model=List[ScheduledJobResponse])
+def list_jobs(db: Session = Depends(get_db)):
+    job_run_repo = JobRunRepository(db)
+    return [
+        ScheduledJobResponse(
+            name=job.name,
+            cron=job.schedule.expression,
+            next_run=job.next_run,
+            last_run=job_run_repo.get_last(job.name)
+        )
+        for job in scheduler.jobs()
+    ]
+
+@router.get("/runs", response_model=List[JobRunResponse])
+def list_runs(
+    job: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    job_run_repo = JobRunRepository(db)
+    return job_run_repo.get_recent(job, limit)
+
+@router.post("/jobs/{job_name}/run", response_model=JobRunResponse)
+def run_job(
+    job_name: str,
+    db: Session = Depends(get_db)
+):
+    """Run a job now, outside its schedule"""
+    if job_name not in {job.name for job in scheduler.jobs()}:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    run_id = scheduler.run_now(job_name)
+    if run_id is None:
+        raise HTTPException(status_code=409, detail="Job already ran this minute")
+    return JobRunRepository(db).get_recent(job_name, 1)[0]
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.models.whatsapp_broadcast import RecipientStatus
+from app.schemas.whatsapp import (
+    WhatsAppMessageResponse, BroadcastCreate, BroadcastResponse, BroadcastRecipientResponse
+)
+from app.services.whatsapp_outbox_service import WhatsAppOutboxService
+from app.services.whatsapp_broadcast_service import WhatsAppBroadcastService
+
+router = APIRouter(prefix="/whatsapp", tags=["WhatsApp"])
+
+@router.get("/messages/{message_id}", response_model=WhatsAppMessageResponse)
+def get_message(
+    message_id: int,
+    db: Session = Depends(get_db)
+):
+    outbox_service = WhatsAppOutboxService(db)
+    return outbox_service.get_message(message_id)
+
+@router.post("/broadcasts", response_model=BroadcastResponse, status_code=202)
+def create_broadcast(
+    broadcast_data: BroadcastCreate,
+    db: Session = Depends(get_db)
+):
+    """Queue a message to every customer matching the recipient query;
+    sending is rate limited to the provider's allowance"""
+    broadcast_service = WhatsAppBroadcastService(db)
+    return broadcast_service.create_broadcast(broadcast_data)
+
+@router.get("/broadcasts/{broadcast_id}", response_model=BroadcastResponse)
+def get_broadcast(
+    broadcast_id: int,
+    db: Session = Depends(get_db)
+):
+    broadcast_service = WhatsAppBroadcastService(db)
+    return broadcast_service.get_broadcast(broadcast_id)
+
+@router.get("/broadcasts/{broadcast_id}/recipients", response_model=List[BroadcastRecipientResponse])
+def get_broadcast_recipients(
+    broadcast_id: int,
+    status: Optional[RecipientStatus] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    broadcast_service = WhatsAppBroadcastService(db)
+    return broadcast_service.get_recipients(broadcast_id, status, skip, limit)
+
+@router.post("/broadcasts/{broadcast_id}/cancel", response_model=BroadcastResponse)
+def cancel_broadcast(
+    broadcast_id: int,
+    db: Session = Depends(get_db)
+):
+    broadcast_service = WhatsAppBroadcastService(db)
+    return broadcast_service.cancel_broadcast(broadcast_id)
@@ -1,46 +1,150 @@
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool
 import os
+import time
+
+# Set on responses to writes; while present the client's reads use the primary
+PRIMARY_STICKY_COOKIE = "db_primary"
+
+# The same, for cross-site clients whose browser drops third-party cookies
+# (Safari ITP, Firefox total cookie protection): writes answer with the epoch
+# second the pin expires, and the client sends it back on later requests
+PRIMARY_STICKY_HEADER = "X-Read-Primary-Until"
 
 # Read DATABASE_URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL", settings.DATABASE_URL)
 
 print(f"🔌 Connecting to database: {DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'local'}")
 
+def _requires_ssl(database_url: str) -> bool:
+    # Render PostgreSQL (dpg- prefix or render.com in URL)
+    return bool(database_url) and database_url.startswith("postgresql://") and (
+        "render.com" in database_url or "dpg-" in database_url
+    )
+
 # Determine if SSL is required (Render PostgreSQL)
-use_ssl = False
-if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
-    # Check if we're on Render (dpg- prefix or render.com in URL)
-    if "render.com" in DATABASE_URL or "dpg-" in DATABASE_URL:
-        use_ssl = True
-        print("🔒 SSL mode enabled for Render PostgreSQL")
-
-# Create engine with SSL support for production
+use_ssl = _requires_ssl(DATABASE_URL)
 if use_ssl:
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"sslmode": "require"},
-        pool_pre_ping=True,  # Verify connections before using
-        pool_recycle=300,    # Recycle connections after 5 minutes
+    print("🔒 SSL mode enabled for Render PostgreSQL")
+
+is_postgres = DATABASE_URL.startswith("postgresql")
+
+# Pool sizing and timeouts from settings; each checkout is timed (see pool_metrics)
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": True,  # Verify connections before using
+}
+
+def _create_engine(database_url: str):
+    # Create engine with SSL support for production
+    connect_args = {}
+    if _requires_ssl(database_url):
+        connect_args["sslmode"] = "require"
+    if database_url.startswith("postgresql") and settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    return create_engine(
+        database_url,
+        connect_args=connect_args,
+        poolclass=TimedQueuePool,
         echo=False,          # Set to True for SQL query logging
-    )
-else:
-    # Local development or SQLite
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        echo=False,
+        **pool_options
     )
 
+engine = _create_engine(DATABASE_URL)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-only traffic (reports, dashboards) goes to the replica when one is
+# configured; see get_read_db for when it falls back to the primary
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", settings.READ_DATABASE_URL)
+if READ_DATABASE_URL:
+    print(f"📖 Read replica: {READ_DATABASE_URL.split('@')[1] if '@' in READ_DATABASE_URL else 'local'}")
+    read_engine = _create_engine(READ_DATABASE_URL)
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
+# The same database through an asyncio driver, for routes that await their queries
+# instead of holding a threadpool slot while Postgres works
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def _async_database_url(database_url: str):
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+    # asyncpg takes ssl as a connect argument, not libpq's sslmode parameter
+    return url.difference_update_query(["sslmode"])
+
+async_connect_args = {}
+if use_ssl or "sslmode=require" in DATABASE_URL:
+    async_connect_args["ssl"] = "require"
+if is_postgres and settings.DB_STATEMENT_TIMEOUT_MS:
+    async_connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+async_engine = create_async_engine(
+    _async_database_url(DATABASE_URL),
+    connect_args=async_connect_args,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    echo=False,
+    **pool_options
+)
+
+# Objects stay readable after commit: attribute refreshes would need awaiting
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: the replica, unless this client wrote
+    recently and must read its own writes from the primary"""
+    session_factory = SessionLocal if reads_from_primary(request) else ReadSessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def reads_from_primary(request: Request) -> bool:
+    if read_engine is engine or PRIMARY_STICKY_COOKIE in request.cookies:
+        return True
+    try:
+        return float(request.headers.get(PRIMARY_STICKY_HEADER, "0")) > time.time()
+    except ValueError:
+        return False
+
+def stick_to_primary(request: Request, response: Response) -> None:
+    """After a successful write, pin the client's reads to the primary for
+    READ_AFTER_WRITE_SECONDS so replica lag never hides what it just did"""
+    if read_engine is engine:
+        return
+    response.headers[PRIMARY_STICKY_HEADER] = str(int(time.time()) + settings.READ_AFTER_WRITE_SECONDS)
+    secure = request.url.scheme == "https"
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE,
+        "1",
+        max_age=settings.READ_AFTER_WRITE_SECONDS,
+        httponly=True,
+        secure=secure,
+        # The frontend is on another origin; cross-site cookies must be Secure
+        samesite="none" if secure else "lax"
+    )
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,91 @@
+"""
+GST helpers shared by sale creation, invoices and tax reports.
+Prices are tax-exclusive; intra-state supply splits GST equally into CGST and SGST.
+"""
+from typing import List
+
+DEFAULT_HSN_CODE = "4011"  # New pneumatic tyres of rubber
+DEFAULT_GST_RATE = 18.0  # Percent, split 9% CGST + 9% SGST
+
+def round_money(value: float) -> float:
+    return round(value, 2)
+
+def allocate_discount(line_totals: List[float], discount: float) -> List[float]:
+    """Spread a sale-level discount across lines in proportion to line value.
+    The last line absorbs rounding so the shares add up to the discount exactly."""
+    subtotal = sum(line_totals)
+    if not discount or subtotal <= 0:
+        return [0.0 for _ in line_totals]
+
+    shares = []
+    remaining = round_money(discount)
+    for idx, line_total in enumerate(line_totals):
+        if idx == len(line_totals) - 1:
+            shares.append(remaining)
+        else:
+            share = round_money(discount * line_total / subtotal)
+            shares.append(share)
+            remaining = round_money(remaining - share)
+    return shares
+
+def split_gst(taxable_value: float, gst_rate: float) -> tuple:
+    """Return (cgst, sgst) for a taxable value at the given total GST rate"""
+    half = round_money(taxable_value * gst_rate / 200)
+    return half, half
+
+def compute_line_taxes(lines: List[dict], discount: float) -> List[dict]:
+    """Taxable value, CGST and SGST for each line.
+    Each line needs 'total_price' and 'gst_rate'."""
+    shares = allocate_discount([line["total_price"] for line in lines], discount)
+    taxes = []
+    for line, share in zip(lines, shares):
+        taxable_value = round_money(line["total_price"] - share)
+        cgst, sgst = split_gst(taxable_value, line["gst_rate"])
+        taxes.append({
+            "taxable_value": taxable_value,
+            "cgst_amount": cgst,
+            "sgst_amount": sgst
+        })
+    return taxes
+
+def sale_tax_breakdown(sale) -> dict:
+    """Per-line and total tax figures for a stored sale.
+    Uses the values frozen at creation; sales recorded before GST was stored
+    fall back to computing them with the default rate."""
+    items = list(sale.items)
+    if items and all(item.taxable_value is not None for item in items):
+        line_taxes = [
+            {
+                "taxable_value": item.taxable_value,
+                "cgst_amount": item.cgst_amount,
+                "sgst_amount": item.sgst_amount
+            }
+            for item in items
+        ]
+        rates = [item.gst_rate for item in items]
+    else:
+        rates = [item.gst_rate or DEFAULT_GST_RATE for item in items]
+        line_taxes = compute_line_taxes(
+            [{"total_price": item.total_price, "gst_rate": rate} for item, rate in zip(items, rates)],
+            sale.discount_amount or 0
+        )
+
+    subtotal = round_money(sum(item.total_price for item in items))
+    taxable_value = round_money(sum(t["taxable_value"] for t in line_taxes))
+    cgst = round_money(sum(t["cgst_amount"] for t in line_taxes))
+    sgst = round_money(sum(t["sgst_amount"] for t in line_taxes))
+
+    return {
+        "lines": [
+            {"item": item, "gst_rate": rate, **tax}
+            for item, rate, tax in zip(items, rates, line_taxes)
+        ],
+        "subtotal": subtotal,
+        "discount": round_money(subtotal - taxable_value),
+        "taxable_value": taxable_value,
+        "cgst": cgst,
+        "sgst": sgst,
+        "grand_total": round_money(taxable_value + cgst + sgst),
+        # Single rate when every line shares it, else None (mixed-rate sale)
+        "gst_rate": rates[0] if rates and len(set(rates)) == 1 else None
+    }
@@ -0,0 +1,26 @@
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from typing import Optional, Tuple
+from pathlib import Path
+
+# backend/, where alembic.ini and the alembic/ scripts live
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+def alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    # Absolute, so migrations run from any working directory
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+def head_revision() -> Optional[str]:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def current_revision(engine) -> Optional[str]:
+    """The revision recorded in alembic_version; None for a database never migrated"""
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+def schema_revisions(engine) -> Tuple[Optional[str], Optional[str]]:
+    """(database revision, revision this code expects); one query, no reflection"""
+    return current_revision(engine), head_revision()
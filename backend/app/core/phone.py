@@ -0,0 +1,8 @@
+import re
+
+def normalize_mobile(mobile: str) -> str:
+    """Digits only, keeping the last 10 (drops +91 / 91 / 0 prefixes on Indian numbers)"""
+    digits = re.sub(r"\D", "", mobile or "")
+    if len(digits) > 10:
+        digits = digits[-10:]
+    return digits
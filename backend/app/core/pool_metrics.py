@@ -0,0 +1,88 @@
+"""
+Connection pool instrumentation.
+
+The engines use these pool classes so every checkout is timed: how long a
+request waited for a free connection (including opening a new one) and how
+often the pool timed out. Together with the pool's own occupancy this shows
+whether requests are queuing on the pool and how it should be sized.
+"""
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+import threading
+import time
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_max * 1000, 3)
+            }
+
+class _TimedCheckout:
+    """Pool mixin that times every checkout into self.stats"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting across it
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return connection
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(engine) -> dict:
+    """Current occupancy and cumulative checkout stats for an engine's pool"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # overflow() counts down from -size until the pool is full
+            "overflow_in_use": max(pool.overflow(), 0)
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
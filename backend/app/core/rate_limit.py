@@ -0,0 +1,40 @@
+"""
+Token bucket rate limiter for calls to rate-limited providers
+"""
+import threading
+import time
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to
+    `capacity`. Thread-safe; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available. Returns 0 on success, otherwise
+        the seconds until the next token."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, stop: threading.Event = None) -> bool:
+        """Wait for a token. Returns False if stop was set while waiting."""
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if stop is not None:
+                if stop.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
@@ -0,0 +1,183 @@
+"""
+Lightweight in-process job scheduler with cron-style schedules.
+
+Every worker process runs a Scheduler, but each occurrence of a job is
+claimed by inserting a job_runs row keyed by (job name, scheduled time); the
+unique constraint makes exactly one worker the leader for that run, and the
+row doubles as run history.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+from zoneinfo import ZoneInfo
+import os
+import socket
+import threading
+import traceback
+
+# Longest the scheduler sleeps between checks, so a stop request or clock
+# change is noticed promptly
+MAX_SLEEP_SECONDS = 30
+
+class CronSchedule:
+    """Standard five-field cron expression: minute hour day-of-month month day-of-week.
+    Fields accept *, numbers, ranges (a-b), lists (a,b) and steps (*/n, a-b/n).
+    Day-of-week is 0-6 from Sunday (7 is also Sunday). As in cron, when both
+    day fields are restricted a day matches if either does."""
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = [
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        ]
+        self.weekdays = {day % 7 for day in weekdays}
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after moment (timezone-aware, wall clock)"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Five years covers every valid expression, including Feb 29
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def _parse(self, field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Cron field out of range: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+class ScheduledJob:
+    def __init__(self, name: str, schedule: CronSchedule, func: Callable[[], Optional[str]]):
+        self.name = name
+        self.schedule = schedule
+        self.func = func  # Returns an optional summary stored with the run
+        self.next_run: Optional[datetime] = None
+
+class Scheduler:
+    """Runs registered jobs at their cron times in the given timezone.
+
+    claim(job_name, scheduled_for, worker) must return a run id if this worker
+    won the occurrence and None otherwise; finish(run_id, error, result)
+    records the outcome. Both are supplied by the caller so this module stays
+    free of database code.
+    """
+
+    def __init__(self, tz_name: str, claim: Callable, finish: Callable, max_workers: int = 2):
+        self.tz = ZoneInfo(tz_name)
+        self.claim = claim
+        self.finish = finish
+        self.max_workers = max_workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._executor = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def register(self, name: str, cron: str, func: Callable[[], Optional[str]]) -> None:
+        self._jobs[name] = ScheduledJob(name, CronSchedule(cron), func)
+
+    def jobs(self) -> List[ScheduledJob]:
+        return list(self._jobs.values())
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduled-job")
+            now = datetime.now(self.tz)
+            for job in self._jobs.values():
+                job.next_run = job.schedule.next_after(now)
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def run_now(self, name: str) -> Optional[int]:
+        """Run a job immediately in this thread, outside its schedule.
+        Returns the run id, or None if another worker claimed the same minute."""
+        job = self._jobs[name]
+        return self._run(job, datetime.now(self.tz).replace(second=0, microsecond=0))
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            now = datetime.now(self.tz)
+            for job in self._jobs.values():
+                if job.next_run <= now:
+                    scheduled_for = job.next_run
+                    job.next_run = job.schedule.next_after(now)
+                    self._executor.submit(self._run, job, scheduled_for)
+
+            next_due = min((job.next_run for job in self._jobs.values()), default=None)
+            sleep = MAX_SLEEP_SECONDS if next_due is None else (next_due - datetime.now(self.tz)).total_seconds()
+            self._stopping.wait(min(max(sleep, 0.1), MAX_SLEEP_SECONDS))
+
+    def _run(self, job: ScheduledJob, scheduled_for: datetime) -> Optional[int]:
+        # Occurrences are stored in naive UTC like the rest of the schema
+        scheduled_utc = scheduled_for.astimezone(timezone.utc).replace(tzinfo=None)
+        try:
+            run_id = self.claim(job.name, scheduled_utc, self.worker_id)
+        except Exception:
+            traceback.print_exc()
+            return None
+        if run_id is None:
+            return None  # Another worker is the leader for this occurrence
+
+        error = None
+        result = None
+        try:
+            result = job.func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        try:
+            self.finish(run_id, error, result)
+        except Exception:
+            traceback.print_exc()
+        return run_id
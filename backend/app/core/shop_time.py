@@ -0,0 +1,27 @@
+"""
+The shop's calendar. sale_date is stored as naive UTC, while days and months in
+reports, analytics and GST returns are the shop's (settings.SHOP_TIMEZONE).
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+from app.core.config import settings
+
+def shop_now() -> datetime:
+    """Current wall-clock time in the shop (naive)"""
+    return datetime.now(ZoneInfo(settings.SHOP_TIMEZONE)).replace(tzinfo=None)
+
+def shop_today() -> date:
+    return shop_now().date()
+
+def local_to_utc(local: datetime) -> datetime:
+    """Naive shop-local time -> naive UTC, comparable with sale_date"""
+    return local.replace(tzinfo=ZoneInfo(settings.SHOP_TIMEZONE)).astimezone(timezone.utc).replace(tzinfo=None)
+
+def local_day_bounds(start_date: date, end_date: Optional[date] = None) -> Tuple[datetime, datetime]:
+    """[start, end) in UTC covering the shop's calendar days start_date..end_date inclusive"""
+    end_date = end_date or start_date
+    return (
+        local_to_utc(datetime.combine(start_date, time.min)),
+        local_to_utc(datetime.combine(end_date + timedelta(days=1), time.min))
+    )
@@ -1,10 +1,10 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, inventory, sales, dashboard, reports, invoice, profit, debug
-from app.core.database import engine, Base
+from app.api import inventory, sales, dashboard, reports, invoice, profit, debug, analytics, customers, whatsapp, scheduler
+from app.core.database import PRIMARY_STICKY_HEADER, engine, async_engine, stick_to_primary
 from app.core.config import settings
-from app.models import User, Supplier, TireInventory, Sales, SalesItem, Purchase, PurchaseItem
+from app.core.migrations import schema_revisions
 
 app = FastAPI(
     title="Tire Shop Management API",
@@ -28,8 +28,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PRIMARY_STICKY_HEADER],  # Read-your-writes pin, see stick_to_primary
 )
 
+# Read-your-writes with a replica: a client that just changed data reads from the primary for a while
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+@app.middleware("http")
+async def route_reads_after_writes(request, call_next):
+    response = await call_next(request)
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        stick_to_primary(request, response)
+    return response
+
 # Global OPTIONS handler for CORS preflight requests
 from fastapi.responses import Response
 
@@ -41,63 +52,68 @@ async def preflight_handler(full_path: str):
     """
     return Response(status_code=200)
 
-# Startup event - Create tables
+# Startup event - Check the schema; migrate.py applies migrations before deploy
 @app.on_event("startup")
 def startup_event():
-    """Create database tables on application startup"""
+    """Verify the database is at the schema revision this code expects"""
     print("🚀 Starting up Tire Shop Management API...")
     print(f"📊 Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'local'}")
     
-    # Import all models to ensure they're registered with Base
-    from app.models import (
-        User, UserRole, 
-        Supplier, 
-        TireInventory, TireType,
-        Sales, SalesItem, PaymentMode,
-        Purchase, PurchaseItem, PaymentStatus
-    )
-    
     # Check if we're in production environment
     environment = os.getenv("ENVIRONMENT", "development")
     is_production = environment == "production"
     
-    # Handle schema migration for production
-    if is_production:
-        print("🔧 Production environment detected - checking for schema updates...")
-        try:
-            # Drop users table if it exists (to handle schema changes)
-            print("🗑️ Dropping users table to apply schema updates...")
-            User.__table__.drop(bind=engine, checkfirst=True)
-            print("✅ Users table dropped successfully")
-        except Exception as e:
-            print(f"⚠️ Could not drop users table: {e}")
-            print("   (This is normal if table doesn't exist yet)")
-    
-    # Create all tables
+    # One query against alembic_version: boot time does not grow with the schema
     try:
-        print("📝 Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created successfully!")
-        
-        # List created tables
-        tables = Base.metadata.tables.keys()
-        print(f"📋 Tables: {', '.join(tables)}")
-        
+        current, head = schema_revisions(engine)
     except Exception as e:
-        print(f"❌ Error creating tables: {e}")
+        print(f"❌ Could not read the schema revision: {e}")
         print(f"⚠️ Application will continue but database operations may fail")
-        import traceback
-        traceback.print_exc()
+    else:
+        if current == head:
+            print(f"✅ Database schema at revision {head}")
+        else:
+            message = f"Database schema is at revision {current or 'none'}, this code expects {head}; run `python migrate.py`"
+            # Refuse to serve production traffic against a schema the code doesn't match
+            if is_production:
+                raise RuntimeError(message)
+            print(f"⚠️ {message}")
+    
+    # Deliver queued WhatsApp messages and broadcasts, resuming any left from before a restart
+    from app.services.whatsapp_outbox_service import whatsapp_dispatcher
+    from app.services.whatsapp_broadcast_service import broadcast_runner
+    whatsapp_dispatcher.start()
+    broadcast_runner.start()
+    
+    # Closing report and housekeeping; every worker runs one, job_runs picks a leader per run
+    if settings.SCHEDULER_ENABLED:
+        from app.services.scheduled_jobs import scheduler as job_scheduler
+        job_scheduler.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    from app.services.whatsapp_outbox_service import whatsapp_dispatcher
+    from app.services.whatsapp_broadcast_service import broadcast_runner
+    from app.services.scheduled_jobs import scheduler as job_scheduler
+    whatsapp_dispatcher.stop()
+    broadcast_runner.stop()
+    job_scheduler.stop()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
 
 # Include routers
-app.include_router(auth.router)
 app.include_router(inventory.router)
 app.include_router(sales.router)
 app.include_router(dashboard.router)
 app.include_router(reports.router)
 app.include_router(invoice.router)
 app.include_router(profit.router)
-app.include_router(debug.router)
+app.include_router(analytics.router)
+app.include_router(customers.router)
+app.include_router(whatsapp.router)
+app.include_router(scheduler.router)
 app.include_router(debug.router)
 
 @app.get("/")
@@ -128,10 +144,14 @@ def database_status():
         inspector = inspect(engine)
         tables = inspector.get_table_names()
         
+        current, head = schema_revisions(engine)
+        
         return {
             "status": "connected",
             "tables": tables,
-            "table_count": len(tables)
+            "table_count": len(tables),
+            "schema_revision": current,
+            "expected_revision": head
         }
     except Exception as e:
         return {
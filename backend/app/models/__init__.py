@@ -4,6 +4,12 @@ from .inventory import TireInventory, TireType
 from .sales import Sales, SalesItem, PaymentMode
 from .purchase import Purchase, PaymentStatus
 from .purchase_item import PurchaseItem
+from .gst_snapshot import GstMonthlySnapshot
+from .customer import Customer
+from .whatsapp_message import WhatsAppMessage, MessageStatus
+from .whatsapp_broadcast import WhatsAppBroadcast, WhatsAppBroadcastRecipient, BroadcastStatus, RecipientStatus
+from .job_run import JobRun, JobRunStatus
+from .invoice_number import InvoiceNumber
 
 __all__ = [
     "User",
@@ -16,5 +22,16 @@ __all__ = [
     "PaymentMode",
     "Purchase",
     "PaymentStatus",
-    "PurchaseItem"
+    "PurchaseItem",
+    "GstMonthlySnapshot",
+    "Customer",
+    "WhatsAppMessage",
+    "MessageStatus",
+    "WhatsAppBroadcast",
+    "WhatsAppBroadcastRecipient",
+    "BroadcastStatus",
+    "RecipientStatus",
+    "JobRun",
+    "JobRunStatus",
+    "InvoiceNumber"
 ]
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+class Customer(Base):
+    __tablename__ = "customers"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    mobile = Column(String, unique=True, nullable=False, index=True)  # Normalised, see normalize_mobile
+    name = Column(String, nullable=False)  # Name used on the latest sale
+    
+    # Running totals, maintained by SalesService.create_sale in the sale's transaction
+    visit_count = Column(Integer, nullable=False, default=0, index=True)
+    lifetime_spend = Column(Float, nullable=False, default=0, index=True)
+    first_visit = Column(DateTime, nullable=True)
+    last_visit = Column(DateTime, nullable=True)
+    
+    # Relationships
+    sales = relationship("Sales", back_populates="customer")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class GstMonthlySnapshot(Base):
+    """Frozen GST summary for a closed month (sales of a closed month never change)"""
+    __tablename__ = "gst_monthly_snapshots"
+    
+    month = Column(String, primary_key=True)  # YYYY-MM
+    payload = Column(Text, nullable=False)  # GstMonthlySummary as JSON
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
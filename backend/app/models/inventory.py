@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Enum
 from sqlalchemy.orm import relationship
 import enum
 from app.core.database import Base
+from app.core.gst import DEFAULT_HSN_CODE, DEFAULT_GST_RATE
 
 class TireType(str, enum.Enum):
     TUBE = "tube"
@@ -19,6 +20,8 @@ class TireInventory(Base):
     selling_price = Column(Float, nullable=False)
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
     purchase_date = Column(Date, nullable=False)
+    hsn_code = Column(String, nullable=False, default=DEFAULT_HSN_CODE)
+    gst_rate = Column(Float, nullable=False, default=DEFAULT_GST_RATE)  # Total GST percent
     
     # Relationships
     supplier = relationship("Supplier", back_populates="inventory_items")
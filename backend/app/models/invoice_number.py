@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String
+from app.core.database import Base
+
+class InvoiceNumber(Base):
+    """Every invoice id ever issued, written in the same transaction as its sale.
+
+    On Postgres sales is partitioned by sale_date, so sales.invoice_id can only
+    be unique together with sale_date; this unpartitioned table keeps invoice
+    ids unique on their own (and across archived months).
+    """
+    __tablename__ = "invoice_numbers"
+    
+    invoice_id = Column(String, primary_key=True)
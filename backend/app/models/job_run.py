@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, UniqueConstraint
+import enum
+from app.core.database import Base
+
+class JobRunStatus(str, enum.Enum):
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class JobRun(Base):
+    """One occurrence of a scheduled job. The unique (job_name, scheduled_for)
+    pair is the leader lock: only the worker whose insert wins runs it."""
+    __tablename__ = "job_runs"
+    __table_args__ = (UniqueConstraint("job_name", "scheduled_for"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String, nullable=False, index=True)
+    scheduled_for = Column(DateTime, nullable=False)  # UTC
+    worker = Column(String, nullable=False)  # host:pid that ran it
+    status = Column(Enum(JobRunStatus), nullable=False, default=JobRunStatus.RUNNING)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
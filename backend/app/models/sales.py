@@ -10,33 +10,46 @@ class PaymentMode(str, enum.Enum):
     CARD = "card"
 
 class Sales(Base):
+    """On Postgres sales and sales_items are range-partitioned by month of
+    sale_date (see alembic revision 0002); their keys there are (id, sale_date)."""
     __tablename__ = "sales"
     
     id = Column(Integer, primary_key=True, index=True)
     invoice_id = Column(String, unique=True, nullable=False, index=True)
     customer_name = Column(String, nullable=False)
     customer_mobile = Column(String, nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True, index=True)
     subtotal = Column(Float, nullable=False, default=0)  # Total before discount
     discount_type = Column(String, nullable=True)  # 'flat' or 'percent'
     discount_value = Column(Float, nullable=True, default=0)  # Discount amount or percentage
     discount_amount = Column(Float, nullable=True, default=0)  # Actual discount applied
     total_amount = Column(Float, nullable=False)  # Final amount after discount
+    taxable_value = Column(Float, nullable=True)  # Sum of line taxable values
+    cgst_amount = Column(Float, nullable=True)
+    sgst_amount = Column(Float, nullable=True)
     notes = Column(String, nullable=True)  # Optional notes
     payment_mode = Column(Enum(PaymentMode), nullable=False)
     sale_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
     items = relationship("SalesItem", back_populates="sale", cascade="all, delete-orphan")
+    customer = relationship("Customer", back_populates="sales")
 
 class SalesItem(Base):
     __tablename__ = "sales_items"
     
     id = Column(Integer, primary_key=True, index=True)
     sale_id = Column(Integer, ForeignKey("sales.id"), nullable=False)
+    sale_date = Column(DateTime, nullable=False)  # Copy of the sale's date: the partition key on Postgres
     tire_id = Column(Integer, ForeignKey("tire_inventory.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
     total_price = Column(Float, nullable=False)
+    hsn_code = Column(String, nullable=True)
+    gst_rate = Column(Float, nullable=True)  # Total GST percent at time of sale
+    taxable_value = Column(Float, nullable=True)  # Line total less its share of the discount
+    cgst_amount = Column(Float, nullable=True)
+    sgst_amount = Column(Float, nullable=True)
     
     # Relationships
     sale = relationship("Sales", back_populates="items")
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.core.database import Base
+
+class BroadcastStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+class RecipientStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"  # Handed to the provider; outcome not yet recorded
+    SENT = "sent"
+    FAILED = "failed"
+    SKIPPED = "skipped"  # Broadcast cancelled before this recipient
+
+class WhatsAppBroadcast(Base):
+    __tablename__ = "whatsapp_broadcasts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    body = Column(Text, nullable=False)  # "{name}" is replaced per recipient
+    criteria = Column(Text, nullable=False)  # BroadcastRecipientQuery as JSON
+    status = Column(Enum(BroadcastStatus), nullable=False, default=BroadcastStatus.QUEUED, index=True)
+    total_recipients = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Touched by the runner while it works
+    
+    # Relationships
+    recipients = relationship("WhatsAppBroadcastRecipient", back_populates="broadcast", cascade="all, delete-orphan")
+
+class WhatsAppBroadcastRecipient(Base):
+    """Recipients are resolved when the broadcast is created, so progress survives restarts"""
+    __tablename__ = "whatsapp_broadcast_recipients"
+    __table_args__ = (UniqueConstraint("broadcast_id", "mobile"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    broadcast_id = Column(Integer, ForeignKey("whatsapp_broadcasts.id"), nullable=False, index=True)
+    mobile = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    status = Column(Enum(RecipientStatus), nullable=False, default=RecipientStatus.PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    provider_message_id = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    broadcast = relationship("WhatsAppBroadcast", back_populates="recipients")
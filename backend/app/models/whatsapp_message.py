@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from datetime import datetime
+import enum
+from app.core.database import Base
+
+class MessageStatus(str, enum.Enum):
+    PENDING = "pending"  # Waiting for its next attempt
+    SENDING = "sending"  # Claimed by a dispatcher
+    SENT = "sent"
+    DEAD = "dead"  # Gave up: permanent error or out of attempts
+
+class WhatsAppMessage(Base):
+    """Outbox row: written by the request, delivered by the background dispatcher"""
+    __tablename__ = "whatsapp_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    to_number = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    sale_id = Column(Integer, nullable=True, index=True)  # Attach this sale's invoice; no foreign key, sales is partitioned on Postgres
+    status = Column(Enum(MessageStatus), nullable=False, default=MessageStatus.PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    claimed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
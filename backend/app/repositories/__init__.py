@@ -1,6 +1,12 @@
 from .user_repository import UserRepository
-from .inventory_repository import InventoryRepository
-from .sales_repository import SalesRepository
-from .purchase_repository import PurchaseRepository
+from .inventory_repository import InventoryRepository, AsyncInventoryRepository
+from .sales_repository import SalesRepository, AsyncSalesRepository
+from .purchase_repository import PurchaseRepository, AsyncPurchaseRepository
+from .gst_repository import GstSnapshotRepository
+from .customer_repository import CustomerRepository, AsyncCustomerRepository
+from .whatsapp_outbox_repository import WhatsAppOutboxRepository
+from .whatsapp_broadcast_repository import WhatsAppBroadcastRepository
+from .job_run_repository import JobRunRepository
+from .sales_partition_repository import SalesPartitionRepository
 
-__all__ = ["UserRepository", "InventoryRepository", "SalesRepository", "PurchaseRepository"]
+__all__ = ["UserRepository", "InventoryRepository", "SalesRepository", "PurchaseRepository", "GstSnapshotRepository", "CustomerRepository", "WhatsAppOutboxRepository", "WhatsAppBroadcastRepository", "JobRunRepository", "AsyncInventoryRepository", "AsyncSalesRepository", "AsyncPurchaseRepository", "AsyncCustomerRepository", "SalesPartitionRepository"]
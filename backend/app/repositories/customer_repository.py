@@ -0,0 +1,95 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from app.models.customer import Customer
+from app.models.sales import Sales, SalesItem
+from app.models.inventory import TireInventory
+
+def _record_sale_upsert(dialect: str, mobile: str, name: str, amount: float, sale_date: datetime):
+    """INSERT .. ON CONFLICT statement returning the customer id, or None when
+    the dialect has no upsert"""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    
+    stmt = insert(Customer).values(
+        mobile=mobile,
+        name=name,
+        visit_count=1,
+        lifetime_spend=amount,
+        first_visit=sale_date,
+        last_visit=sale_date
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[Customer.mobile],
+        set_={
+            "name": stmt.excluded.name,
+            "visit_count": Customer.visit_count + 1,
+            "lifetime_spend": Customer.lifetime_spend + stmt.excluded.lifetime_spend,
+            "last_visit": stmt.excluded.last_visit
+        }
+    ).returning(Customer.id)
+
+class CustomerRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_mobile(self, mobile: str) -> Optional[Customer]:
+        return self.db.query(Customer).filter(Customer.mobile == mobile).first()
+    
+    def get_top(self, limit: int = 10, by: str = "spend") -> List[Customer]:
+        order = Customer.visit_count if by == "visits" else Customer.lifetime_spend
+        return self.db.query(Customer).order_by(order.desc(), Customer.id).limit(limit).all()
+    
+    def get_buyers(self, since: datetime, tire_size: Optional[str] = None, brand: Optional[str] = None) -> List[tuple]:
+        """(mobile, name) of customers who bought matching tyres since a date"""
+        query = self.db.query(Customer.mobile, Customer.name).join(
+            Sales, Sales.customer_id == Customer.id
+        ).join(
+            SalesItem, SalesItem.sale_id == Sales.id
+        ).join(
+            TireInventory, TireInventory.id == SalesItem.tire_id
+        ).filter(Sales.sale_date >= since)
+        
+        if tire_size:
+            query = query.filter(TireInventory.tire_size == tire_size)
+        if brand:
+            query = query.filter(TireInventory.brand == brand)
+        return query.distinct().order_by(Customer.mobile).all()
+    
+    def record_sale(self, mobile: str, name: str, amount: float, sale_date: datetime) -> int:
+        """Create or update the customer's running totals for one sale and return its id.
+        
+        Runs as a single upsert so concurrent sales for the same mobile cannot lose
+        an increment. Does not commit: the caller's sale commit covers it.
+        """
+        stmt = _record_sale_upsert(self.db.get_bind().dialect.name, mobile, name, amount, sale_date)
+        if stmt is None:
+            return self._record_sale_orm(mobile, name, amount, sale_date)
+        return self.db.execute(stmt).scalar_one()
+    
+    def _record_sale_orm(self, mobile: str, name: str, amount: float, sale_date: datetime) -> int:
+        customer = self.db.query(Customer).filter(Customer.mobile == mobile).with_for_update().first()
+        if customer is None:
+            customer = Customer(mobile=mobile, name=name, visit_count=0, lifetime_spend=0, first_visit=sale_date)
+            self.db.add(customer)
+        customer.name = name
+        customer.visit_count += 1
+        customer.lifetime_spend += amount
+        customer.last_visit = sale_date
+        self.db.flush()
+        return customer.id
+
+class AsyncCustomerRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def record_sale(self, mobile: str, name: str, amount: float, sale_date: datetime) -> int:
+        """CustomerRepository.record_sale on an AsyncSession (async drivers are
+        Postgres or SQLite, which both upsert). Does not commit."""
+        stmt = _record_sale_upsert(self.db.get_bind().dialect.name, mobile, name, amount, sale_date)
+        return (await self.db.execute(stmt)).scalar_one()
@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.models.gst_snapshot import GstMonthlySnapshot
+
+class GstSnapshotRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get(self, month: str) -> Optional[GstMonthlySnapshot]:
+        return self.db.query(GstMonthlySnapshot).filter(GstMonthlySnapshot.month == month).first()
+    
+    def create(self, month: str, payload: str) -> GstMonthlySnapshot:
+        snapshot = GstMonthlySnapshot(month=month, payload=payload)
+        self.db.add(snapshot)
+        self.db.commit()
+        return snapshot
@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_, func, case, select
 from typing import List, Optional
 from app.models.inventory import TireInventory
 from app.models.supplier import Supplier
@@ -9,7 +10,8 @@ class InventoryRepository:
         self.db = db
     
     def get_all(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[TireInventory]:
-        query = self.db.query(TireInventory)
+        # Supplier name is part of every inventory response
+        query = self.db.query(TireInventory).options(joinedload(TireInventory.supplier))
         if search:
             query = query.filter(
                 or_(
@@ -58,6 +60,125 @@ class InventoryRepository:
     def get_low_stock(self, threshold: int = 5) -> List[TireInventory]:
         return self.db.query(TireInventory).filter(TireInventory.quantity < threshold).all()
     
+    def iter_report_rows(self, batch_size: int = 5000):
+        """Stream flat inventory rows (with supplier name) in batches, without ORM hydration.
+        
+        Yields (column_names, rows) for each batch; a single empty batch when
+        nothing matches, so the column names always come through.
+        """
+        stmt = select(
+            TireInventory.id,
+            TireInventory.brand,
+            TireInventory.tire_size,
+            TireInventory.tire_type,
+            TireInventory.quantity,
+            TireInventory.purchase_price,
+            TireInventory.selling_price,
+            Supplier.name.label("supplier_name"),
+            TireInventory.purchase_date
+        ).outerjoin(
+            Supplier, Supplier.id == TireInventory.supplier_id
+        ).order_by(TireInventory.brand, TireInventory.tire_size, TireInventory.id)
+        
+        result = self.db.execute(stmt, execution_options={"yield_per": batch_size})
+        columns = list(result.keys())
+        empty = True
+        for rows in result.partitions():
+            empty = False
+            yield columns, rows
+        if empty:
+            yield columns, []
+    
+    def get_stock_summary_by_brand(self, threshold: int = 5) -> List[dict]:
+        """Per-brand SKU count, units, stock value and low-stock count, aggregated in SQL"""
+        results = self.db.query(
+            TireInventory.brand,
+            func.count(TireInventory.id).label('sku_count'),
+            func.coalesce(func.sum(TireInventory.quantity), 0).label('units'),
+            func.coalesce(func.sum(TireInventory.quantity * TireInventory.purchase_price), 0).label('cost_value'),
+            func.coalesce(func.sum(TireInventory.quantity * TireInventory.selling_price), 0).label('retail_value'),
+            func.sum(case((TireInventory.quantity < threshold, 1), else_=0)).label('low_stock')
+        ).group_by(TireInventory.brand).order_by(TireInventory.brand).all()
+        
+        return [
+            {
+                "brand": r.brand,
+                "sku_count": int(r.sku_count),
+                "units": int(r.units),
+                "cost_value": float(r.cost_value),
+                "retail_value": float(r.retail_value),
+                "low_stock": int(r.low_stock or 0)
+            }
+            for r in results
+        ]
+    
+    def get_price_version(self) -> str:
+        """Cheap fingerprint of the SKU set and purchase prices (profit depends on them)"""
+        count, max_id, price_sum = self.db.query(
+            func.count(TireInventory.id),
+            func.max(TireInventory.id),
+            func.sum(TireInventory.purchase_price)
+        ).one()
+        return f"{count}:{max_id or 0}:{price_sum or 0}"
+    
     def get_total_inventory_value(self) -> float:
         items = self.db.query(TireInventory).all()
         return sum(item.selling_price * item.quantity for item in items)
+
+class AsyncInventoryRepository:
+    """Inventory CRUD on an AsyncSession; the supplier is always loaded
+    because lazy loads cannot run under asyncio"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    def _select_with_supplier(self):
+        return select(TireInventory).options(joinedload(TireInventory.supplier))
+    
+    async def get_all(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[TireInventory]:
+        stmt = self._select_with_supplier()
+        if search:
+            stmt = stmt.where(
+                or_(
+                    TireInventory.brand.ilike(f"%{search}%"),
+                    TireInventory.tire_size.ilike(f"%{search}%")
+                )
+            )
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_by_id(self, inventory_id: int) -> Optional[TireInventory]:
+        result = await self.db.execute(
+            self._select_with_supplier().where(TireInventory.id == inventory_id).execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+    
+    async def create(self, inventory_data: dict) -> TireInventory:
+        inventory = TireInventory(**inventory_data)
+        self.db.add(inventory)
+        await self.db.commit()
+        return await self.get_by_id(inventory.id)
+    
+    async def update(self, inventory_id: int, inventory_data: dict) -> Optional[TireInventory]:
+        inventory = await self.get_by_id(inventory_id)
+        if inventory:
+            for key, value in inventory_data.items():
+                if value is not None:
+                    setattr(inventory, key, value)
+            await self.db.commit()
+            inventory = await self.get_by_id(inventory_id)
+        return inventory
+    
+    async def delete(self, inventory_id: int) -> bool:
+        inventory = await self.get_by_id(inventory_id)
+        if inventory:
+            await self.db.delete(inventory)
+            await self.db.commit()
+            return True
+        return False
+    
+    async def update_quantity(self, inventory_id: int, quantity_change: int) -> Optional[TireInventory]:
+        inventory = await self.get_by_id(inventory_id)
+        if inventory:
+            inventory.quantity += quantity_change
+            await self.db.commit()
+        return inventory
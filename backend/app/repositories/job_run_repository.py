@@ -0,0 +1,47 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from datetime import datetime
+from app.models.job_run import JobRun, JobRunStatus
+
+class JobRunRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def claim(self, job_name: str, scheduled_for: datetime, worker: str) -> Optional[JobRun]:
+        """Record a run for this occurrence, or return None if another worker already has"""
+        run = JobRun(
+            job_name=job_name,
+            scheduled_for=scheduled_for,
+            worker=worker,
+            status=JobRunStatus.RUNNING,
+            started_at=datetime.utcnow()
+        )
+        self.db.add(run)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return None
+        self.db.refresh(run)
+        return run
+    
+    def finish(self, run_id: int, error: Optional[str], result: Optional[str]) -> None:
+        run = self.db.query(JobRun).filter(JobRun.id == run_id).first()
+        if run is None:
+            return
+        run.status = JobRunStatus.FAILED if error else JobRunStatus.SUCCEEDED
+        run.error = error
+        run.result = result
+        run.finished_at = datetime.utcnow()
+        self.db.commit()
+    
+    def get_recent(self, job_name: Optional[str] = None, limit: int = 50) -> List[JobRun]:
+        query = self.db.query(JobRun)
+        if job_name:
+            query = query.filter(JobRun.job_name == job_name)
+        return query.order_by(JobRun.scheduled_for.desc(), JobRun.id.desc()).limit(limit).all()
+    
+    def get_last(self, job_name: str) -> Optional[JobRun]:
+        runs = self.get_recent(job_name, 1)
+        return runs[0] if runs else None
@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import date
 from app.models.purchase import Purchase
@@ -8,11 +10,18 @@ class PurchaseRepository:
     def __init__(self, db: Session):
         self.db = db
     
+    def _query_with_items(self):
+        # Eager-load line items and their tires so building responses does not
+        # issue one lazy load per purchase and per item.
+        return self.db.query(Purchase).options(
+            selectinload(Purchase.items).joinedload(PurchaseItem.tire)
+        )
+    
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Purchase]:
-        return self.db.query(Purchase).order_by(Purchase.purchase_date.desc()).offset(skip).limit(limit).all()
+        return self._query_with_items().order_by(Purchase.purchase_date.desc()).offset(skip).limit(limit).all()
     
     def get_by_id(self, purchase_id: int) -> Optional[Purchase]:
-        return self.db.query(Purchase).filter(Purchase.id == purchase_id).first()
+        return self._query_with_items().filter(Purchase.id == purchase_id).first()
     
     def create(self, purchase_data: dict, items_data: List[dict]) -> Purchase:
         purchase = Purchase(**purchase_data)
@@ -46,7 +55,61 @@ class PurchaseRepository:
         return False
     
     def get_by_date_range(self, start_date: date, end_date: date) -> List[Purchase]:
-        return self.db.query(Purchase).filter(
+        return self._query_with_items().filter(
             Purchase.purchase_date >= start_date,
             Purchase.purchase_date <= end_date
         ).all()
+
+
+class AsyncPurchaseRepository:
+    """Purchase CRUD on an AsyncSession; items and their tires are always
+    loaded because lazy loads cannot run under asyncio"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    def _select_with_items(self):
+        return select(Purchase).options(
+            selectinload(Purchase.items).joinedload(PurchaseItem.tire)
+        )
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Purchase]:
+        result = await self.db.execute(
+            self._select_with_items().order_by(Purchase.purchase_date.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_by_id(self, purchase_id: int) -> Optional[Purchase]:
+        result = await self.db.execute(
+            self._select_with_items().where(Purchase.id == purchase_id).execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+    
+    async def create(self, purchase_data: dict, items_data: List[dict]) -> Purchase:
+        purchase = Purchase(**purchase_data)
+        self.db.add(purchase)
+        await self.db.flush()
+        
+        for item_data in items_data:
+            item = PurchaseItem(purchase_id=purchase.id, **item_data)
+            self.db.add(item)
+        
+        await self.db.commit()
+        return await self.get_by_id(purchase.id)
+    
+    async def update(self, purchase_id: int, purchase_data: dict) -> Optional[Purchase]:
+        purchase = await self.get_by_id(purchase_id)
+        if purchase:
+            for key, value in purchase_data.items():
+                if value is not None:
+                    setattr(purchase, key, value)
+            await self.db.commit()
+            purchase = await self.get_by_id(purchase_id)
+        return purchase
+    
+    async def delete(self, purchase_id: int) -> bool:
+        purchase = await self.get_by_id(purchase_id)
+        if purchase:
+            await self.db.delete(purchase)
+            await self.db.commit()
+            return True
+        return False
@@ -0,0 +1,124 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+import re
+
+# Monthly partitions are named sales_yYYYYmMM / sales_items_yYYYYmMM
+PARTITION_NAME = re.compile(r"^sales_y(\d{4})m(\d{2})$")
+
+# Detached partitions live here, outside the partitioned tables
+ARCHIVE_SCHEMA = "sales_archive"
+
+def partition_suffix(month: date) -> str:
+    return f"y{month.year:04d}m{month.month:02d}"
+
+class SalesPartitionRepository:
+    """Partition maintenance for the month-partitioned sales tables (Postgres,
+    after alembic revision 0002). Table names are built from dates only."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_partitioned(self) -> bool:
+        if self.db.get_bind().dialect.name != "postgresql":
+            return False
+        return self.db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('public.sales'))"
+        )).scalar()
+
+    def create_partitions(self, from_month: date, through_month: date) -> int:
+        """Create any missing monthly partitions in the range; returns how many months were added"""
+        created = self.db.execute(
+            text("SELECT create_sales_partitions(:from_month, :through_month)"),
+            {"from_month": from_month, "through_month": through_month}
+        ).scalar()
+        self.db.commit()
+        return created
+
+    def get_partition_months(self) -> List[date]:
+        names = self.db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = 'public.sales'::regclass"
+        )).scalars()
+        return self._months(names)
+
+    def get_archived_months(self) -> List[date]:
+        names = self.db.execute(
+            text("SELECT tablename FROM pg_tables WHERE schemaname = :schema"),
+            {"schema": ARCHIVE_SCHEMA}
+        ).scalars()
+        return self._months(names)
+
+    def archive_month(self, month: date, tablespace: Optional[str] = None) -> None:
+        """Detach one month of sales and items and move them to the archive schema,
+        optionally onto another tablespace. Runs in one transaction."""
+        sales_table = f"sales_{partition_suffix(month)}"
+        items_table = f"sales_items_{partition_suffix(month)}"
+
+        # Items first: once detached their key to sales no longer blocks detaching the sales
+        self.db.execute(text(f"ALTER TABLE sales_items DETACH PARTITION {items_table}"))
+        self.db.execute(text(f"ALTER TABLE {items_table} DROP CONSTRAINT IF EXISTS fk_sales_items_sale"))
+        self.db.execute(text(f"ALTER TABLE sales DETACH PARTITION {sales_table}"))
+
+        self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        for table in (sales_table, items_table):
+            self.db.execute(text(f"ALTER TABLE {table} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            if tablespace:
+                self._move_to_tablespace(table, tablespace)
+        self.db.commit()
+
+    def refresh_history_views(self) -> None:
+        """(Re)create the views sales_archive.sales and sales_archive.sales_items:
+        the live tables plus every archived month. Named like the live tables so
+        read_with_archive can swap them in for a report's queries."""
+        months = self.get_archived_months()
+        self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        for parent in ("sales", "sales_items"):
+            columns = self._columns("public", parent)
+            selects = [f"SELECT {', '.join(columns)} FROM public.{parent}"]
+            for month in months:
+                table = f"{parent}_{partition_suffix(month)}"
+                present = set(self._columns(ARCHIVE_SCHEMA, table))
+                # Columns added after a month was archived read as NULL for it
+                select_list = [column if column in present else f"NULL AS {column}" for column in columns]
+                selects.append(f"SELECT {', '.join(select_list)} FROM {ARCHIVE_SCHEMA}.{table}")
+
+            view = f"{ARCHIVE_SCHEMA}.{parent}"
+            self.db.execute(text(f"DROP VIEW IF EXISTS {view}"))
+            self.db.execute(text(f"CREATE VIEW {view} AS " + " UNION ALL ".join(selects)))
+        self.db.commit()
+
+    def read_with_archive(self) -> None:
+        """For the rest of the current transaction, resolve sales and sales_items
+        (in ORM queries and relationship loads alike) to the views that include
+        archived months. Read-only: the views cannot take writes."""
+        self.db.execute(text(f"SET LOCAL search_path TO {ARCHIVE_SCHEMA}, public"))
+
+    def _move_to_tablespace(self, table: str, tablespace: str) -> None:
+        qualified = f"{ARCHIVE_SCHEMA}.{table}"
+        self.db.execute(text(f'ALTER TABLE {qualified} SET TABLESPACE "{tablespace}"'))
+        indexes = self.db.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = :schema AND tablename = :table"),
+            {"schema": ARCHIVE_SCHEMA, "table": table}
+        ).scalars().all()
+        for index in indexes:
+            self.db.execute(text(f'ALTER INDEX {ARCHIVE_SCHEMA}."{index}" SET TABLESPACE "{tablespace}"'))
+
+    def _columns(self, schema: str, table: str) -> List[str]:
+        return list(self.db.execute(
+            text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = :schema AND table_name = :table ORDER BY ordinal_position"
+            ),
+            {"schema": schema, "table": table}
+        ).scalars())
+
+    def _months(self, names) -> List[date]:
+        months = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
@@ -1,8 +1,13 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select, cast, Integer
 from typing import List, Optional
 from datetime import datetime, date
+from zoneinfo import ZoneInfo
 from app.models.sales import Sales, SalesItem
+from app.models.invoice_number import InvoiceNumber
+from app.models.inventory import TireInventory
+from app.core.shop_time import local_day_bounds
 
 class SalesRepository:
     def __init__(self, db: Session):
@@ -10,29 +15,322 @@ class SalesRepository:
     
     def create(self, sales_data: dict, items_data: List[dict]) -> Sales:
         sale = Sales(**sales_data)
+        # Claims the invoice id: a concurrent sale that drew the same one fails here
+        self.db.add(InvoiceNumber(invoice_id=sale.invoice_id))
         self.db.add(sale)
         self.db.flush()
         
         for item_data in items_data:
-            item = SalesItem(sale_id=sale.id, **item_data)
+            item = SalesItem(sale_id=sale.id, sale_date=sale.sale_date, **item_data)
             self.db.add(item)
         
         self.db.commit()
         self.db.refresh(sale)
         return sale
     
+    def _query_with_items(self):
+        # Eager-load line items and their tires so building responses does not
+        # issue one lazy load per sale and per item.
+        return self.db.query(Sales).options(
+            selectinload(Sales.items).joinedload(SalesItem.tire)
+        )
+    
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Sales]:
-        return self.db.query(Sales).order_by(Sales.sale_date.desc()).offset(skip).limit(limit).all()
+        return self._query_with_items().order_by(Sales.sale_date.desc()).offset(skip).limit(limit).all()
     
     def get_by_id(self, sale_id: int) -> Optional[Sales]:
-        return self.db.query(Sales).filter(Sales.id == sale_id).first()
+        return self._query_with_items().filter(Sales.id == sale_id).first()
     
     def get_by_date_range(self, start_date: date, end_date: date) -> List[Sales]:
-        return self.db.query(Sales).filter(
+        return self._query_with_items().filter(
             Sales.sale_date >= start_date,
             Sales.sale_date <= end_date
         ).all()
     
+    def get_by_datetime_range(self, start: datetime, end: datetime) -> List[Sales]:
+        """Sales in [start, end), oldest first, with items and tires loaded"""
+        return self._query_with_items().filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).order_by(Sales.sale_date, Sales.id).all()
+    
+    def iter_line_rows_by_date_range(self, start: datetime, end: datetime, batch_size: int = 5000):
+        """Stream flat sale + line item + tire rows for [start, end) in batches.
+
+        Rows come straight from the cursor as tuples, bypassing ORM hydration.
+        Yields (column_names, rows) for each batch; a single empty batch when
+        nothing matches, so the column names always come through.
+        """
+        stmt = select(
+            Sales.id.label("sale_id"),
+            Sales.invoice_id,
+            Sales.sale_date,
+            Sales.customer_name,
+            Sales.customer_mobile,
+            Sales.payment_mode,
+            Sales.subtotal,
+            Sales.discount_amount,
+            Sales.total_amount,
+            SalesItem.id.label("item_id"),
+            SalesItem.tire_id,
+            SalesItem.quantity,
+            SalesItem.unit_price,
+            SalesItem.total_price,
+            TireInventory.brand,
+            TireInventory.tire_size,
+            TireInventory.tire_type,
+            TireInventory.purchase_price,
+        ).join(
+            SalesItem, SalesItem.sale_id == Sales.id
+        ).join(
+            TireInventory, TireInventory.id == SalesItem.tire_id
+        ).where(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).order_by(Sales.sale_date, SalesItem.id)
+        
+        result = self.db.execute(stmt, execution_options={"yield_per": batch_size})
+        columns = list(result.keys())
+        empty = True
+        for rows in result.partitions():
+            empty = False
+            yield columns, rows
+        if empty:
+            yield columns, []
+    
+    def get_summary_by_date_range(self, start: datetime, end: datetime) -> dict:
+        """Aggregate totals for [start, end), grouped by payment mode, in SQL"""
+        by_mode = self.db.query(
+            Sales.payment_mode,
+            func.count(Sales.id).label('transactions'),
+            func.coalesce(func.sum(Sales.subtotal), 0).label('subtotal'),
+            func.coalesce(func.sum(Sales.discount_amount), 0).label('discount'),
+            func.coalesce(func.sum(Sales.total_amount), 0).label('revenue')
+        ).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).group_by(Sales.payment_mode).all()
+        
+        items_sold = self.db.query(
+            func.coalesce(func.sum(SalesItem.quantity), 0)
+        ).join(
+            Sales, Sales.id == SalesItem.sale_id
+        ).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).scalar()
+        
+        return {
+            "by_payment_mode": [
+                {
+                    "payment_mode": r.payment_mode.value,
+                    "transactions": int(r.transactions),
+                    "subtotal": float(r.subtotal),
+                    "discount": float(r.discount),
+                    "revenue": float(r.revenue)
+                }
+                for r in by_mode
+            ],
+            "items_sold": int(items_sold or 0)
+        }
+    
+    def get_gst_summary(self, start: datetime, end: datetime) -> dict:
+        """GST totals for [start, end) grouped by HSN code and rate, aggregated in SQL"""
+        results = self.db.query(
+            SalesItem.hsn_code,
+            SalesItem.gst_rate,
+            func.count(func.distinct(SalesItem.sale_id)).label('invoice_count'),
+            func.coalesce(func.sum(SalesItem.quantity), 0).label('quantity'),
+            func.coalesce(func.sum(SalesItem.taxable_value), 0).label('taxable_value'),
+            func.coalesce(func.sum(SalesItem.cgst_amount), 0).label('cgst_amount'),
+            func.coalesce(func.sum(SalesItem.sgst_amount), 0).label('sgst_amount')
+        ).join(
+            Sales, Sales.id == SalesItem.sale_id
+        ).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).group_by(
+            SalesItem.hsn_code, SalesItem.gst_rate
+        ).order_by(SalesItem.gst_rate, SalesItem.hsn_code).all()
+        
+        invoice_count = self.db.query(func.count(Sales.id)).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).scalar()
+        
+        return {
+            "invoice_count": int(invoice_count or 0),
+            "rows": [
+                {
+                    "hsn_code": r.hsn_code,
+                    "gst_rate": float(r.gst_rate) if r.gst_rate is not None else None,
+                    "invoice_count": int(r.invoice_count),
+                    "quantity": int(r.quantity),
+                    "taxable_value": round(float(r.taxable_value), 2),
+                    "cgst_amount": round(float(r.cgst_amount), 2),
+                    "sgst_amount": round(float(r.sgst_amount), 2)
+                }
+                for r in results
+            ]
+        }
+    
+    def get_period_metrics(self, start: datetime, end: datetime) -> dict:
+        """Revenue, cost, units and transaction count for [start, end), aggregated in SQL"""
+        transactions, revenue = self.db.query(
+            func.count(Sales.id),
+            func.coalesce(func.sum(Sales.total_amount), 0)
+        ).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).one()
+        
+        units, cost = self.db.query(
+            func.coalesce(func.sum(SalesItem.quantity), 0),
+            func.coalesce(func.sum(SalesItem.quantity * TireInventory.purchase_price), 0)
+        ).join(
+            Sales, Sales.id == SalesItem.sale_id
+        ).join(
+            TireInventory, TireInventory.id == SalesItem.tire_id
+        ).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).one()
+        
+        return {
+            "transactions": int(transactions),
+            "revenue": float(revenue),
+            "units": int(units),
+            "cost": float(cost)
+        }
+    
+    def get_top_products(self, start: datetime, end: datetime, dimension: str = "sku", by: str = "revenue", limit: int = 10) -> List[dict]:
+        """Rank SKUs, brands or sizes over [start, end) by units, revenue or profit.
+        
+        One grouped query; rank and share of total come from window functions over
+        the grouped rows, so the share is relative to every group, not just the top N.
+        Revenue is net of discount (the stored taxable value, else the line total).
+        """
+        group_cols = {
+            "sku": [SalesItem.tire_id, TireInventory.brand, TireInventory.tire_size],
+            "brand": [TireInventory.brand],
+            "size": [TireInventory.tire_size]
+        }[dimension]
+        
+        units = func.sum(SalesItem.quantity)
+        revenue = func.sum(func.coalesce(SalesItem.taxable_value, SalesItem.total_price))
+        profit = revenue - func.sum(SalesItem.quantity * TireInventory.purchase_price)
+        metric = {"units": units, "revenue": revenue, "profit": profit}[by]
+        
+        rank = func.rank().over(order_by=metric.desc())
+        share = metric * 100.0 / func.nullif(func.sum(metric).over(), 0)
+        
+        stmt = select(
+            *group_cols,
+            units.label("units"),
+            revenue.label("revenue"),
+            profit.label("profit"),
+            rank.label("rank"),
+            share.label("share")
+        ).select_from(SalesItem).join(
+            Sales, Sales.id == SalesItem.sale_id
+        ).join(
+            TireInventory, TireInventory.id == SalesItem.tire_id
+        ).where(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).group_by(*group_cols).order_by(rank, *group_cols).limit(limit)
+        
+        return [
+            {
+                "tire_id": r.tire_id if dimension == "sku" else None,
+                "brand": r.brand if dimension in ("sku", "brand") else None,
+                "tire_size": r.tire_size if dimension in ("sku", "size") else None,
+                "units": int(r.units),
+                "revenue": round(float(r.revenue), 2),
+                "profit": round(float(r.profit), 2),
+                "rank": int(r.rank),
+                "share": round(float(r.share), 2) if r.share is not None else 0.0
+            }
+            for r in self.db.execute(stmt)
+        ]
+    
+    def get_weekday_hour_buckets(self, start: datetime, end: datetime, timezone: str) -> List[dict]:
+        """Sales count and revenue for [start, end) (UTC) grouped by local weekday and hour.
+        
+        Weekday follows SQL's convention: 0 = Sunday ... 6 = Saturday.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            local_time = func.timezone(timezone, func.timezone('UTC', Sales.sale_date))
+            weekday = cast(func.extract('dow', local_time), Integer)
+            hour = cast(func.extract('hour', local_time), Integer)
+        else:
+            # No timezone database in SQL (e.g. SQLite in development): apply the
+            # zone's UTC offset at the start of the range
+            offset = ZoneInfo(timezone).utcoffset(start)
+            local_time = func.datetime(Sales.sale_date, f"{int(offset.total_seconds() // 60):+d} minutes")
+            weekday = cast(func.strftime('%w', local_time), Integer)
+            hour = cast(func.strftime('%H', local_time), Integer)
+        
+        results = self.db.query(
+            weekday.label('weekday'),
+            hour.label('hour'),
+            func.count(Sales.id).label('sales_count'),
+            func.coalesce(func.sum(Sales.total_amount), 0).label('revenue')
+        ).filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).group_by('weekday', 'hour').all()
+        
+        return [
+            {
+                "weekday": int(r.weekday),
+                "hour": int(r.hour),
+                "sales_count": int(r.sales_count),
+                "revenue": float(r.revenue)
+            }
+            for r in results
+        ]
+    
+    def get_latest_sale_id(self) -> int:
+        """Highest sale id; changes with every new sale (index-only lookup)"""
+        return self.db.query(func.max(Sales.id)).scalar() or 0
+    
+    def get_monthly_line_fingerprints(self) -> List[dict]:
+        """Line count and highest line id per (year, month) of sale_date"""
+        year = func.extract('year', Sales.sale_date)
+        month = func.extract('month', Sales.sale_date)
+        results = self.db.query(
+            year.label('year'),
+            month.label('month'),
+            func.count(SalesItem.id).label('line_count'),
+            func.max(SalesItem.id).label('max_item_id')
+        ).join(
+            SalesItem, SalesItem.sale_id == Sales.id
+        ).group_by(year, month).order_by(year, month).all()
+        
+        return [
+            {
+                "year": int(r.year),
+                "month": int(r.month),
+                "line_count": int(r.line_count),
+                "max_item_id": int(r.max_item_id)
+            }
+            for r in results
+        ]
+    
+    def get_data_version(self) -> str:
+        """Cheap fingerprint that changes whenever a sale is added or removed"""
+        count, max_id = self.db.query(func.count(Sales.id), func.max(Sales.id)).one()
+        return f"{count}:{max_id or 0}"
+    
+    def get_by_day(self, day: date) -> List[Sales]:
+        """Sales on one of the shop's calendar days"""
+        start, end = local_day_bounds(day)
+        return self._query_with_items().filter(
+            Sales.sale_date >= start,
+            Sales.sale_date < end
+        ).all()
+    
     def get_today_sales(self) -> float:
         today = date.today()
         result = self.db.query(func.sum(Sales.total_amount)).filter(
@@ -64,14 +362,66 @@ class SalesRepository:
     def generate_invoice_id(self) -> str:
         today = date.today()
         prefix = f"INV{today.strftime('%Y%m%d')}"
-        last_sale = self.db.query(Sales).filter(
-            Sales.invoice_id.like(f"{prefix}%")
-        ).order_by(Sales.id.desc()).first()
+        last_invoice = self.db.query(InvoiceNumber).filter(
+            InvoiceNumber.invoice_id.like(f"{prefix}%")
+        ).order_by(InvoiceNumber.invoice_id.desc()).first()
         
-        if last_sale:
-            last_num = int(last_sale.invoice_id[-4:])
+        if last_invoice:
+            last_num = int(last_invoice.invoice_id[-4:])
             new_num = last_num + 1
         else:
             new_num = 1
         
         return f"{prefix}{new_num:04d}"
+
+class AsyncSalesRepository:
+    """The sales queries the POS routes need, on an AsyncSession.
+
+    Lazy loads cannot run under asyncio, so every sale comes back with its
+    items and their tires already loaded.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    def _select_with_items(self):
+        return select(Sales).options(
+            selectinload(Sales.items).joinedload(SalesItem.tire)
+        )
+    
+    async def create(self, sales_data: dict, items_data: List[dict]) -> Sales:
+        sale = Sales(**sales_data)
+        # Claims the invoice id: a concurrent sale that drew the same one fails here
+        self.db.add(InvoiceNumber(invoice_id=sale.invoice_id))
+        self.db.add(sale)
+        await self.db.flush()
+        
+        for item_data in items_data:
+            item = SalesItem(sale_id=sale.id, sale_date=sale.sale_date, **item_data)
+            self.db.add(item)
+        
+        await self.db.commit()
+        return await self.get_by_id(sale.id)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Sales]:
+        result = await self.db.execute(
+            self._select_with_items().order_by(Sales.sale_date.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_by_id(self, sale_id: int) -> Optional[Sales]:
+        result = await self.db.execute(
+            self._select_with_items().where(Sales.id == sale_id).execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+    
+    async def generate_invoice_id(self) -> str:
+        today = date.today()
+        prefix = f"INV{today.strftime('%Y%m%d')}"
+        last_invoice_id = await self.db.scalar(
+            select(InvoiceNumber.invoice_id).where(
+                InvoiceNumber.invoice_id.like(f"{prefix}%")
+            ).order_by(InvoiceNumber.invoice_id.desc()).limit(1)
+        )
+        
+        new_num = int(last_invoice_id[-4:]) + 1 if last_invoice_id else 1
+        return f"{prefix}{new_num:04d}"
@@ -0,0 +1,137 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from app.models.whatsapp_broadcast import (
+    WhatsAppBroadcast, WhatsAppBroadcastRecipient, BroadcastStatus, RecipientStatus
+)
+
+class WhatsAppBroadcastRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, broadcast_data: dict, recipients: List[tuple]) -> WhatsAppBroadcast:
+        """Create a broadcast with its (mobile, name) recipients in one transaction"""
+        broadcast = WhatsAppBroadcast(**broadcast_data, total_recipients=len(recipients))
+        broadcast.recipients = [
+            WhatsAppBroadcastRecipient(mobile=mobile, name=name)
+            for mobile, name in recipients
+        ]
+        self.db.add(broadcast)
+        self.db.commit()
+        self.db.refresh(broadcast)
+        return broadcast
+
+    def get_by_id(self, broadcast_id: int) -> Optional[WhatsAppBroadcast]:
+        return self.db.query(WhatsAppBroadcast).filter(WhatsAppBroadcast.id == broadcast_id).first()
+
+    def get_status_counts(self, broadcast_id: int) -> dict:
+        rows = self.db.query(
+            WhatsAppBroadcastRecipient.status, func.count(WhatsAppBroadcastRecipient.id)
+        ).filter(
+            WhatsAppBroadcastRecipient.broadcast_id == broadcast_id
+        ).group_by(WhatsAppBroadcastRecipient.status).all()
+        return {status.value: count for status, count in rows}
+
+    def get_recipients(
+        self,
+        broadcast_id: int,
+        status: Optional[RecipientStatus] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[WhatsAppBroadcastRecipient]:
+        query = self.db.query(WhatsAppBroadcastRecipient).filter(
+            WhatsAppBroadcastRecipient.broadcast_id == broadcast_id
+        )
+        if status is not None:
+            query = query.filter(WhatsAppBroadcastRecipient.status == status)
+        return query.order_by(WhatsAppBroadcastRecipient.id).offset(skip).limit(limit).all()
+
+    def get_pending_recipients(self, broadcast_id: int, limit: int) -> List[WhatsAppBroadcastRecipient]:
+        return self.get_recipients(broadcast_id, RecipientStatus.PENDING, 0, limit)
+
+    def claim_next(self, now: datetime, stale_before: datetime) -> Optional[WhatsAppBroadcast]:
+        """Mark the oldest unfinished broadcast as running and return it, unless
+        another runner is still heartbeating it. Broadcasts therefore send one
+        at a time, in order, across every worker."""
+        oldest_id = self.db.query(WhatsAppBroadcast.id).filter(
+            WhatsAppBroadcast.status.in_([BroadcastStatus.QUEUED, BroadcastStatus.RUNNING])
+        ).order_by(WhatsAppBroadcast.id).limit(1).scalar()
+        broadcast = None
+        if oldest_id is not None:
+            # Locked and re-read: another runner may have claimed it meanwhile
+            broadcast = self.db.query(WhatsAppBroadcast).filter(
+                WhatsAppBroadcast.id == oldest_id
+            ).with_for_update(skip_locked=True).populate_existing().first()
+        claimable = broadcast is not None and (
+            broadcast.status == BroadcastStatus.QUEUED
+            or (broadcast.status == BroadcastStatus.RUNNING and broadcast.heartbeat_at < stale_before)
+        )
+        if not claimable:
+            self.db.commit()
+            return None
+
+        # A runner that died mid-send may or may not have delivered these; never resend
+        self.db.query(WhatsAppBroadcastRecipient).filter(
+            WhatsAppBroadcastRecipient.broadcast_id == broadcast.id,
+            WhatsAppBroadcastRecipient.status == RecipientStatus.SENDING
+        ).update({
+            "status": RecipientStatus.FAILED,
+            "error": "Interrupted before delivery was confirmed; not resent"
+        }, synchronize_session=False)
+
+        broadcast.status = BroadcastStatus.RUNNING
+        broadcast.started_at = broadcast.started_at or now
+        broadcast.heartbeat_at = now
+        self.db.commit()
+        return broadcast
+
+    def heartbeat(self, broadcast: WhatsAppBroadcast, now: datetime) -> None:
+        broadcast.heartbeat_at = now
+        self.db.commit()
+
+    def finish(self, broadcast: WhatsAppBroadcast, now: datetime) -> None:
+        broadcast.status = BroadcastStatus.COMPLETED
+        broadcast.finished_at = now
+        self.db.commit()
+
+    def cancel(self, broadcast: WhatsAppBroadcast, now: datetime) -> None:
+        broadcast.status = BroadcastStatus.CANCELLED
+        broadcast.finished_at = now
+        self.db.query(WhatsAppBroadcastRecipient).filter(
+            WhatsAppBroadcastRecipient.broadcast_id == broadcast.id,
+            WhatsAppBroadcastRecipient.status == RecipientStatus.PENDING
+        ).update({"status": RecipientStatus.SKIPPED}, synchronize_session=False)
+        self.db.commit()
+
+    def mark_sending(self, recipient: WhatsAppBroadcastRecipient) -> bool:
+        """Move a pending recipient to sending; False if it is no longer pending
+        (the broadcast was cancelled). Committed before the provider call so a
+        crash cannot lead to a resend."""
+        updated = self.db.query(WhatsAppBroadcastRecipient).filter(
+            WhatsAppBroadcastRecipient.id == recipient.id,
+            WhatsAppBroadcastRecipient.status == RecipientStatus.PENDING
+        ).update({
+            "status": RecipientStatus.SENDING,
+            "attempts": WhatsAppBroadcastRecipient.attempts + 1
+        }, synchronize_session=False)
+        self.db.commit()
+        return updated == 1
+
+    def mark_sent(self, recipient: WhatsAppBroadcastRecipient, provider_message_id: str, now: datetime) -> None:
+        recipient.status = RecipientStatus.SENT
+        recipient.provider_message_id = provider_message_id
+        recipient.error = None
+        recipient.sent_at = now
+        self.db.commit()
+
+    def mark_retry(self, recipient: WhatsAppBroadcastRecipient, error: str) -> None:
+        """Back to pending after a failure the provider reported (nothing was delivered)"""
+        recipient.status = RecipientStatus.PENDING
+        recipient.error = error
+        self.db.commit()
+
+    def mark_failed(self, recipient: WhatsAppBroadcastRecipient, error: str) -> None:
+        recipient.status = RecipientStatus.FAILED
+        recipient.error = error
+        self.db.commit()
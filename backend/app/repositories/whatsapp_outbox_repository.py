@@ -0,0 +1,62 @@
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from app.models.whatsapp_message import WhatsAppMessage, MessageStatus
+
+class WhatsAppOutboxRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, message_data: dict) -> WhatsAppMessage:
+        message = WhatsAppMessage(**message_data)
+        self.db.add(message)
+        self.db.commit()
+        self.db.refresh(message)
+        return message
+
+    def get_by_id(self, message_id: int) -> Optional[WhatsAppMessage]:
+        return self.db.query(WhatsAppMessage).filter(WhatsAppMessage.id == message_id).first()
+
+    def claim_due(self, now: datetime, limit: int) -> List[WhatsAppMessage]:
+        """Mark up to limit due messages as sending and return them.
+        SKIP LOCKED lets several dispatchers (one per worker process) share the outbox."""
+        messages = self.db.query(WhatsAppMessage).filter(
+            WhatsAppMessage.status == MessageStatus.PENDING,
+            WhatsAppMessage.next_attempt_at <= now
+        ).order_by(
+            WhatsAppMessage.next_attempt_at, WhatsAppMessage.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
+
+        for message in messages:
+            message.status = MessageStatus.SENDING
+            message.claimed_at = now
+        self.db.commit()
+        return messages
+
+    def release_stale(self, claimed_before: datetime) -> int:
+        """Return messages claimed by a dispatcher that died mid-send to the queue"""
+        count = self.db.query(WhatsAppMessage).filter(
+            WhatsAppMessage.status == MessageStatus.SENDING,
+            WhatsAppMessage.claimed_at < claimed_before
+        ).update({"status": MessageStatus.PENDING}, synchronize_session=False)
+        self.db.commit()
+        return count
+
+    def mark_sent(self, message: WhatsAppMessage, provider_message_id: str, now: datetime) -> None:
+        message.status = MessageStatus.SENT
+        message.attempts += 1
+        message.provider_message_id = provider_message_id
+        message.last_error = None
+        message.sent_at = now
+        self.db.commit()
+
+    def mark_failed(self, message: WhatsAppMessage, error: str, next_attempt_at: Optional[datetime]) -> None:
+        """Schedule a retry, or dead-letter the message when next_attempt_at is None"""
+        message.attempts += 1
+        message.last_error = error
+        if next_attempt_at is None:
+            message.status = MessageStatus.DEAD
+        else:
+            message.status = MessageStatus.PENDING
+            message.next_attempt_at = next_attempt_at
+        self.db.commit()
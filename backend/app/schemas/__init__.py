@@ -5,6 +5,12 @@ from .dashboard import DashboardResponse, DashboardSummary, LowStockItem
 from .purchase import PurchaseCreate, PurchaseUpdate, PurchaseResponse
 from .invoice import ShopConfig, InvoiceGenerateRequest, WhatsAppSendRequest
 from .profit import ProfitSummary, SaleProfitDetail, DailyClosingReport
+from .gst import GstRateSummary, GstMonthlySummary
+from .report_job import ReportJobSpec, ReportJobStatus
+from .analytics import PeriodMetrics, MetricDelta, PeriodDeltas, PeriodComparison, TopProductRow, TopProductsResponse, HeatmapCell, SalesHeatmap
+from .customer import CustomerResponse
+from .whatsapp import WhatsAppMessageResponse, BroadcastRecipientQuery, BroadcastCreate, BroadcastResponse, BroadcastRecipientResponse
+from .scheduler import JobRunResponse, ScheduledJobResponse
 
 __all__ = [
     "UserCreate",
@@ -28,5 +34,25 @@ __all__ = [
     "WhatsAppSendRequest",
     "ProfitSummary",
     "SaleProfitDetail",
-    "DailyClosingReport"
+    "DailyClosingReport",
+    "GstRateSummary",
+    "GstMonthlySummary",
+    "ReportJobSpec",
+    "ReportJobStatus",
+    "PeriodMetrics",
+    "MetricDelta",
+    "PeriodDeltas",
+    "PeriodComparison",
+    "CustomerResponse",
+    "TopProductRow",
+    "TopProductsResponse",
+    "HeatmapCell",
+    "SalesHeatmap",
+    "WhatsAppMessageResponse",
+    "BroadcastRecipientQuery",
+    "BroadcastCreate",
+    "BroadcastResponse",
+    "BroadcastRecipientResponse",
+    "JobRunResponse",
+    "ScheduledJobResponse"
 ]
@@ -0,0 +1,60 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import date
+
+class PeriodMetrics(BaseModel):
+    start_date: date
+    end_date: date
+    revenue: float
+    profit: float
+    units: int
+    transactions: int
+    average_ticket: float
+
+class MetricDelta(BaseModel):
+    absolute: float
+    percent: Optional[float] = None  # None when the previous value is zero
+
+class PeriodDeltas(BaseModel):
+    revenue: MetricDelta
+    profit: MetricDelta
+    units: MetricDelta
+    transactions: MetricDelta
+    average_ticket: MetricDelta
+
+class PeriodComparison(BaseModel):
+    current: PeriodMetrics
+    previous: PeriodMetrics
+    deltas: PeriodDeltas
+
+class TopProductRow(BaseModel):
+    rank: int
+    tire_id: Optional[int] = None  # sku dimension only
+    brand: Optional[str] = None  # sku and brand dimensions
+    tire_size: Optional[str] = None  # sku and size dimensions
+    units: int
+    revenue: float  # Net of discount
+    profit: float
+    share: float  # Percent of the ranking metric's total over the window
+
+class TopProductsResponse(BaseModel):
+    start_date: date
+    end_date: date
+    dimension: str
+    by: str
+    items: List[TopProductRow]
+
+class HeatmapCell(BaseModel):
+    weekday: int  # 0 = Monday ... 6 = Sunday
+    weekday_name: str
+    hour: int  # 0-23, shop local time
+    sales_count: int
+    revenue: float
+
+class SalesHeatmap(BaseModel):
+    start_date: date
+    end_date: date
+    timezone: str
+    total_sales: int
+    total_revenue: float
+    cells: List[HeatmapCell]  # All 7 x 24 buckets, Monday 00:00 first
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class CustomerResponse(BaseModel):
+    id: int
+    mobile: str
+    name: str
+    visit_count: int
+    lifetime_spend: float
+    first_visit: Optional[datetime] = None
+    last_visit: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
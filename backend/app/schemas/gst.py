@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class GstRateSummary(BaseModel):
+    hsn_code: Optional[str] = None
+    gst_rate: Optional[float] = None
+    invoice_count: int
+    quantity: int
+    taxable_value: float
+    cgst_amount: float
+    sgst_amount: float
+    total_tax: float
+
+class GstMonthlySummary(BaseModel):
+    month: str  # YYYY-MM
+    is_closed: bool  # Closed months are served from an immutable snapshot
+    generated_at: datetime
+    invoice_count: int
+    taxable_value: float
+    cgst_amount: float
+    sgst_amount: float
+    total_tax: float
+    rows: List[GstRateSummary]
@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import date
 from app.models.inventory import TireType
+from app.core.gst import DEFAULT_HSN_CODE, DEFAULT_GST_RATE
 
 class TireInventoryBase(BaseModel):
     brand: str
@@ -12,6 +13,8 @@ class TireInventoryBase(BaseModel):
     selling_price: float
     supplier_id: Optional[int] = None
     purchase_date: date
+    hsn_code: str = DEFAULT_HSN_CODE
+    gst_rate: float = DEFAULT_GST_RATE
 
 class TireInventoryCreate(TireInventoryBase):
     pass
@@ -25,6 +28,8 @@ class TireInventoryUpdate(BaseModel):
     selling_price: Optional[float] = None
     supplier_id: Optional[int] = None
     purchase_date: Optional[date] = None
+    hsn_code: Optional[str] = None
+    gst_rate: Optional[float] = None
 
 class TireInventoryResponse(TireInventoryBase):
     id: int
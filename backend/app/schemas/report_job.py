@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional, Literal
+from datetime import date, datetime
+
+class ReportJobSpec(BaseModel):
+    kind: Literal["sales", "profit_details", "daily_closing"]
+    format: Literal["json", "xlsx"] = "json"  # xlsx is available for sales only
+    start_date: Optional[date] = None  # sales
+    end_date: Optional[date] = None  # sales
+    report_date: Optional[date] = None  # daily_closing
+    skip: int = 0  # profit_details
+    limit: int = 100  # profit_details
+
+class ReportJobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: Literal["queued", "running", "done", "failed"]
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.models.job_run import JobRunStatus
+
+class JobRunResponse(BaseModel):
+    id: int
+    job_name: str
+    scheduled_for: datetime
+    worker: str
+    status: JobRunStatus
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+class ScheduledJobResponse(BaseModel):
+    name: str
+    cron: str
+    next_run: Optional[datetime] = None  # Shop timezone; None while the scheduler is stopped
+    last_run: Optional[JobRunResponse] = None
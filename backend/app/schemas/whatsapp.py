@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+from app.models.whatsapp_message import MessageStatus
+from app.models.whatsapp_broadcast import BroadcastStatus, RecipientStatus
+
+class WhatsAppMessageResponse(BaseModel):
+    id: int
+    to_number: str
+    sale_id: Optional[int] = None
+    status: MessageStatus
+    attempts: int
+    next_attempt_at: datetime
+    last_error: Optional[str] = None
+    provider_message_id: Optional[str] = None
+    created_at: datetime
+    sent_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class BroadcastRecipientQuery(BaseModel):
+    """Customers who bought matching tyres within the last `months` months"""
+    tire_size: Optional[str] = None
+    brand: Optional[str] = None
+    months: int = 12
+
+class BroadcastCreate(BaseModel):
+    body: str  # "{name}" is replaced with each customer's name
+    recipients: BroadcastRecipientQuery
+
+class BroadcastResponse(BaseModel):
+    id: int
+    body: str
+    criteria: BroadcastRecipientQuery
+    status: BroadcastStatus
+    total_recipients: int
+    counts: Dict[str, int]  # Recipients per RecipientStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class BroadcastRecipientResponse(BaseModel):
+    id: int
+    mobile: str
+    name: str
+    status: RecipientStatus
+    attempts: int
+    provider_message_id: Optional[str] = None
+    error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
@@ -1,11 +1,48 @@
-from .auth_service import AuthService
-from .inventory_service import InventoryService
-from .sales_service import SalesService
-from .dashboard_service import DashboardService
-from .purchase_service import PurchaseService
-from .invoice_service import InvoiceService
-from .profit_service import ProfitService
-from .whatsapp_service import WhatsAppService
+# Services are imported on first use (PEP 562): importing any service module
+# runs this package first, and it must not drag every other service and its
+# dependencies (ReportLab, Twilio, pyarrow, ...) into each worker at boot
+from importlib import import_module
+
+# Exported name -> module that defines it
+_EXPORTS = {
+    "AuthService": ".auth_service",
+    "InventoryService": ".inventory_service",
+    "AsyncInventoryService": ".inventory_service",
+    "SalesService": ".sales_service",
+    "AsyncSalesService": ".sales_service",
+    "DashboardService": ".dashboard_service",
+    "PurchaseService": ".purchase_service",
+    "AsyncPurchaseService": ".purchase_service",
+    "InvoiceService": ".invoice_service",
+    "ProfitService": ".profit_service",
+    "WhatsAppService": ".whatsapp_service",
+    "SalesExportService": ".sales_export_service",
+    "ReportExportService": ".report_export_service",
+    "GstService": ".gst_service",
+    "ReportJobQueue": ".report_job_service",
+    "report_jobs": ".report_job_service",
+    "AnalyticsService": ".analytics_service",
+    "CustomerService": ".customer_service",
+    "WhatsAppOutboxService": ".whatsapp_outbox_service",
+    "WhatsAppDispatcher": ".whatsapp_outbox_service",
+    "whatsapp_dispatcher": ".whatsapp_outbox_service",
+    "WhatsAppBroadcastService": ".whatsapp_broadcast_service",
+    "BroadcastRunner": ".whatsapp_broadcast_service",
+    "broadcast_runner": ".whatsapp_broadcast_service",
+    "scheduler": ".scheduled_jobs",
+    "SalesArchiveService": ".sales_archive_service",
+}
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     "AuthService",
@@ -15,5 +52,23 @@ __all__ = [
     "PurchaseService",
     "InvoiceService",
     "ProfitService",
-    "WhatsAppService"
+    "WhatsAppService",
+    "SalesExportService",
+    "ReportExportService",
+    "GstService",
+    "ReportJobQueue",
+    "report_jobs",
+    "AnalyticsService",
+    "CustomerService",
+    "WhatsAppOutboxService",
+    "WhatsAppDispatcher",
+    "whatsapp_dispatcher",
+    "WhatsAppBroadcastService",
+    "BroadcastRunner",
+    "broadcast_runner",
+    "scheduler",
+    "AsyncInventoryService",
+    "AsyncSalesService",
+    "AsyncPurchaseService",
+    "SalesArchiveService"
 ]
@@ -0,0 +1,179 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from datetime import date, timedelta
+from typing import Optional
+from collections import OrderedDict
+import threading
+from app.repositories.sales_repository import SalesRepository
+from app.core.config import settings
+from app.core.shop_time import local_day_bounds, shop_today
+from app.services.sales_archive_service import SalesArchiveService
+from app.schemas.analytics import (
+    PeriodMetrics, MetricDelta, PeriodDeltas, PeriodComparison,
+    TopProductRow, TopProductsResponse, HeatmapCell, SalesHeatmap
+)
+
+# Top-product rankings per window, each valid until the next sale is recorded
+TOP_PRODUCTS_CACHE_SIZE = 128
+_top_products_cache = OrderedDict()
+_top_products_lock = threading.Lock()
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+class AnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.sales_repo = SalesRepository(db)
+    
+    def compare_periods(
+        self,
+        start_date: date,
+        end_date: date,
+        previous_start: Optional[date] = None,
+        previous_end: Optional[date] = None
+    ) -> PeriodComparison:
+        """Compare two ranges of shop calendar days (inclusive). Without an explicit previous period,
+        the equally long period immediately before the current one is used."""
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_date must not be before start_date"
+            )
+        if (previous_start is None) != (previous_end is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="previous_start and previous_end must be given together"
+            )
+        if previous_start is None:
+            length = end_date - start_date
+            previous_end = start_date - timedelta(days=1)
+            previous_start = previous_end - length
+        elif previous_end < previous_start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="previous_end must not be before previous_start"
+            )
+        
+        SalesArchiveService(self.db).include_archived(local_day_bounds(min(start_date, previous_start))[0])
+        current = self._period_metrics(start_date, end_date)
+        previous = self._period_metrics(previous_start, previous_end)
+        
+        return PeriodComparison(
+            current=current,
+            previous=previous,
+            deltas=PeriodDeltas(
+                revenue=self._delta(current.revenue, previous.revenue),
+                profit=self._delta(current.profit, previous.profit),
+                units=self._delta(current.units, previous.units),
+                transactions=self._delta(current.transactions, previous.transactions),
+                average_ticket=self._delta(current.average_ticket, previous.average_ticket)
+            )
+        )
+    
+    def get_top_products(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        dimension: str = "sku",
+        by: str = "revenue",
+        limit: int = 10
+    ) -> TopProductsResponse:
+        """Rank SKUs, brands or sizes over an inclusive window of shop calendar days
+        (default: last 30 days)"""
+        if end_date is None:
+            end_date = shop_today()
+        if start_date is None:
+            start_date = end_date - timedelta(days=29)
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_date must not be before start_date"
+            )
+        
+        # The latest sale id is an index-only lookup; a new sale invalidates every window
+        latest_sale_id = self.sales_repo.get_latest_sale_id()
+        key = (start_date, end_date, dimension, by, limit)
+        with _top_products_lock:
+            cached = _top_products_cache.get(key)
+            if cached and cached[0] == latest_sale_id:
+                _top_products_cache.move_to_end(key)
+                return cached[1]
+        
+        start, end = local_day_bounds(start_date, end_date)
+        SalesArchiveService(self.db).include_archived(start)
+        rows = self.sales_repo.get_top_products(start, end, dimension, by, limit)
+        response = TopProductsResponse(
+            start_date=start_date,
+            end_date=end_date,
+            dimension=dimension,
+            by=by,
+            items=[TopProductRow(**row) for row in rows]
+        )
+        
+        with _top_products_lock:
+            _top_products_cache[key] = (latest_sale_id, response)
+            _top_products_cache.move_to_end(key)
+            while len(_top_products_cache) > TOP_PRODUCTS_CACHE_SIZE:
+                _top_products_cache.popitem(last=False)
+        
+        return response
+    
+    def get_sales_heatmap(self, start_date: date, end_date: date) -> SalesHeatmap:
+        """Sales count and revenue by weekday x hour, in the shop's timezone"""
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_date must not be before start_date"
+            )
+        
+        start, end = local_day_bounds(start_date, end_date)
+        SalesArchiveService(self.db).include_archived(start)
+        
+        buckets = {
+            # SQL weekday 0 = Sunday; report Monday-first like Python's weekday()
+            ((row["weekday"] + 6) % 7, row["hour"]): row
+            for row in self.sales_repo.get_weekday_hour_buckets(start, end, settings.SHOP_TIMEZONE)
+        }
+        
+        cells = []
+        for weekday in range(7):
+            for hour in range(24):
+                row = buckets.get((weekday, hour))
+                cells.append(HeatmapCell(
+                    weekday=weekday,
+                    weekday_name=WEEKDAY_NAMES[weekday],
+                    hour=hour,
+                    sales_count=row["sales_count"] if row else 0,
+                    revenue=round(row["revenue"], 2) if row else 0.0
+                ))
+        
+        return SalesHeatmap(
+            start_date=start_date,
+            end_date=end_date,
+            timezone=settings.SHOP_TIMEZONE,
+            total_sales=sum(cell.sales_count for cell in cells),
+            total_revenue=round(sum(cell.revenue for cell in cells), 2),
+            cells=cells
+        )
+    
+    def _period_metrics(self, start_date: date, end_date: date) -> PeriodMetrics:
+        start, end = local_day_bounds(start_date, end_date)
+        metrics = self.sales_repo.get_period_metrics(start, end)
+        
+        transactions = metrics["transactions"]
+        revenue = metrics["revenue"]
+        return PeriodMetrics(
+            start_date=start_date,
+            end_date=end_date,
+            revenue=round(revenue, 2),
+            profit=round(revenue - metrics["cost"], 2),
+            units=metrics["units"],
+            transactions=transactions,
+            average_ticket=round(revenue / transactions, 2) if transactions else 0.0
+        )
+    
+    def _delta(self, current: float, previous: float) -> MetricDelta:
+        return MetricDelta(
+            absolute=round(current - previous, 2),
+            percent=round((current - previous) * 100 / abs(previous), 2) if previous else None
+        )
@@ -0,0 +1,21 @@
+from sqlalchemy.orm import Session
+from typing import List
+from fastapi import HTTPException, status
+from app.repositories.customer_repository import CustomerRepository
+from app.schemas.customer import CustomerResponse
+from app.core.phone import normalize_mobile
+
+class CustomerService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.customer_repo = CustomerRepository(db)
+    
+    def get_top_customers(self, limit: int = 10, by: str = "spend") -> List[CustomerResponse]:
+        customers = self.customer_repo.get_top(limit, by)
+        return [CustomerResponse.model_validate(customer) for customer in customers]
+    
+    def get_customer_by_mobile(self, mobile: str) -> CustomerResponse:
+        customer = self.customer_repo.get_by_mobile(normalize_mobile(mobile))
+        if not customer:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+        return CustomerResponse.model_validate(customer)
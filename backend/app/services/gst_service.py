@@ -0,0 +1,74 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from datetime import datetime
+from app.repositories.sales_repository import SalesRepository
+from app.repositories.gst_repository import GstSnapshotRepository
+from app.schemas.gst import GstMonthlySummary, GstRateSummary
+from app.core.gst import round_money
+from app.core.shop_time import local_to_utc, shop_now
+from app.services.sales_archive_service import SalesArchiveService
+
+class GstService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.sales_repo = SalesRepository(db)
+        self.snapshot_repo = GstSnapshotRepository(db)
+
+    def get_monthly_summary(self, month: str) -> GstMonthlySummary:
+        """GSTR-1 style summary for a month (YYYY-MM), grouped by HSN and rate"""
+        try:
+            start = datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="month must be in YYYY-MM format"
+            )
+        end = datetime(start.year + 1, 1, 1) if start.month == 12 else datetime(start.year, start.month + 1, 1)
+
+        # The month is the shop's calendar month; it closes at local midnight
+        now = shop_now()
+        is_closed = end <= datetime(now.year, now.month, 1)
+
+        if is_closed:
+            snapshot = self.snapshot_repo.get(month)
+            if snapshot:
+                return GstMonthlySummary.model_validate_json(snapshot.payload)
+
+        summary = self._build_summary(month, local_to_utc(start), local_to_utc(end), is_closed)
+
+        if is_closed:
+            try:
+                self.snapshot_repo.create(month, summary.model_dump_json())
+            except IntegrityError:
+                # Another request froze the month first; both summaries are identical
+                self.db.rollback()
+
+        return summary
+
+    def _build_summary(self, month: str, start: datetime, end: datetime, is_closed: bool) -> GstMonthlySummary:
+        """start and end are the month's bounds in UTC"""
+        SalesArchiveService(self.db).include_archived(start)
+        data = self.sales_repo.get_gst_summary(start, end)
+
+        rows = [
+            GstRateSummary(
+                **row,
+                total_tax=round_money(row["cgst_amount"] + row["sgst_amount"])
+            )
+            for row in data["rows"]
+        ]
+        cgst = round_money(sum(row.cgst_amount for row in rows))
+        sgst = round_money(sum(row.sgst_amount for row in rows))
+
+        return GstMonthlySummary(
+            month=month,
+            is_closed=is_closed,
+            generated_at=datetime.utcnow(),
+            invoice_count=data["invoice_count"],
+            taxable_value=round_money(sum(row.taxable_value for row in rows)),
+            cgst_amount=cgst,
+            sgst_amount=sgst,
+            total_tax=round_money(cgst + sgst),
+            rows=rows
+        )
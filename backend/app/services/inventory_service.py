@@ -1,7 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fastapi import HTTPException, status
-from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.inventory_repository import InventoryRepository, AsyncInventoryRepository
 from app.schemas.inventory import TireInventoryCreate, TireInventoryUpdate, TireInventoryResponse
 
 class InventoryService:
@@ -47,6 +48,43 @@ class InventoryService:
             "selling_price": item.selling_price,
             "supplier_id": item.supplier_id,
             "purchase_date": item.purchase_date,
+            "hsn_code": item.hsn_code,
+            "gst_rate": item.gst_rate,
             "supplier_name": item.supplier.name if item.supplier else None
         }
         return TireInventoryResponse(**response_data)
+
+class AsyncInventoryService:
+    """InventoryService for the async inventory routes, on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.inventory_repo = AsyncInventoryRepository(db)
+    
+    async def get_all_inventory(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[TireInventoryResponse]:
+        items = await self.inventory_repo.get_all(skip, limit, search)
+        return [self._to_response(item) for item in items]
+    
+    async def get_inventory_by_id(self, inventory_id: int) -> TireInventoryResponse:
+        item = await self.inventory_repo.get_by_id(inventory_id)
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory item not found")
+        return self._to_response(item)
+    
+    async def create_inventory(self, inventory_data: TireInventoryCreate) -> TireInventoryResponse:
+        item = await self.inventory_repo.create(inventory_data.model_dump())
+        return self._to_response(item)
+    
+    async def update_inventory(self, inventory_id: int, inventory_data: TireInventoryUpdate) -> TireInventoryResponse:
+        update_data = inventory_data.model_dump(exclude_unset=True)
+        item = await self.inventory_repo.update(inventory_id, update_data)
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory item not found")
+        return self._to_response(item)
+    
+    async def delete_inventory(self, inventory_id: int) -> dict:
+        success = await self.inventory_repo.delete(inventory_id)
+        if not success:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory item not found")
+        return {"message": "Inventory item deleted successfully"}
+    
+    _to_response = InventoryService._to_response
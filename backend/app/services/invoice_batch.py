@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List
+import multiprocessing
+import threading
+import zipfile
+from app.core.config import settings
+from app.schemas.invoice import ShopConfig
+from app.services.invoice_storage import InvoiceStorage
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Created on first use; spawn keeps workers free of the parent's DB connections
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.INVOICE_RENDER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+class _ZipChunks:
+    """Write-only sink for ZipFile that hands back what was written so far"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def stream_invoice_zip(entries: List[dict], shop_config: ShopConfig, storage: InvoiceStorage) -> Iterator[bytes]:
+    """Yield a ZIP of the planned invoices (InvoiceService.plan_batch).
+
+    Stored PDFs go in first; missing ones, and stored ones deleted since the
+    batch was planned, are rendered across the process pool, saved to storage
+    and added in the order they finish. Invoices that fail to render are
+    listed in errors.txt instead of aborting the download.
+    """
+    sink = _ZipChunks()
+    # PDFs are already compressed, deflating them again only costs CPU
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+
+    pending = {}
+
+    def render(entry: dict) -> None:
+        # ReportLab is loaded by the first batch that renders, not when the app boots
+        from app.services.invoice_template import render_invoice_bytes
+        sale, tax = entry["snapshot"]
+        pending[_get_executor().submit(render_invoice_bytes, sale, tax, shop_config)] = entry
+
+    try:
+        for entry in entries:
+            if not entry["stored"]:
+                render(entry)
+
+        for entry in entries:
+            if entry["stored"]:
+                try:
+                    content = storage.get(entry["key"])
+                except FileNotFoundError:
+                    render(entry)  # Pruned or lost after the batch was planned
+                    continue
+                archive.writestr(f"invoice_{entry['invoice_id']}.pdf", content)
+                yield sink.drain()
+
+        errors = []
+        for future in as_completed(pending):
+            entry = pending.pop(future)
+            try:
+                content = future.result()
+                storage.put(entry["key"], content)
+            except Exception as e:
+                errors.append(f"{entry['invoice_id']}: {e}")
+                continue
+            archive.writestr(f"invoice_{entry['invoice_id']}.pdf", content)
+            yield sink.drain()
+
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Client went away mid-download: drop renders that have not started
+        for future in pending:
+            future.cancel()
@@ -1,159 +1,249 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
-from datetime import datetime
-import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+from typing import Collection, Iterator, List, NamedTuple, Optional
+import hashlib
+import json
+import threading
+from app.core.config import settings
+from app.core.shop_time import local_day_bounds
 from app.repositories.sales_repository import SalesRepository
 from app.schemas.invoice import ShopConfig
+from app.core.gst import sale_tax_breakdown
+from app.services.receipt_template import render_receipt_escpos, render_receipt_text
+from app.services.invoice_storage import InvoiceStorage, get_invoice_storage
+
+# Part of every invoice's cache key: bump it whenever the PDF layout in
+# invoice_template changes so previously cached invoices are rendered again
+INVOICE_TEMPLATE_VERSION = "2"
+
+class InvoicePdf(NamedTuple):
+    key: str  # Name in invoice storage
+    digest: str  # Content hash; doubles as the HTTP ETag
+    invoice_id: str
+    content: Optional[bytes] = None  # Set when rendered by this call
+    not_modified: bool = False  # The caller's copy is current; nothing was looked up or rendered
+
+class InvoiceRenderQueue:
+    """Single-flight invoice rendering keyed by storage key.
+    
+    submit() renders in the background; render() renders in the caller's
+    thread. Either way, a caller asking for an invoice that is already being
+    rendered waits for that render instead of starting another. Callers check
+    storage first; this only tracks renders in progress.
+    """
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = {}
+    
+    def submit(self, storage: InvoiceStorage, key: str, sale, tax: dict, shop_config: ShopConfig) -> None:
+        """Queue a render of plain (snapshotted) sale data; returns immediately"""
+        future, is_owner = self._claim(key)
+        if is_owner:
+            self._get_executor().submit(self._run, future, storage, key, sale, tax, shop_config)
+    
+    def render(self, storage: InvoiceStorage, key: str, sale, tax: dict, shop_config: ShopConfig) -> bytes:
+        """Render and store an invoice, or wait for the in-flight render of it.
+        Returns the PDF."""
+        future, is_owner = self._claim(key)
+        if is_owner:
+            self._run(future, storage, key, sale, tax, shop_config)
+            return future.result()
+        
+        try:
+            return future.result()
+        except Exception:
+            # The background render failed; try once more in this request
+            future, is_owner = self._claim(key)
+            if is_owner:
+                self._run(future, storage, key, sale, tax, shop_config)
+            return future.result()
+    
+    def _claim(self, key: str) -> tuple:
+        """Return (future, is_owner); the owner must render and resolve the future"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            return future, True
+    
+    def _run(self, future: Future, storage: InvoiceStorage, key: str, sale, tax: dict, shop_config: ShopConfig) -> None:
+        # ReportLab is loaded by the first render, not when the app boots
+        from app.services.invoice_template import render_invoice_bytes
+
+        try:
+            content = render_invoice_bytes(sale, tax, shop_config)
+            storage.put(key, content)
+            future.set_result(content)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so importing the module does not start threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="invoice-render")
+            return self._executor
+
+invoice_renders = InvoiceRenderQueue(settings.INVOICE_PRERENDER_WORKERS)
 
 class InvoiceService:
     def __init__(self, db: Session):
         self.sales_repo = SalesRepository(db)
         self.shop_config = ShopConfig()
-        
-        # Create invoices directory if not exists
-        os.makedirs("invoices", exist_ok=True)
+        self.storage = get_invoice_storage()
     
     def generate_invoice_pdf(self, sale_id: int) -> str:
-        # Get sale details
+        """Render if needed and return where the invoice can be fetched from"""
+        return self.storage.url(self.get_invoice_pdf(sale_id).key)
+    
+    def get_invoice_pdf(self, sale_id: int, cached_digests: Collection[str] = ()) -> InvoicePdf:
+        """Return the sale's invoice PDF, rendering it only if no
+        PDF exists yet for the current sale contents, shop config and template.
+        
+        cached_digests are the ones the caller already holds ("*" for any); when
+        the current digest is among them, storage is not touched at all.
+        """
+        sale = self._get_sale(sale_id)
+        
+        tax = sale_tax_breakdown(sale)
+        digest = self.invoice_digest(sale, tax)
+        key = self._invoice_key(sale, digest)
+        if digest in cached_digests or "*" in cached_digests:
+            return InvoicePdf(key, digest, sale.invoice_id, not_modified=True)
+        content = None
+        if not self.storage.exists(key):
+            content = invoice_renders.render(self.storage, key, sale, tax, self.shop_config)
+        
+        return InvoicePdf(key, digest, sale.invoice_id, content)
+    
+    def get_receipt(self, sale_id: int, format: str = "text", width: int = 48) -> bytes:
+        """Counter receipt for a thermal printer: plain text (UTF-8) or ESC/POS.
+        Uses the same stored line and tax figures as the PDF invoice."""
+        sale = self._get_sale(sale_id)
+        tax = sale_tax_breakdown(sale)
+        if format == "escpos":
+            return render_receipt_escpos(sale, tax, self.shop_config, width)
+        return render_receipt_text(sale, tax, self.shop_config, width).encode()
+    
+    def iter_invoice_pdf(self, invoice: InvoicePdf) -> Iterator[bytes]:
+        """PDF bytes for a response body, from memory when just rendered"""
+        if invoice.content is not None:
+            return iter([invoice.content])
+        return self.storage.iter_chunks(invoice.key)
+    
+    def prerender(self, sale) -> None:
+        """Queue a background render of a new sale's invoice so the first
+        download finds it ready"""
+        tax = sale_tax_breakdown(sale)
+        key = self._invoice_key(sale, self.invoice_digest(sale, tax))
+        if not self.storage.exists(key):
+            sale_copy, tax_copy = self._snapshot(sale, tax)
+            invoice_renders.submit(self.storage, key, sale_copy, tax_copy, self.shop_config)
+    
+    def plan_batch(self, start_date: date, end_date: date) -> List[dict]:
+        """Invoices for every sale in an inclusive range of shop calendar days.
+        
+        Each entry has the invoice's storage key, whether a PDF is stored under
+        it, and a picklable snapshot of the sale and its taxes to render from
+        when there is none (or it disappears before it is read). Everything is
+        read from the database here so rendering needs no session.
+        """
+        start, end = local_day_bounds(start_date, end_date)
+        
+        entries = []
+        for sale in self.sales_repo.get_by_datetime_range(start, end):
+            tax = sale_tax_breakdown(sale)
+            digest = self.invoice_digest(sale, tax)
+            key = self._invoice_key(sale, digest)
+            entries.append({
+                "invoice_id": sale.invoice_id,
+                "key": key,
+                "stored": self.storage.exists(key),
+                "snapshot": self._snapshot(sale, tax)
+            })
+        return entries
+    
+    def invoice_digest(self, sale, tax: Optional[dict] = None) -> str:
+        """Content hash of everything that appears on the invoice"""
+        if tax is None:
+            tax = sale_tax_breakdown(sale)
+        payload = {
+            "template": INVOICE_TEMPLATE_VERSION,
+            "shop": self.shop_config.model_dump(),
+            "sale": [
+                sale.id,
+                sale.invoice_id,
+                sale.sale_date.isoformat(),
+                sale.customer_name,
+                sale.customer_mobile,
+                sale.payment_mode.value
+            ],
+            "items": [
+                [
+                    line["item"].tire.brand,
+                    line["item"].tire.tire_size,
+                    line["item"].quantity,
+                    line["item"].unit_price,
+                    line["item"].total_price
+                ]
+                for line in tax["lines"]
+            ],
+            "totals": [
+                tax["subtotal"],
+                tax["discount"],
+                tax["taxable_value"],
+                tax["cgst"],
+                tax["sgst"],
+                tax["grand_total"],
+                tax["gst_rate"]
+            ]
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+    
+    def _get_sale(self, sale_id: int):
         sale = self.sales_repo.get_by_id(sale_id)
         if not sale:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Sale not found"
             )
-        
-        # Create PDF filename
-        filename = f"invoices/invoice_{sale.invoice_id}.pdf"
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(filename, pagesize=A4)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a56db'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
-        
-        # Shop Header
-        elements.append(Paragraph(self.shop_config.shop_name, title_style))
-        elements.append(Paragraph(self.shop_config.shop_address, header_style))
-        elements.append(Paragraph(f"GSTIN: {self.shop_config.gstin}", header_style))
-        elements.append(Paragraph(f"Phone: {self.shop_config.phone} | Email: {self.shop_config.email}", header_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Invoice Title
-        invoice_title = ParagraphStyle(
-            'InvoiceTitle',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a56db'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
-        elements.append(Paragraph("TAX INVOICE", invoice_title))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Invoice Details
-        invoice_data = [
-            ['Invoice No:', sale.invoice_id, 'Date:', sale.sale_date.strftime('%d-%m-%Y')],
-            ['Customer:', sale.customer_name, 'Mobile:', sale.customer_mobile],
-            ['Payment Mode:', sale.payment_mode.upper(), '', '']
-        ]
-        
-        invoice_table = Table(invoice_data, colWidths=[1.5*inch, 2.5*inch, 1*inch, 2*inch])
-        invoice_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#374151')),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ]))
-        elements.append(invoice_table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Items Table
-        items_data = [['#', 'Item Description', 'Qty', 'Rate', 'Amount']]
-        
-        subtotal = 0
-        for idx, item in enumerate(sale.items, 1):
-            items_data.append([
-                str(idx),
-                f"{item.tire.brand} - {item.tire.tire_size}",
-                str(item.quantity),
-                f"₹{item.unit_price:.2f}",
-                f"₹{item.total_price:.2f}"
-            ])
-            subtotal += item.total_price
-        
-        # Calculate GST
-        cgst = subtotal * 0.09  # 9% CGST
-        sgst = subtotal * 0.09  # 9% SGST
-        grand_total = subtotal + cgst + sgst
-        
-        # Add GST rows
-        items_data.append(['', '', '', 'Subtotal:', f"₹{subtotal:.2f}"])
-        items_data.append(['', '', '', 'CGST (9%):', f"₹{cgst:.2f}"])
-        items_data.append(['', '', '', 'SGST (9%):', f"₹{sgst:.2f}"])
-        items_data.append(['', '', '', 'Grand Total:', f"₹{grand_total:.2f}"])
-        
-        items_table = Table(items_data, colWidths=[0.5*inch, 3.5*inch, 0.8*inch, 1.5*inch, 1.5*inch])
-        items_table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            
-            # Body
-            ('FONTNAME', (0, 1), (-1, -5), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -5), 10),
-            ('GRID', (0, 0), (-1, -5), 1, colors.grey),
-            ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            
-            # Totals section
-            ('FONTNAME', (3, -4), (-1, -1), 'Helvetica-Bold'),
-            ('LINEABOVE', (3, -4), (-1, -4), 1, colors.grey),
-            ('LINEABOVE', (3, -1), (-1, -1), 2, colors.black),
-            ('FONTSIZE', (3, -1), (-1, -1), 12),
-        ]))
-        elements.append(items_table)
-        elements.append(Spacer(1, 0.5*inch))
-        
-        # Footer
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#6b7280'),
-            alignment=TA_CENTER
+        return sale
+    
+    def _invoice_key(self, sale, digest: str) -> str:
+        # Sharded by sale month so no directory or prefix grows without bound
+        return f"{sale.sale_date:%Y/%m}/invoice_{sale.invoice_id}_{digest[:16]}.pdf"
+    
+    def _snapshot(self, sale, tax: dict) -> tuple:
+        """Plain, picklable (sale, tax) copies with just what the template reads"""
+        lines = []
+        for line in tax["lines"]:
+            item = line["item"]
+            lines.append({
+                **line,
+                "item": SimpleNamespace(
+                    tire=SimpleNamespace(brand=item.tire.brand, tire_size=item.tire.tire_size),
+                    quantity=item.quantity,
+                    unit_price=item.unit_price,
+                    total_price=item.total_price
+                )
+            })
+        sale_copy = SimpleNamespace(
+            invoice_id=sale.invoice_id,
+            sale_date=sale.sale_date,
+            customer_name=sale.customer_name,
+            customer_mobile=sale.customer_mobile,
+            payment_mode=sale.payment_mode
         )
-        elements.append(Paragraph("Thank you for your business!", footer_style))
-        elements.append(Paragraph("This is a computer-generated invoice", footer_style))
-        
-        # Build PDF
-        doc.build(elements)
-        
-        return filename
+        return sale_copy, {**tax, "lines": lines}
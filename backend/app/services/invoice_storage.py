@@ -0,0 +1,344 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from functools import lru_cache
+from typing import Iterator, List, Optional
+import json
+import os
+import re
+import shutil
+import struct
+import threading
+import time
+import zipfile
+from app.core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+
+YEAR_DIR_PATTERN = re.compile(r"^\d{4}$")
+MONTH_ENTRY_PATTERN = re.compile(r"^(\d{2})(?:\.|$)")  # MM/, MM.index.json, MM.<stamp>.zip
+
+def months_ago(today: date, months: int) -> str:
+    """YYYY/MM of the month `months` before today's"""
+    index = today.year * 12 + today.month - 1 - months
+    return f"{index // 12:04d}/{index % 12 + 1:02d}"
+
+class InvoiceStorage(ABC):
+    """Where rendered invoice PDFs live, addressed by key (YYYY/MM/<name>.pdf).
+
+    Web containers on Render lose their disk on every deploy, so production
+    should use S3InvoiceStorage; LocalInvoiceStorage suits development and
+    single-server installs.
+    """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """The object's bytes; FileNotFoundError when there is no such key"""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key; readers never see a partially written object"""
+
+    @abstractmethod
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        """The object in chunks; FileNotFoundError when there is no such key"""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """Location of the object for clients outside this service"""
+
+class LocalInvoiceStorage(InvoiceStorage):
+    """PDFs under root, sharded by sale month: YYYY/MM/<name>.pdf.
+
+    Old months can be packed into one uncompressed ZIP per month
+    (YYYY/MM.<stamp>.zip) plus YYYY/MM.index.json mapping each name to the
+    offset and size of its bytes, so reads stay a single seek. Loose files win
+    over packed ones, so a re-render after packing is picked up immediately.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index_lock = threading.Lock()
+        self._indexes = {}  # month -> (index mtime, index)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key)) or self._packed(key) is not None
+
+    def get(self, key: str) -> bytes:
+        return b"".join(self.iter_chunks(key))
+
+    def put(self, key: str, data: bytes) -> None:
+        # Write next to the target and swap in
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        try:
+            f = open(self._path(key), "rb")
+            remaining = None
+        except FileNotFoundError:
+            f, remaining = self._open_packed(key)
+
+        with f:
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def url(self, key: str) -> str:
+        return self._path(key)
+
+    def months(self) -> List[str]:
+        """Months (YYYY/MM) that have loose or packed invoices, oldest first"""
+        months = set()
+        for year in os.listdir(self.root):
+            year_dir = os.path.join(self.root, year)
+            if not (YEAR_DIR_PATTERN.match(year) and os.path.isdir(year_dir)):
+                continue
+            for name in os.listdir(year_dir):
+                match = MONTH_ENTRY_PATTERN.match(name)
+                if match:
+                    months.add(f"{year}/{match.group(1)}")
+        return sorted(months)
+
+    def pack_month(self, month: str) -> int:
+        """Fold a month's loose PDFs into its pack; returns the number packed"""
+        month_dir = os.path.join(self.root, *month.split("/"))
+        loose = sorted(
+            name for name in os.listdir(month_dir) if name.endswith(".pdf")
+        ) if os.path.isdir(month_dir) else []
+        if not loose:
+            return 0
+
+        old_index = self._load_index(month)
+        old_pack = os.path.join(os.path.dirname(month_dir), old_index["pack"]) if old_index else None
+        pack_name = f"{month.split('/')[1]}.{time.time_ns()}.zip"
+        pack_path = os.path.join(os.path.dirname(month_dir), pack_name)
+
+        # PDFs are already compressed; stored members can be read by offset
+        with zipfile.ZipFile(pack_path, "w", compression=zipfile.ZIP_STORED) as archive:
+            if old_index:
+                with open(old_pack, "rb") as f:
+                    for name, (offset, size) in old_index["members"].items():
+                        if name not in loose:
+                            f.seek(offset)
+                            archive.writestr(name, f.read(size))
+            for name in loose:
+                archive.write(os.path.join(month_dir, name), name)
+
+        members = {}
+        with open(pack_path, "rb") as f, zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                # Member data follows the 30-byte local header, name and extra field
+                f.seek(info.header_offset + 26)
+                name_length, extra_length = struct.unpack("<HH", f.read(4))
+                members[info.filename] = [info.header_offset + 30 + name_length + extra_length, info.file_size]
+
+        index_path = self._index_path(month)
+        with open(f"{index_path}.tmp", "w") as f:
+            json.dump({"pack": pack_name, "members": members}, f)
+        os.replace(f"{index_path}.tmp", index_path)
+
+        for name in loose:
+            os.remove(os.path.join(month_dir, name))
+        if not os.listdir(month_dir):
+            os.rmdir(month_dir)
+        if old_pack:
+            os.remove(old_pack)
+        return len(loose)
+
+    def evict_month(self, month: str) -> int:
+        """Delete every cached PDF for a month, loose and packed; they are
+        rendered again on demand. Returns the number of files removed."""
+        removed = 0
+        month_dir = os.path.join(self.root, *month.split("/"))
+        if os.path.isdir(month_dir):
+            removed += len(os.listdir(month_dir))
+            shutil.rmtree(month_dir)
+
+        index = self._load_index(month)
+        if index:
+            os.remove(self._index_path(month))
+            pack_path = os.path.join(os.path.dirname(month_dir), index["pack"])
+            if os.path.exists(pack_path):
+                os.remove(pack_path)
+            removed += len(index["members"])
+        return removed
+
+    def apply_retention(self, pack_before: str, evict_before: str) -> dict:
+        """Pack months before pack_before and evict months before evict_before
+        (both YYYY/MM). Returns per-month counts."""
+        result = {"packed": {}, "evicted": {}, "unsharded_evicted": self.evict_unsharded()}
+        for month in self.months():
+            if month < evict_before:
+                result["evicted"][month] = self.evict_month(month)
+            elif month < pack_before:
+                packed = self.pack_month(month)
+                if packed:
+                    result["packed"][month] = packed
+        return result
+
+    def evict_unsharded(self) -> int:
+        """Delete PDFs left in the root by the old flat layout"""
+        removed = 0
+        for name in os.listdir(self.root):
+            if name.endswith(".pdf"):
+                os.remove(os.path.join(self.root, name))
+                removed += 1
+        return removed
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def _index_path(self, month: str) -> str:
+        year, month_number = month.split("/")
+        return os.path.join(self.root, year, f"{month_number}.index.json")
+
+    def _load_index(self, month: str) -> Optional[dict]:
+        try:
+            mtime = os.stat(self._index_path(month)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._index_lock:
+            cached = self._indexes.get(month)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with open(self._index_path(month)) as f:
+            index = json.load(f)
+        with self._index_lock:
+            self._indexes[month] = (mtime, index)
+        return index
+
+    def _packed(self, key: str) -> Optional[tuple]:
+        """(pack path, offset, size) of a packed key, or None"""
+        month, _, name = key.rpartition("/")
+        index = self._load_index(month) if month else None
+        if not index or name not in index["members"]:
+            return None
+        offset, size = index["members"][name]
+        return os.path.join(self.root, month.split("/")[0], index["pack"]), offset, size
+
+    def _open_packed(self, key: str) -> tuple:
+        # A repack may replace the pack between reading the index and opening it
+        for _ in range(2):
+            packed = self._packed(key)
+            if packed is None:
+                break
+            pack_path, offset, size = packed
+            try:
+                f = open(pack_path, "rb")
+            except FileNotFoundError:
+                continue
+            f.seek(offset)
+            return f, size
+        raise FileNotFoundError(key)
+
+class S3InvoiceStorage(InvoiceStorage):
+    """Any S3-compatible object store. Set endpoint_url to use MinIO,
+    Cloudflare R2 or a local stand-in such as moto_server instead of AWS.
+    Credentials come from the usual AWS_* environment variables."""
+
+    # Lifetime of links handed out by url(), e.g. for WhatsApp media
+    URL_EXPIRES_IN = 24 * 3600
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None
+    ):
+        import boto3  # Only needed when invoices are stored in S3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region_name)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def get(self, key: str) -> bytes:
+        body = self._get_body(key)
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    def put(self, key: str, data: bytes) -> None:
+        # Single PUTs are atomic in S3
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=data,
+            ContentType="application/pdf"
+        )
+
+    def iter_chunks(self, key: str) -> Iterator[bytes]:
+        body = self._get_body(key)
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def url(self, key: str) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._key(key)},
+            ExpiresIn=self.URL_EXPIRES_IN
+        )
+
+    def _get_body(self, key: str):
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+        except ClientError as e:
+            # Same error as local storage, so callers handle one type
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def _is_missing(self, error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+@lru_cache(maxsize=1)
+def get_invoice_storage() -> InvoiceStorage:
+    """Storage backend selected by INVOICE_STORAGE, created once per process"""
+    if settings.INVOICE_STORAGE == "s3":
+        if not settings.INVOICE_S3_BUCKET:
+            raise RuntimeError("INVOICE_S3_BUCKET must be set when INVOICE_STORAGE=s3")
+        return S3InvoiceStorage(
+            settings.INVOICE_S3_BUCKET,
+            prefix=settings.INVOICE_S3_PREFIX,
+            endpoint_url=settings.INVOICE_S3_ENDPOINT_URL,
+            region_name=settings.INVOICE_S3_REGION
+        )
+    if settings.INVOICE_STORAGE != "local":
+        raise RuntimeError(f"Unknown INVOICE_STORAGE: {settings.INVOICE_STORAGE}")
+    return LocalInvoiceStorage(settings.INVOICE_DIR)
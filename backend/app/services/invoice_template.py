@@ -0,0 +1,178 @@
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER
+from functools import lru_cache
+import copy
+import io
+from app.schemas.invoice import ShopConfig
+
+# Bump INVOICE_TEMPLATE_VERSION (invoice_service) whenever the PDF layout
+# changes, so previously cached invoices are rendered again
+
+DETAILS_COL_WIDTHS = [1.5*inch, 2.5*inch, 1*inch, 2*inch]
+ITEMS_COL_WIDTHS = [0.5*inch, 3.5*inch, 0.8*inch, 1.5*inch, 1.5*inch]
+ITEMS_HEADER = ['#', 'Item Description', 'Qty', 'Rate', 'Amount']
+
+class InvoiceTemplate:
+    """A4 tax invoice layout, compiled once per shop configuration.
+
+    Styles, the parsed shop header/footer paragraphs and the table styles are
+    built here; render() only lays out the per-sale rows. Shared flowables are
+    shallow-copied per render because ReportLab stores layout state on them.
+    """
+
+    def __init__(self, shop_config: ShopConfig):
+        styles = getSampleStyleSheet()
+
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1a56db'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        header_style = ParagraphStyle(
+            'CustomHeader',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        invoice_title_style = ParagraphStyle(
+            'InvoiceTitle',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#1a56db'),
+            spaceAfter=20,
+            alignment=TA_CENTER
+        )
+        footer_style = ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#6b7280'),
+            alignment=TA_CENTER
+        )
+
+        # Shop header and invoice title
+        self.header_flowables = [
+            Paragraph(shop_config.shop_name, title_style),
+            Paragraph(shop_config.shop_address, header_style),
+            Paragraph(f"GSTIN: {shop_config.gstin}", header_style),
+            Paragraph(f"Phone: {shop_config.phone} | Email: {shop_config.email}", header_style),
+            Spacer(1, 0.3*inch),
+            Paragraph("TAX INVOICE", invoice_title_style),
+            Spacer(1, 0.2*inch)
+        ]
+
+        self.footer_flowables = [
+            Paragraph("Thank you for your business!", footer_style),
+            Paragraph("This is a computer-generated invoice", footer_style)
+        ]
+
+        self.details_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#374151')),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ])
+
+        # Items table style only depends on how many totals rows follow the items
+        self._items_table_styles = {
+            count: self._build_items_table_style(count) for count in (4, 6)
+        }
+
+    def render(self, sale, tax: dict, out) -> None:
+        """Build the invoice for a sale into a path or binary file object.
+        tax is app.core.gst.sale_tax_breakdown(sale)."""
+        doc = SimpleDocTemplate(out, pagesize=A4)
+        elements = [copy.copy(flowable) for flowable in self.header_flowables]
+
+        # Invoice Details
+        invoice_data = [
+            ['Invoice No:', sale.invoice_id, 'Date:', sale.sale_date.strftime('%d-%m-%Y')],
+            ['Customer:', sale.customer_name, 'Mobile:', sale.customer_mobile],
+            ['Payment Mode:', sale.payment_mode.upper(), '', '']
+        ]
+        invoice_table = Table(invoice_data, colWidths=DETAILS_COL_WIDTHS)
+        invoice_table.setStyle(self.details_table_style)
+        elements.append(invoice_table)
+        elements.append(Spacer(1, 0.3*inch))
+
+        # Items Table
+        items_data = [ITEMS_HEADER]
+        for idx, line in enumerate(tax["lines"], 1):
+            item = line["item"]
+            items_data.append([
+                str(idx),
+                f"{item.tire.brand} - {item.tire.tire_size}",
+                str(item.quantity),
+                f"₹{item.unit_price:.2f}",
+                f"₹{item.total_price:.2f}"
+            ])
+
+        # GST was stored when the sale was created
+        half_rate = f" ({tax['gst_rate'] / 2:g}%)" if tax["gst_rate"] is not None else ""
+        totals_rows = [['', '', '', 'Subtotal:', f"₹{tax['subtotal']:.2f}"]]
+        if tax["discount"] > 0:
+            totals_rows.append(['', '', '', 'Discount:', f"-₹{tax['discount']:.2f}"])
+            totals_rows.append(['', '', '', 'Taxable Value:', f"₹{tax['taxable_value']:.2f}"])
+        totals_rows.append(['', '', '', f'CGST{half_rate}:', f"₹{tax['cgst']:.2f}"])
+        totals_rows.append(['', '', '', f'SGST{half_rate}:', f"₹{tax['sgst']:.2f}"])
+        totals_rows.append(['', '', '', 'Grand Total:', f"₹{tax['grand_total']:.2f}"])
+        items_data.extend(totals_rows)
+
+        items_table = Table(items_data, colWidths=ITEMS_COL_WIDTHS)
+        items_table.setStyle(self._items_table_styles[len(totals_rows)])
+        elements.append(items_table)
+        elements.append(Spacer(1, 0.5*inch))
+
+        # Footer
+        elements.extend(copy.copy(flowable) for flowable in self.footer_flowables)
+
+        doc.build(elements)
+
+    def _build_items_table_style(self, totals_count: int) -> TableStyle:
+        last_body_row = -(totals_count + 1)
+        first_total_row = -totals_count
+        return TableStyle([
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+            # Body
+            ('FONTNAME', (0, 1), (-1, last_body_row), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, last_body_row), 10),
+            ('GRID', (0, 0), (-1, last_body_row), 1, colors.grey),
+            ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+
+            # Totals section
+            ('FONTNAME', (3, first_total_row), (-1, -1), 'Helvetica-Bold'),
+            ('LINEABOVE', (3, first_total_row), (-1, first_total_row), 1, colors.grey),
+            ('LINEABOVE', (3, -1), (-1, -1), 2, colors.black),
+            ('FONTSIZE', (3, -1), (-1, -1), 12),
+        ])
+
+@lru_cache(maxsize=8)
+def _compile_template(shop_config_json: str) -> InvoiceTemplate:
+    return InvoiceTemplate(ShopConfig.model_validate_json(shop_config_json))
+
+def get_invoice_template(shop_config: ShopConfig) -> InvoiceTemplate:
+    """Compiled template for a shop configuration, built on first use and reused"""
+    return _compile_template(shop_config.model_dump_json())
+
+def render_invoice_bytes(sale, tax: dict, shop_config: ShopConfig) -> bytes:
+    """Render an invoice in memory and return the PDF"""
+    buffer = io.BytesIO()
+    get_invoice_template(shop_config).render(sale, tax, buffer)
+    return buffer.getvalue()
@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, date
 from typing import List
 from app.repositories.sales_repository import SalesRepository
+from app.core.shop_time import local_day_bounds, shop_today
+from app.services.sales_archive_service import SalesArchiveService
 from app.schemas.profit import ProfitSummary, SaleProfitDetail, DailyClosingReport
-from app.models.sales import Sales, PaymentMode
+from app.models.sales import PaymentMode
 
 class ProfitService:
     def __init__(self, db: Session):
@@ -76,14 +77,13 @@ class ProfitService:
         return profit_details
     
     def get_daily_closing_report(self, report_date: date = None) -> DailyClosingReport:
-        """Generate daily closing report"""
+        """Generate daily closing report for one of the shop's calendar days"""
         if report_date is None:
-            report_date = date.today()
+            report_date = shop_today()
         
         # Get sales for the day
-        sales = self.db.query(Sales).filter(
-            func.date(Sales.sale_date) == report_date
-        ).all()
+        SalesArchiveService(self.db).include_archived(local_day_bounds(report_date)[0])
+        sales = self.sales_repo.get_by_day(report_date)
         
         total_sales = 0
         total_profit = 0
@@ -1,10 +1,34 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from fastapi import HTTPException, status
-from app.repositories.purchase_repository import PurchaseRepository
-from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.purchase_repository import PurchaseRepository, AsyncPurchaseRepository
+from app.repositories.inventory_repository import InventoryRepository, AsyncInventoryRepository
 from app.schemas.purchase import PurchaseCreate, PurchaseUpdate, PurchaseResponse, PurchaseItemResponse
 
+def price_purchase(purchase_data: PurchaseCreate, tires: dict) -> tuple:
+    """Validate that every tire (keyed by id) exists; returns the item rows and total"""
+    total_amount = 0
+    items_data = []
+    
+    for item in purchase_data.items:
+        if not tires.get(item.tire_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tire with id {item.tire_id} not found"
+            )
+        
+        item_total = item.purchase_price * item.quantity
+        total_amount += item_total
+        
+        items_data.append({
+            "tire_id": item.tire_id,
+            "quantity": item.quantity,
+            "purchase_price": item.purchase_price,
+            "total_price": item_total
+        })
+    return items_data, total_amount
+
 class PurchaseService:
     def __init__(self, db: Session):
         self.db = db
@@ -12,27 +36,8 @@ class PurchaseService:
         self.inventory_repo = InventoryRepository(db)
     
     def create_purchase(self, purchase_data: PurchaseCreate) -> PurchaseResponse:
-        # Validate all tires exist and calculate total
-        total_amount = 0
-        items_data = []
-        
-        for item in purchase_data.items:
-            tire = self.inventory_repo.get_by_id(item.tire_id)
-            if not tire:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Tire with id {item.tire_id} not found"
-                )
-            
-            item_total = item.purchase_price * item.quantity
-            total_amount += item_total
-            
-            items_data.append({
-                "tire_id": item.tire_id,
-                "quantity": item.quantity,
-                "purchase_price": item.purchase_price,
-                "total_price": item_total
-            })
+        tires = {item.tire_id: self.inventory_repo.get_by_id(item.tire_id) for item in purchase_data.items}
+        items_data, total_amount = price_purchase(purchase_data, tires)
         
         # Create purchase with items
         purchase_dict = {
@@ -105,3 +110,61 @@ class PurchaseService:
             payment_status=purchase.payment_status,
             items=items
         )
+
+class AsyncPurchaseService:
+    """PurchaseService for the async purchase routes, on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.purchase_repo = AsyncPurchaseRepository(db)
+        self.inventory_repo = AsyncInventoryRepository(db)
+    
+    async def create_purchase(self, purchase_data: PurchaseCreate) -> PurchaseResponse:
+        tires = {item.tire_id: await self.inventory_repo.get_by_id(item.tire_id) for item in purchase_data.items}
+        items_data, total_amount = price_purchase(purchase_data, tires)
+        
+        purchase = await self.purchase_repo.create({
+            "supplier_name": purchase_data.supplier_name,
+            "total_amount": total_amount,
+            "purchase_date": purchase_data.purchase_date,
+            "payment_status": purchase_data.payment_status
+        }, items_data)
+        
+        for item in purchase_data.items:
+            await self.inventory_repo.update_quantity(item.tire_id, item.quantity)
+        
+        return self._to_response(purchase)
+    
+    async def get_all_purchases(self, skip: int = 0, limit: int = 100) -> List[PurchaseResponse]:
+        purchases = await self.purchase_repo.get_all(skip, limit)
+        return [self._to_response(purchase) for purchase in purchases]
+    
+    async def get_purchase_by_id(self, purchase_id: int) -> PurchaseResponse:
+        purchase = await self.purchase_repo.get_by_id(purchase_id)
+        if not purchase:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Purchase not found"
+            )
+        return self._to_response(purchase)
+    
+    async def update_purchase(self, purchase_id: int, purchase_data: PurchaseUpdate) -> PurchaseResponse:
+        update_data = purchase_data.model_dump(exclude_unset=True)
+        
+        purchase = await self.purchase_repo.update(purchase_id, update_data)
+        if not purchase:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Purchase not found"
+            )
+        return self._to_response(purchase)
+    
+    async def delete_purchase(self, purchase_id: int) -> dict:
+        success = await self.purchase_repo.delete(purchase_id)
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Purchase not found"
+            )
+        return {"message": "Purchase deleted successfully"}
+    
+    _to_response = PurchaseService._to_response
@@ -0,0 +1,96 @@
+from typing import List
+import textwrap
+from app.schemas.invoice import ShopConfig
+
+RECEIPT_WIDTHS = (40, 48)  # Characters per line on 58mm / 80mm thermal paper
+
+# ESC/POS commands
+ESC_INIT = b"\x1b@"
+ESC_ALIGN_LEFT = b"\x1ba\x00"
+ESC_ALIGN_CENTER = b"\x1ba\x01"
+ESC_BOLD_ON = b"\x1bE\x01"
+ESC_BOLD_OFF = b"\x1bE\x00"
+GS_SIZE_DOUBLE = b"\x1d!\x11"
+GS_SIZE_NORMAL = b"\x1d!\x00"
+ESC_FEED_4 = b"\x1bd\x04"
+GS_CUT_PARTIAL = b"\x1dV\x01"
+
+# Printer code pages have no rupee sign
+CURRENCY = "Rs."
+
+def _money(value: float) -> str:
+    return f"{value:.2f}"
+
+def _pair(left: str, right: str, width: int) -> str:
+    """left and right justified on one line; right wins if they collide"""
+    space = width - len(right) - 1
+    return f"{left[:space]:<{space}} {right}"
+
+def _receipt_lines(sale, tax: dict, shop_config: ShopConfig, width: int) -> List[tuple]:
+    """Receipt as (text, style) lines, style being "title", "center",
+    "bold" or "" for plain left-aligned text."""
+    rule = "-" * width
+    lines = [(shop_config.shop_name, "title")]
+    lines.extend((part, "center") for part in textwrap.wrap(shop_config.shop_address, width))
+    lines.append((f"GSTIN: {shop_config.gstin}", "center"))
+    lines.append((f"Ph: {shop_config.phone}", "center"))
+    lines.append((rule, ""))
+    lines.append((_pair(f"Bill: {sale.invoice_id}", sale.sale_date.strftime("%d-%m-%Y %H:%M"), width), ""))
+    lines.append((f"Customer: {sale.customer_name}"[:width], ""))
+    lines.append((f"Mobile: {sale.customer_mobile}"[:width], ""))
+    lines.append((rule, ""))
+
+    # Qty, rate and amount columns; the description gets the rest of the line
+    numbers_width = 4 + 1 + 9 + 1 + 10
+    name_width = width - numbers_width - 1
+    lines.append((f"{'Item':<{name_width}} {'Qty':>4} {'Rate':>9} {'Amount':>10}", "bold"))
+    for line in tax["lines"]:
+        item = line["item"]
+        name = f"{item.tire.brand} {item.tire.tire_size}"
+        numbers = f"{item.quantity:>4} {_money(item.unit_price):>9} {_money(item.total_price):>10}"
+        if len(name) <= name_width:
+            lines.append((f"{name:<{name_width}} {numbers}", ""))
+        else:
+            lines.extend((part, "") for part in textwrap.wrap(name, width))
+            lines.append((f"{numbers:>{width}}", ""))
+    lines.append((rule, ""))
+
+    half_rate = f" @{tax['gst_rate'] / 2:g}%" if tax["gst_rate"] is not None else ""
+    lines.append((_pair("Subtotal", _money(tax["subtotal"]), width), ""))
+    if tax["discount"] > 0:
+        lines.append((_pair("Discount", f"-{_money(tax['discount'])}", width), ""))
+        lines.append((_pair("Taxable Value", _money(tax["taxable_value"]), width), ""))
+    lines.append((_pair(f"CGST{half_rate}", _money(tax["cgst"]), width), ""))
+    lines.append((_pair(f"SGST{half_rate}", _money(tax["sgst"]), width), ""))
+    lines.append(("=" * width, ""))
+    lines.append((_pair("GRAND TOTAL", f"{CURRENCY} {_money(tax['grand_total'])}", width), "bold"))
+    lines.append((f"Paid by {sale.payment_mode.value.upper()}", ""))
+    lines.append((rule, ""))
+    lines.append(("Thank you for your business!", "center"))
+    return lines
+
+def render_receipt_text(sale, tax: dict, shop_config: ShopConfig, width: int = 48) -> str:
+    """Plain-text counter receipt. tax is app.core.gst.sale_tax_breakdown(sale)."""
+    rendered = []
+    for text, style in _receipt_lines(sale, tax, shop_config, width):
+        if style in ("title", "center"):
+            text = text[:width].center(width).rstrip()
+        rendered.append(text)
+    return "\n".join(rendered) + "\n"
+
+def render_receipt_escpos(sale, tax: dict, shop_config: ShopConfig, width: int = 48) -> bytes:
+    """ESC/POS byte stream for a thermal printer, ending with a paper cut"""
+    out = [ESC_INIT]
+    for text, style in _receipt_lines(sale, tax, shop_config, width):
+        encoded = text.encode("ascii", "replace") + b"\n"
+        if style == "title":
+            # Double width halves the characters per line
+            out += [ESC_ALIGN_CENTER, GS_SIZE_DOUBLE, text[:width // 2].encode("ascii", "replace") + b"\n", GS_SIZE_NORMAL, ESC_ALIGN_LEFT]
+        elif style == "center":
+            out += [ESC_ALIGN_CENTER, encoded, ESC_ALIGN_LEFT]
+        elif style == "bold":
+            out += [ESC_BOLD_ON, encoded, ESC_BOLD_OFF]
+        else:
+            out.append(encoded)
+    out += [ESC_FEED_4, GS_CUT_PARTIAL]
+    return b"".join(out)
@@ -0,0 +1,132 @@
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta
+import enum
+import os
+import tempfile
+from app.repositories.sales_repository import SalesRepository
+from app.repositories.inventory_repository import InventoryRepository
+from app.services.sales_archive_service import SalesArchiveService
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+class ReportExportService:
+    """Excel versions of the sales and inventory reports.
+
+    Workbooks are written in openpyxl's write-only mode: detail rows are
+    streamed from the database cursor straight into the sheet, so memory
+    stays flat regardless of row count. Summary sheets come from SQL
+    aggregates. Each method returns the path of a temporary .xlsx file that
+    the caller is responsible for removing.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 5000):
+        self.db = db
+        self.sales_repo = SalesRepository(db)
+        self.inventory_repo = InventoryRepository(db)
+        self.batch_size = batch_size
+
+    def sales_report_xlsx(self, start_date: date, end_date: date) -> str:
+        from openpyxl import Workbook
+
+        # Whole days: start_date 00:00 up to (not including) the day after end_date
+        start = datetime.combine(start_date, time.min)
+        end = datetime.combine(end_date + timedelta(days=1), time.min)
+        SalesArchiveService(self.db).include_archived(start)
+
+        wb = Workbook(write_only=True)
+        summary_ws = wb.create_sheet("Summary")
+        detail_ws = wb.create_sheet("Sales")
+
+        summary = self.sales_repo.get_summary_by_date_range(start, end)
+        summary_ws.append(self._header(summary_ws, ["Sales report", f"{start_date} to {end_date}"]))
+        summary_ws.append([])
+        summary_ws.append(self._header(summary_ws, ["Payment mode", "Transactions", "Subtotal", "Discount", "Revenue"]))
+        totals = {"transactions": 0, "subtotal": 0.0, "discount": 0.0, "revenue": 0.0}
+        for row in summary["by_payment_mode"]:
+            summary_ws.append([
+                row["payment_mode"].upper(),
+                row["transactions"],
+                row["subtotal"],
+                row["discount"],
+                row["revenue"]
+            ])
+            for key in totals:
+                totals[key] += row[key]
+        summary_ws.append(self._header(summary_ws, [
+            "Total",
+            totals["transactions"],
+            totals["subtotal"],
+            totals["discount"],
+            totals["revenue"]
+        ]))
+        summary_ws.append([])
+        summary_ws.append(["Items sold", summary["items_sold"]])
+
+        self._stream_rows(detail_ws, self.sales_repo.iter_line_rows_by_date_range(start, end, self.batch_size))
+
+        return self._save(wb, "sales_report_")
+
+    def inventory_report_xlsx(self) -> str:
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        summary_ws = wb.create_sheet("Summary")
+        detail_ws = wb.create_sheet("Inventory")
+
+        summary_ws.append(self._header(summary_ws, ["Inventory report", date.today().isoformat()]))
+        summary_ws.append([])
+        summary_ws.append(self._header(summary_ws, ["Brand", "SKUs", "Units", "Cost value", "Retail value", "Low stock SKUs"]))
+        totals = {"sku_count": 0, "units": 0, "cost_value": 0.0, "retail_value": 0.0, "low_stock": 0}
+        for row in self.inventory_repo.get_stock_summary_by_brand():
+            summary_ws.append([
+                row["brand"],
+                row["sku_count"],
+                row["units"],
+                row["cost_value"],
+                row["retail_value"],
+                row["low_stock"]
+            ])
+            for key in totals:
+                totals[key] += row[key]
+        summary_ws.append(self._header(summary_ws, [
+            "Total",
+            totals["sku_count"],
+            totals["units"],
+            totals["cost_value"],
+            totals["retail_value"],
+            totals["low_stock"]
+        ]))
+
+        self._stream_rows(detail_ws, self.inventory_repo.iter_report_rows(self.batch_size))
+
+        return self._save(wb, "inventory_report_")
+
+    def _stream_rows(self, ws, batches) -> None:
+        header_written = False
+        for columns, rows in batches:
+            if not header_written:
+                ws.append(self._header(ws, [c.replace("_", " ").title() for c in columns]))
+                header_written = True
+            for row in rows:
+                ws.append([v.value if isinstance(v, enum.Enum) else v for v in row])
+
+    def _header(self, ws, values: list) -> list:
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = Font(bold=True)
+            cells.append(cell)
+        return cells
+
+    def _save(self, wb, prefix: str) -> str:
+        fd, path = tempfile.mkstemp(prefix=prefix, suffix=".xlsx")
+        os.close(fd)
+        try:
+            wb.save(path)
+        except Exception:
+            os.remove(path)
+            raise
+        return path
@@ -0,0 +1,232 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.shop_time import shop_today
+from app.repositories.sales_repository import SalesRepository
+from app.repositories.inventory_repository import InventoryRepository
+from app.schemas.report_job import ReportJobSpec, ReportJobStatus
+from app.services.sales_service import SalesService
+from app.services.profit_service import ProfitService
+from app.services.report_export_service import ReportExportService
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+# Finished/failed job records, and result files under the cache directory, are
+# kept this long. Job ids change with every sale, so results would otherwise
+# pile up forever
+JOB_RECORD_TTL = timedelta(hours=1)
+
+# The cache directory is listed at most this often
+CACHE_SWEEP_INTERVAL = timedelta(minutes=5)
+
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+class ReportJobQueue:
+    """Renders large reports off the request thread pool.
+
+    A job id is the hash of the normalised spec plus the current data version,
+    so identical requests made while nothing changed map to the same job: they
+    coalesce onto one in-flight render, or are served from the result already
+    on disk under REPORT_CACHE_DIR.
+    """
+
+    def __init__(self, cache_dir: str, max_workers: int):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._last_sweep = None
+
+    def submit(self, db: Session, spec: ReportJobSpec) -> ReportJobStatus:
+        spec = self._normalise(spec)
+        job_id = self._job_id(spec, self._data_version(db, spec.kind))
+
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job and job["status"] != "failed":
+                return self._to_status(job)
+
+            now = datetime.utcnow()
+            job = {
+                "job_id": job_id,
+                "kind": spec.kind,
+                "format": spec.format,
+                "status": "queued",
+                "created_at": now,
+                "finished_at": None,
+                "error": None
+            }
+            if os.path.exists(self._result_path(job_id, spec.format)):
+                job["status"] = "done"
+                job["finished_at"] = now
+            else:
+                self._get_executor().submit(self._run, job_id, spec)
+            self._jobs[job_id] = job
+            return self._to_status(job)
+
+    def get_status(self, job_id: str) -> ReportJobStatus:
+        if not JOB_ID_PATTERN.match(job_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+        
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return self._to_status(job)
+
+        # Rendered by another worker process or before a restart
+        for fmt in MEDIA_TYPES:
+            if os.path.exists(self._result_path(job_id, fmt)):
+                return self._to_status({
+                    "job_id": job_id,
+                    "kind": "unknown",
+                    "format": fmt,
+                    "status": "done"
+                })
+
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+
+    def get_result(self, job_id: str) -> tuple:
+        """Return (path, media_type) of a finished job's result"""
+        job_status = self.get_status(job_id)
+        if job_status.status != "done":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Report job is {job_status.status}"
+            )
+
+        for fmt, media_type in MEDIA_TYPES.items():
+            path = self._result_path(job_id, fmt)
+            if os.path.exists(path):
+                return path, media_type
+
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report result not found")
+
+    def _run(self, job_id: str, spec: ReportJobSpec) -> None:
+        self._update(job_id, status="running")
+        final_path = self._result_path(job_id, spec.format)
+        tmp_path = f"{final_path}.{threading.get_ident()}.tmp"
+
+        db = SessionLocal()
+        try:
+            self._render(db, spec, tmp_path)
+            os.replace(tmp_path, final_path)
+            self._update(job_id, status="done", finished_at=datetime.utcnow())
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._update(job_id, status="failed", finished_at=datetime.utcnow(), error=str(e))
+        finally:
+            db.close()
+
+    def _render(self, db: Session, spec: ReportJobSpec, path: str) -> None:
+        if spec.kind == "sales" and spec.format == "xlsx":
+            tmp = ReportExportService(db).sales_report_xlsx(spec.start_date, spec.end_date)
+            shutil.move(tmp, path)
+            return
+
+        if spec.kind == "sales":
+            rows = SalesService(db).get_sales_report(spec.start_date, spec.end_date)
+            payload = [row.model_dump(mode="json") for row in rows]
+        elif spec.kind == "profit_details":
+            rows = ProfitService(db).get_sale_profit_details(spec.skip, spec.limit)
+            payload = [row.model_dump(mode="json") for row in rows]
+        else:
+            payload = ProfitService(db).get_daily_closing_report(spec.report_date).model_dump(mode="json")
+
+        with open(path, "w") as f:
+            json.dump(payload, f)
+
+    def _normalise(self, spec: ReportJobSpec) -> ReportJobSpec:
+        if spec.kind == "sales" and (spec.start_date is None or spec.end_date is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date and end_date are required for sales reports"
+            )
+        if spec.format == "xlsx" and spec.kind != "sales":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="xlsx format is only available for sales reports"
+            )
+        if spec.kind == "daily_closing" and spec.report_date is None:
+            spec = spec.model_copy(update={"report_date": shop_today()})
+        return spec
+
+    def _data_version(self, db: Session, kind: str) -> str:
+        version = SalesRepository(db).get_data_version()
+        if kind in ("profit_details", "daily_closing"):
+            # Profit is computed from current purchase prices
+            version += "|" + InventoryRepository(db).get_price_version()
+        return version
+
+    def _job_id(self, spec: ReportJobSpec, data_version: str) -> str:
+        key = json.dumps({"spec": spec.model_dump(mode="json"), "version": data_version}, sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def _result_path(self, job_id: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, f"{job_id}.{fmt}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so importing the module does not start threads
+        if self._executor is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report-job")
+        return self._executor
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _prune(self) -> None:
+        cutoff = datetime.utcnow() - JOB_RECORD_TTL
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            self._remove(self._result_path(job_id, job["format"]))
+
+        # Results left by other worker processes, earlier runs or crashed renders
+        now = datetime.utcnow()
+        if self._last_sweep and now - self._last_sweep < CACHE_SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and datetime.utcfromtimestamp(entry.stat().st_mtime) < cutoff:
+                self._remove(entry.path)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Already swept by another worker
+
+    def _to_status(self, job: dict) -> ReportJobStatus:
+        return ReportJobStatus(
+            job_id=job["job_id"],
+            kind=job["kind"],
+            status=job["status"],
+            created_at=job.get("created_at"),
+            finished_at=job.get("finished_at"),
+            error=job.get("error"),
+            download_url=f"/reports/jobs/{job['job_id']}/download" if job["status"] == "done" else None
+        )
+
+report_jobs = ReportJobQueue(settings.REPORT_CACHE_DIR, settings.REPORT_WORKERS)
@@ -0,0 +1,74 @@
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date, datetime, time
+from app.repositories.sales_partition_repository import SalesPartitionRepository
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before, if negative) month's"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+class SalesArchiveService:
+    """Keeps the month-partitioned sales tables ready for new sales and moves
+    old months out of them. Does nothing where sales is not partitioned
+    (SQLite, or Postgres before alembic revision 0002)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.partition_repo = SalesPartitionRepository(db)
+
+    @property
+    def partitioned(self) -> bool:
+        return self.partition_repo.is_partitioned()
+
+    def ensure_partitions(self, months_ahead: int, today: Optional[date] = None) -> int:
+        """Create partitions from this month through months_ahead; returns how many were new"""
+        if not self.partitioned:
+            return 0
+        this_month = (today or date.today()).replace(day=1)
+        return self.partition_repo.create_partitions(this_month, add_months(this_month, months_ahead))
+
+    def archive(
+        self,
+        older_than_years: int,
+        tablespace: Optional[str] = None,
+        dry_run: bool = False,
+        today: Optional[date] = None
+    ) -> List[date]:
+        """Detach every month older than the cutoff into the archive schema.
+
+        Reports that reach back into archived months still cover them (see
+        include_archived). Returns the months archived (or that would be).
+        """
+        if not self.partitioned:
+            return []
+        cutoff = add_months((today or date.today()).replace(day=1), -12 * older_than_years)
+        months = [month for month in self.partition_repo.get_partition_months() if month < cutoff]
+        if dry_run or not months:
+            return months
+
+        for month in months:
+            self.partition_repo.archive_month(month, tablespace)
+        self.partition_repo.refresh_history_views()
+        return months
+
+    def refresh_history_views(self) -> bool:
+        """Rebuild the archive views if anything is archived, so they pick up
+        columns added to sales since; False if there was nothing to do"""
+        if not self.partitioned or not self.partition_repo.get_archived_months():
+            return False
+        self.partition_repo.refresh_history_views()
+        return True
+
+    def include_archived(self, start: datetime) -> bool:
+        """Let the current transaction's sales queries read archived months too,
+        when a report's range (from start, UTC) reaches back into them. Day-to-day
+        ranges keep reading only the live partitions."""
+        if not self.partitioned:
+            return False
+        months = self.partition_repo.get_archived_months()
+        # Months are archived oldest first, so everything after the last one is live
+        if not months or start >= datetime.combine(add_months(months[-1], 1), time.min):
+            return False
+        self.partition_repo.read_with_archive()
+        return True
@@ -0,0 +1,132 @@
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import enum
+import json
+import os
+from app.repositories.sales_repository import SalesRepository
+from app.core.config import settings
+
+MANIFEST_FILE = "_manifest.json"
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("sale_id", pa.int64()),
+        ("invoice_id", pa.string()),
+        ("sale_date", pa.timestamp("us")),
+        ("customer_name", pa.string()),
+        ("customer_mobile", pa.string()),
+        ("payment_mode", pa.string()),
+        ("subtotal", pa.float64()),
+        ("discount_amount", pa.float64()),
+        ("total_amount", pa.float64()),
+        ("item_id", pa.int64()),
+        ("tire_id", pa.int64()),
+        ("quantity", pa.int64()),
+        ("unit_price", pa.float64()),
+        ("total_price", pa.float64()),
+        ("brand", pa.string()),
+        ("tire_size", pa.string()),
+        ("tire_type", pa.string()),
+        ("purchase_price", pa.float64()),
+    ])
+
+class SalesExportService:
+    """Incremental, month-partitioned Parquet export of sales line items.
+
+    Layout: <export_dir>/sales_items/month=YYYY-MM/part-0.parquet
+    A month is rewritten only when its line count or highest line id changed
+    since the last export (or when a full export is requested).
+    """
+
+    def __init__(self, db: Session, export_dir: Optional[str] = None, batch_size: int = 5000):
+        self.sales_repo = SalesRepository(db)
+        self.root = os.path.join(export_dir or settings.EXPORT_DIR, "sales_items")
+        self.batch_size = batch_size
+
+    def export_parquet(self, full: bool = False) -> dict:
+        """Write changed months to Parquet and return a summary of the run"""
+        os.makedirs(self.root, exist_ok=True)
+        manifest = {} if full else self._load_manifest()
+
+        written = []
+        skipped = []
+        for fingerprint in self.sales_repo.get_monthly_line_fingerprints():
+            key = f"{fingerprint['year']:04d}-{fingerprint['month']:02d}"
+            state = {
+                "line_count": fingerprint["line_count"],
+                "max_item_id": fingerprint["max_item_id"]
+            }
+            previous = manifest.get(key)
+            if previous and all(previous.get(k) == v for k, v in state.items()):
+                skipped.append(key)
+                continue
+
+            rows = self._write_month(fingerprint["year"], fingerprint["month"], key)
+            manifest[key] = {**state, "rows": rows, "exported_at": datetime.utcnow().isoformat()}
+            self._save_manifest(manifest)
+            written.append(key)
+
+        return {
+            "export_dir": self.root,
+            "months_written": written,
+            "months_skipped": skipped
+        }
+
+    def _write_month(self, year: int, month: int, key: str) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema()
+        start = datetime(year, month, 1)
+        end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+
+        partition_dir = os.path.join(self.root, f"month={key}")
+        os.makedirs(partition_dir, exist_ok=True)
+        final_path = os.path.join(partition_dir, "part-0.parquet")
+        tmp_path = final_path + ".tmp"
+
+        rows_written = 0
+        writer = None
+        try:
+            for columns, rows in self.sales_repo.iter_line_rows_by_date_range(start, end, self.batch_size):
+                if not rows:
+                    continue  # Empty month
+                # Transpose the cursor batch into columns; enums are stored by value
+                arrays = []
+                for name, values in zip(columns, zip(*rows)):
+                    field_type = schema.field(name).type
+                    if pa.types.is_string(field_type):
+                        values = [v.value if isinstance(v, enum.Enum) else v for v in values]
+                    arrays.append(pa.array(values, type=field_type))
+                batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+                writer.write_batch(batch)
+                rows_written += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            return 0
+
+        # Swap the finished file in so readers never see a partial partition
+        os.replace(tmp_path, final_path)
+        return rows_written
+
+    def _load_manifest(self) -> dict:
+        path = os.path.join(self.root, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict) -> None:
+        path = os.path.join(self.root, MANIFEST_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(path + ".tmp", path)
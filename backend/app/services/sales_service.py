@@ -1,77 +1,119 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
-from datetime import date
-from app.repositories.sales_repository import SalesRepository
-from app.repositories.inventory_repository import InventoryRepository
+from datetime import date, datetime
+from app.models.inventory import TireInventory
+from app.repositories.sales_repository import SalesRepository, AsyncSalesRepository
+from app.repositories.inventory_repository import InventoryRepository, AsyncInventoryRepository
+from app.repositories.customer_repository import CustomerRepository, AsyncCustomerRepository
+from app.services.invoice_service import InvoiceService
+from app.services.sales_archive_service import SalesArchiveService
 from app.schemas.sales import SalesCreate, SalesResponse, SalesItemResponse
+from app.core.gst import compute_line_taxes, round_money
+from app.core.phone import normalize_mobile
+
+def price_sale(sales_data: SalesCreate, tires: Dict[int, Optional[TireInventory]]) -> Tuple[List[dict], dict]:
+    """Validate stock and price a new sale from its tires (keyed by id).
+    
+    Returns the line item rows and the sale's money fields, with GST frozen per
+    line so invoices and tax reports never recompute it.
+    """
+    subtotal = 0
+    items_data = []
+    
+    for item in sales_data.items:
+        tire = tires.get(item.tire_id)
+        if not tire:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Tire with id {item.tire_id} not found")
+        
+        if tire.quantity < item.quantity:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for {tire.brand} {tire.tire_size}. Available: {tire.quantity}"
+            )
+        
+        item_total = tire.selling_price * item.quantity
+        subtotal += item_total
+        
+        items_data.append({
+            "tire_id": item.tire_id,
+            "quantity": item.quantity,
+            "unit_price": tire.selling_price,
+            "total_price": item_total,
+            "hsn_code": tire.hsn_code,
+            "gst_rate": tire.gst_rate
+        })
+    
+    # Calculate discount
+    discount_amount = 0
+    if sales_data.discount_value and sales_data.discount_value > 0:
+        if sales_data.discount_type == 'percent':
+            discount_amount = (subtotal * sales_data.discount_value) / 100
+        else:  # flat
+            discount_amount = sales_data.discount_value
+    
+    line_taxes = compute_line_taxes(items_data, discount_amount)
+    for item_dict, line_tax in zip(items_data, line_taxes):
+        item_dict.update(line_tax)
+    
+    return items_data, {
+        "subtotal": subtotal,
+        "discount_amount": discount_amount,
+        "total_amount": subtotal - discount_amount,
+        "taxable_value": round_money(sum(t["taxable_value"] for t in line_taxes)),
+        "cgst_amount": round_money(sum(t["cgst_amount"] for t in line_taxes)),
+        "sgst_amount": round_money(sum(t["sgst_amount"] for t in line_taxes))
+    }
+
+def sale_record(sales_data: SalesCreate, totals: dict, invoice_id: str, customer_id: Optional[int], sale_date: datetime) -> dict:
+    return {
+        "invoice_id": invoice_id,
+        "customer_name": sales_data.customer_name,
+        "customer_mobile": sales_data.customer_mobile,
+        "customer_id": customer_id,
+        "discount_type": sales_data.discount_type,
+        "discount_value": sales_data.discount_value,
+        "notes": sales_data.notes,
+        "payment_mode": sales_data.payment_mode,
+        "sale_date": sale_date,
+        **totals
+    }
 
 class SalesService:
     def __init__(self, db: Session):
         self.db = db
         self.sales_repo = SalesRepository(db)
         self.inventory_repo = InventoryRepository(db)
+        self.customer_repo = CustomerRepository(db)
     
     def create_sale(self, sales_data: SalesCreate) -> SalesResponse:
-        # Validate inventory and calculate totals
-        subtotal = 0
-        items_data = []
-        
-        for item in sales_data.items:
-            tire = self.inventory_repo.get_by_id(item.tire_id)
-            if not tire:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Tire with id {item.tire_id} not found")
-            
-            if tire.quantity < item.quantity:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient stock for {tire.brand} {tire.tire_size}. Available: {tire.quantity}"
-                )
-            
-            item_total = tire.selling_price * item.quantity
-            subtotal += item_total
-            
-            items_data.append({
-                "tire_id": item.tire_id,
-                "quantity": item.quantity,
-                "unit_price": tire.selling_price,
-                "total_price": item_total
-            })
-        
-        # Calculate discount
-        discount_amount = 0
-        if sales_data.discount_value and sales_data.discount_value > 0:
-            if sales_data.discount_type == 'percent':
-                discount_amount = (subtotal * sales_data.discount_value) / 100
-            else:  # flat
-                discount_amount = sales_data.discount_value
-        
-        # Calculate final amount
-        total_amount = subtotal - discount_amount
+        tires = {item.tire_id: self.inventory_repo.get_by_id(item.tire_id) for item in sales_data.items}
+        items_data, totals = price_sale(sales_data, tires)
         
         # Generate invoice ID
         invoice_id = self.sales_repo.generate_invoice_id()
         
+        # Update the customer's running totals; committed together with the sale
+        sale_date = datetime.utcnow()
+        customer_id = None
+        mobile = normalize_mobile(sales_data.customer_mobile)
+        if mobile:
+            customer_id = self.customer_repo.record_sale(mobile, sales_data.customer_name, totals["total_amount"], sale_date)
+        
         # Create sale
-        sale_dict = {
-            "invoice_id": invoice_id,
-            "customer_name": sales_data.customer_name,
-            "customer_mobile": sales_data.customer_mobile,
-            "subtotal": subtotal,
-            "discount_type": sales_data.discount_type,
-            "discount_value": sales_data.discount_value,
-            "discount_amount": discount_amount,
-            "total_amount": total_amount,
-            "notes": sales_data.notes,
-            "payment_mode": sales_data.payment_mode
-        }
-        
-        sale = self.sales_repo.create(sale_dict, items_data)
+        sale = self.sales_repo.create(
+            sale_record(sales_data, totals, invoice_id, customer_id, sale_date), items_data
+        )
         
         # Update inventory quantities
         for item in sales_data.items:
             self.inventory_repo.update_quantity(item.tire_id, -item.quantity)
         
+        # Start the invoice now so the first download does not wait on ReportLab
+        InvoiceService(self.db).prerender(sale)
+        
         return self._to_response(sale)
     
     def get_sales_history(self, skip: int = 0, limit: int = 100) -> List[SalesResponse]:
@@ -85,6 +127,7 @@ class SalesService:
         return self._to_response(sale)
     
     def get_sales_report(self, start_date: date, end_date: date) -> List[SalesResponse]:
+        SalesArchiveService(self.db).include_archived(datetime.combine(start_date, datetime.min.time()))
         sales = self.sales_repo.get_by_date_range(start_date, end_date)
         return [self._to_response(sale) for sale in sales]
     
@@ -117,3 +160,49 @@ class SalesService:
             sale_date=sale.sale_date,
             items=items
         )
+
+class AsyncSalesService:
+    """SalesService for the async POS routes, on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.sales_repo = AsyncSalesRepository(db)
+        self.inventory_repo = AsyncInventoryRepository(db)
+        self.customer_repo = AsyncCustomerRepository(db)
+    
+    async def create_sale(self, sales_data: SalesCreate) -> SalesResponse:
+        tires = {item.tire_id: await self.inventory_repo.get_by_id(item.tire_id) for item in sales_data.items}
+        items_data, totals = price_sale(sales_data, tires)
+        
+        invoice_id = await self.sales_repo.generate_invoice_id()
+        
+        # Update the customer's running totals; committed together with the sale
+        sale_date = datetime.utcnow()
+        customer_id = None
+        mobile = normalize_mobile(sales_data.customer_mobile)
+        if mobile:
+            customer_id = await self.customer_repo.record_sale(mobile, sales_data.customer_name, totals["total_amount"], sale_date)
+        
+        sale = await self.sales_repo.create(
+            sale_record(sales_data, totals, invoice_id, customer_id, sale_date), items_data
+        )
+        
+        for item in sales_data.items:
+            await self.inventory_repo.update_quantity(item.tire_id, -item.quantity)
+        
+        # Prerendering only touches invoice storage (possibly S3), never the
+        # session, so it runs off the event loop with the already-loaded sale
+        await run_in_threadpool(InvoiceService(self.db.sync_session).prerender, sale)
+        
+        return self._to_response(sale)
+    
+    async def get_sales_history(self, skip: int = 0, limit: int = 100) -> List[SalesResponse]:
+        sales = await self.sales_repo.get_all(skip, limit)
+        return [self._to_response(sale) for sale in sales]
+    
+    async def get_sale_by_id(self, sale_id: int) -> SalesResponse:
+        sale = await self.sales_repo.get_by_id(sale_id)
+        if not sale:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found")
+        return self._to_response(sale)
+    
+    _to_response = SalesService._to_response
@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.scheduler import Scheduler
+from app.core.shop_time import shop_today
+from app.repositories.job_run_repository import JobRunRepository
+from app.schemas.profit import DailyClosingReport
+from app.services.profit_service import ProfitService
+from app.services.whatsapp_outbox_service import WhatsAppOutboxService
+from app.services.invoice_storage import LocalInvoiceStorage, get_invoice_storage, months_ago
+from app.services.sales_archive_service import SalesArchiveService
+
+def format_closing_report(report: DailyClosingReport) -> str:
+    return "\n".join([
+        f"Daily closing - {report.date.strftime('%d-%m-%Y')}",
+        f"Sales: ₹{report.total_sales:.2f} ({report.total_transactions} bills, {report.total_items_sold} tyres)",
+        f"Profit: ₹{report.total_profit:.2f}",
+        f"Cash: ₹{report.cash_sales:.2f} | UPI: ₹{report.upi_sales:.2f} | Card: ₹{report.card_sales:.2f}"
+    ])
+
+def send_closing_report() -> str:
+    """Build today's closing report and queue it to the owner on WhatsApp"""
+    today = shop_today()
+    db = SessionLocal()
+    try:
+        report = ProfitService(db).get_daily_closing_report(today)
+        if not settings.OWNER_WHATSAPP_MOBILE:
+            return f"{report.model_dump_json()} (not pushed: OWNER_WHATSAPP_MOBILE is not set)"
+        
+        message = WhatsAppOutboxService(db).queue_message(
+            settings.OWNER_WHATSAPP_MOBILE,
+            format_closing_report(report)
+        )
+        return f"{report.model_dump_json()} (queued as WhatsApp message {message.id})"
+    finally:
+        db.close()
+
+def maintain_invoices() -> str:
+    """Pack and expire locally cached invoice PDFs, as invoice_maintenance.py does"""
+    storage = get_invoice_storage()
+    if not isinstance(storage, LocalInvoiceStorage):
+        return "Skipped: invoice storage is not local"
+    
+    today = shop_today()
+    result = storage.apply_retention(
+        pack_before=months_ago(today, settings.INVOICE_PACK_AFTER_MONTHS),
+        evict_before=months_ago(today, settings.INVOICE_RETENTION_MONTHS)
+    )
+    return (
+        f"Packed {sum(result['packed'].values())} PDFs in {len(result['packed'])} months, "
+        f"evicted {len(result['evicted'])} months"
+    )
+
+def ensure_sales_partitions() -> str:
+    """Create the coming months' sales partitions before any sale needs them,
+    and keep the archive views in step with the live tables' columns"""
+    db = SessionLocal()
+    try:
+        service = SalesArchiveService(db)
+        if not service.partitioned:
+            return "Skipped: sales is not partitioned"
+        created = service.ensure_partitions(settings.SALES_PARTITION_MONTHS_AHEAD)
+        refreshed = service.refresh_history_views()
+        return f"Created {created} monthly partitions" + ("; archive views refreshed" if refreshed else "")
+    finally:
+        db.close()
+
+def _claim_run(job_name: str, scheduled_for: datetime, worker: str) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        run = JobRunRepository(db).claim(job_name, scheduled_for, worker)
+        return run.id if run else None
+    finally:
+        db.close()
+
+def _finish_run(run_id: int, error: Optional[str], result: Optional[str]) -> None:
+    db = SessionLocal()
+    try:
+        JobRunRepository(db).finish(run_id, error, result)
+    finally:
+        db.close()
+
+scheduler = Scheduler(settings.SHOP_TIMEZONE, _claim_run, _finish_run)
+scheduler.register("daily_closing_report", settings.CLOSING_REPORT_CRON, send_closing_report)
+scheduler.register("invoice_maintenance", settings.INVOICE_MAINTENANCE_CRON, maintain_invoices)
+scheduler.register("sales_partitions", settings.SALES_PARTITION_CRON, ensure_sales_partitions)
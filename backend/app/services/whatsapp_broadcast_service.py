@@ -0,0 +1,207 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta
+from typing import List, Optional
+import threading
+import traceback
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.rate_limit import TokenBucket
+from app.models.whatsapp_broadcast import BroadcastStatus, RecipientStatus
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.whatsapp_broadcast_repository import WhatsAppBroadcastRepository
+from app.schemas.whatsapp import (
+    BroadcastCreate, BroadcastRecipientQuery, BroadcastResponse, BroadcastRecipientResponse
+)
+from app.services.whatsapp_provider import WhatsAppSendError, get_whatsapp_provider, send_bucket
+
+# Tries per recipient for retryable provider errors (throttling, outages)
+MAX_SEND_ATTEMPTS = 3
+
+# A running broadcast whose runner has not reported for this long is taken over.
+# The runner reports after every recipient, and one recipient takes at most a
+# provider call (WHATSAPP_HTTP_TIMEOUT) plus the retry pause below
+STALE_HEARTBEAT_AFTER = timedelta(minutes=2)
+
+class BroadcastRunner:
+    """Background thread that sends broadcasts, paced by the process's token
+    bucket, which the outbox dispatcher shares.
+
+    Every worker runs one, but only one broadcast sends at a time across the
+    deployment: claim_next only hands out the oldest unfinished broadcast, and
+    not while another runner is heartbeating it. So the rate limit holds for
+    broadcasts however many workers there are.
+
+    Each recipient is marked sending (committed) before the provider call, and
+    sent or failed after it, so a restarted runner picks up exactly where the
+    last one stopped and never sends to anyone twice.
+    """
+
+    def __init__(self, bucket: TokenBucket, poll_interval: float, batch_size: int = 20):
+        self.bucket = bucket
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._loop, name="whatsapp-broadcast", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def run_next(self) -> bool:
+        """Claim and run one broadcast to completion; False if none was waiting"""
+        provider = get_whatsapp_provider()
+        if provider is None:
+            return False
+
+        db = SessionLocal()
+        try:
+            broadcast_repo = WhatsAppBroadcastRepository(db)
+            now = datetime.utcnow()
+            broadcast = broadcast_repo.claim_next(now, now - STALE_HEARTBEAT_AFTER)
+            if broadcast is None:
+                return False
+            self._run(broadcast_repo, provider, broadcast)
+            return True
+        finally:
+            db.close()
+
+    def _run(self, broadcast_repo: WhatsAppBroadcastRepository, provider, broadcast) -> None:
+        while not self._stopping.is_set():
+            broadcast_repo.db.refresh(broadcast)
+            if broadcast.status != BroadcastStatus.RUNNING:
+                return  # Cancelled
+
+            recipients = broadcast_repo.get_pending_recipients(broadcast.id, self.batch_size)
+            if not recipients:
+                broadcast_repo.finish(broadcast, datetime.utcnow())
+                return
+
+            for recipient in recipients:
+                if not self.bucket.acquire(self._stopping):
+                    return
+                if not broadcast_repo.mark_sending(recipient):
+                    continue
+                body = broadcast.body.replace("{name}", recipient.name)
+                try:
+                    provider_message_id = provider.send(recipient.mobile, body)
+                except WhatsAppSendError as e:
+                    if e.retryable and recipient.attempts < MAX_SEND_ATTEMPTS:
+                        broadcast_repo.mark_retry(recipient, str(e))
+                        # Let a throttled or struggling provider recover
+                        self._stopping.wait(2 ** recipient.attempts)
+                    else:
+                        broadcast_repo.mark_failed(recipient, str(e))
+                else:
+                    broadcast_repo.mark_sent(recipient, provider_message_id, datetime.utcnow())
+                # Per recipient, not per batch: a batch can outlast STALE_HEARTBEAT_AFTER
+                broadcast_repo.heartbeat(broadcast, datetime.utcnow())
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                if self.run_next():
+                    continue
+            except Exception:
+                # Keep the runner alive through database hiccups
+                traceback.print_exc()
+            self._wakeup.wait(self.poll_interval)
+
+broadcast_runner = BroadcastRunner(send_bucket, settings.WHATSAPP_POLL_SECONDS)
+
+class WhatsAppBroadcastService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.broadcast_repo = WhatsAppBroadcastRepository(db)
+        self.customer_repo = CustomerRepository(db)
+
+    def create_broadcast(self, broadcast_data: BroadcastCreate) -> BroadcastResponse:
+        """Resolve the recipients now and queue the broadcast for the runner"""
+        if get_whatsapp_provider() is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="WhatsApp service not configured. Please set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN in .env"
+            )
+        if not broadcast_data.body.strip():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Message body is required")
+
+        criteria = broadcast_data.recipients
+        if not 1 <= criteria.months <= 120:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="months must be between 1 and 120")
+
+        recipients = self.preview_recipients(criteria)
+        if not recipients:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No customers match the recipient query")
+
+        broadcast = self.broadcast_repo.create({
+            "body": broadcast_data.body,
+            "criteria": criteria.model_dump_json()
+        }, recipients)
+        broadcast_runner.start()
+        broadcast_runner.wake()
+        return self._to_response(broadcast)
+
+    def preview_recipients(self, criteria: BroadcastRecipientQuery) -> List[tuple]:
+        # Months are approximated as 30 days
+        since = datetime.utcnow() - timedelta(days=30 * criteria.months)
+        return self.customer_repo.get_buyers(since, criteria.tire_size, criteria.brand)
+
+    def get_broadcast(self, broadcast_id: int) -> BroadcastResponse:
+        return self._to_response(self._get(broadcast_id))
+
+    def get_recipients(
+        self,
+        broadcast_id: int,
+        recipient_status: Optional[RecipientStatus] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[BroadcastRecipientResponse]:
+        self._get(broadcast_id)
+        recipients = self.broadcast_repo.get_recipients(broadcast_id, recipient_status, skip, limit)
+        return [BroadcastRecipientResponse.model_validate(recipient) for recipient in recipients]
+
+    def cancel_broadcast(self, broadcast_id: int) -> BroadcastResponse:
+        """Stop sending; recipients not yet messaged are marked skipped"""
+        broadcast = self._get(broadcast_id)
+        if broadcast.status in (BroadcastStatus.COMPLETED, BroadcastStatus.CANCELLED):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Broadcast is already {broadcast.status.value}"
+            )
+        self.broadcast_repo.cancel(broadcast, datetime.utcnow())
+        return self._to_response(broadcast)
+
+    def _get(self, broadcast_id: int):
+        broadcast = self.broadcast_repo.get_by_id(broadcast_id)
+        if not broadcast:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Broadcast not found")
+        return broadcast
+
+    def _to_response(self, broadcast) -> BroadcastResponse:
+        return BroadcastResponse(
+            id=broadcast.id,
+            body=broadcast.body,
+            criteria=BroadcastRecipientQuery.model_validate_json(broadcast.criteria),
+            status=broadcast.status,
+            total_recipients=broadcast.total_recipients,
+            counts=self.broadcast_repo.get_status_counts(broadcast.id),
+            created_at=broadcast.created_at,
+            started_at=broadcast.started_at,
+            finished_at=broadcast.finished_at
+        )
@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta
+from typing import Optional
+import random
+import threading
+import traceback
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.rate_limit import TokenBucket
+from app.repositories.sales_repository import SalesRepository
+from app.repositories.whatsapp_outbox_repository import WhatsAppOutboxRepository
+from app.schemas.whatsapp import WhatsAppMessageResponse
+from app.services.invoice_service import InvoiceService
+from app.services.whatsapp_provider import WhatsAppSendError, get_whatsapp_provider, public_media_url, send_bucket
+
+# Longest wait between attempts, whatever the attempt count
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+# A message claimed this long ago without an outcome belongs to a dead dispatcher
+STALE_CLAIM_AFTER = timedelta(minutes=10)
+
+class WhatsAppDispatcher:
+    """Background thread that delivers the WhatsApp outbox.
+
+    Each pass claims due messages, sends them through the shared provider and
+    records the outcome. Retryable failures are rescheduled with exponential
+    backoff and jitter; permanent failures and messages out of attempts are
+    dead-lettered. Sends wait on `bucket`, when given, which broadcasts share.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        batch_size: int = 20,
+        bucket: Optional[TokenBucket] = None
+    ):
+        self.poll_interval = poll_interval
+        self.bucket = bucket
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.batch_size = batch_size
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._loop, name="whatsapp-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self) -> None:
+        """Run a pass now instead of at the next poll"""
+        self._wakeup.set()
+
+    def dispatch_due(self) -> int:
+        """Send every message that is due; returns how many were attempted"""
+        provider = get_whatsapp_provider()
+        if provider is None:
+            return 0
+
+        attempted = 0
+        db = SessionLocal()
+        try:
+            outbox_repo = WhatsAppOutboxRepository(db)
+            while True:
+                messages = outbox_repo.claim_due(datetime.utcnow(), self.batch_size)
+                if not messages:
+                    break
+                for message in messages:
+                    self._deliver(db, outbox_repo, provider, message)
+                    attempted += 1
+        finally:
+            db.close()
+        return attempted
+
+    def _deliver(self, db: Session, outbox_repo: WhatsAppOutboxRepository, provider, message) -> None:
+        try:
+            media_url = None
+            if message.sale_id is not None:
+                # Resolved at send time so the link is fresh (signed URLs expire)
+                media_url = public_media_url(InvoiceService(db).generate_invoice_pdf(message.sale_id))
+            if self.bucket is not None:
+                self.bucket.acquire()
+            provider_message_id = provider.send(message.to_number, message.body, media_url)
+        except WhatsAppSendError as e:
+            outbox_repo.mark_failed(message, str(e), self._next_attempt_at(message, e.retryable))
+            return
+        except Exception as e:
+            db.rollback()
+            outbox_repo.mark_failed(message, str(e), self._next_attempt_at(message, True))
+            return
+        outbox_repo.mark_sent(message, provider_message_id, datetime.utcnow())
+
+    def _next_attempt_at(self, message, retryable: bool) -> Optional[datetime]:
+        attempts = message.attempts + 1  # Including the one that just failed
+        if not retryable or attempts >= self.max_attempts:
+            return None
+        delay = timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1))
+        delay = min(delay, MAX_RETRY_DELAY) * random.uniform(0.8, 1.2)
+        return datetime.utcnow() + delay
+
+    def _loop(self) -> None:
+        db = SessionLocal()
+        try:
+            WhatsAppOutboxRepository(db).release_stale(datetime.utcnow() - STALE_CLAIM_AFTER)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            db.close()
+
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                self.dispatch_due()
+            except Exception:
+                # Keep the dispatcher alive through database hiccups
+                traceback.print_exc()
+            self._wakeup.wait(self.poll_interval)
+
+whatsapp_dispatcher = WhatsAppDispatcher(
+    settings.WHATSAPP_POLL_SECONDS,
+    settings.WHATSAPP_MAX_ATTEMPTS,
+    settings.WHATSAPP_RETRY_BASE_SECONDS,
+    bucket=send_bucket
+)
+
+class WhatsAppOutboxService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.outbox_repo = WhatsAppOutboxRepository(db)
+        self.sales_repo = SalesRepository(db)
+
+    def queue_invoice(self, sale_id: int, customer_mobile: str) -> WhatsAppMessageResponse:
+        sale = self.sales_repo.get_by_id(sale_id)
+        if not sale:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found")
+        return self.queue_message(
+            customer_mobile,
+            f"Thank you for your purchase! Here is your invoice {sale.invoice_id}.",
+            sale_id=sale.id
+        )
+
+    def queue_message(self, customer_mobile: str, body: str, sale_id: Optional[int] = None) -> WhatsAppMessageResponse:
+        """Store a message for the dispatcher and return without waiting for delivery"""
+        if get_whatsapp_provider() is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="WhatsApp service not configured. Please set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN in .env"
+            )
+
+        message = self.outbox_repo.create({
+            "to_number": customer_mobile,
+            "body": body,
+            "sale_id": sale_id
+        })
+        whatsapp_dispatcher.start()
+        whatsapp_dispatcher.wake()
+        return WhatsAppMessageResponse.model_validate(message)
+
+    def get_message(self, message_id: int) -> WhatsAppMessageResponse:
+        message = self.outbox_repo.get_by_id(message_id)
+        if not message:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+        return WhatsAppMessageResponse.model_validate(message)
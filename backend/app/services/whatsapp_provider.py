@@ -0,0 +1,113 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Optional
+import os
+import threading
+from app.core.config import settings
+from app.core.rate_limit import TokenBucket
+
+class WhatsAppSendError(Exception):
+    """A failed send; retryable errors are tried again with backoff"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+# Paces every send from this process, outbox and broadcasts alike
+send_bucket = TokenBucket(settings.WHATSAPP_BROADCAST_RATE, settings.WHATSAPP_BROADCAST_BURST)
+
+def format_whatsapp_number(mobile: str) -> str:
+    if not mobile.startswith('+'):
+        mobile = f"+91{mobile}"
+    return f"whatsapp:{mobile}"
+
+def public_media_url(location: str) -> str:
+    # Object storage hands out full (signed) URLs; local paths need the public domain
+    if location.startswith(("http://", "https://")):
+        return location
+    if not settings.PUBLIC_BASE_URL:
+        # Not retryable: a configuration error, and a guessed link would reach the customer dead
+        raise WhatsAppSendError(
+            "PUBLIC_BASE_URL is not set, so locally stored invoices have no public link; "
+            "set it or use INVOICE_STORAGE=s3",
+            retryable=False
+        )
+    return f"{settings.PUBLIC_BASE_URL.rstrip('/')}/{location.lstrip('/')}"
+
+class WhatsAppProvider(ABC):
+    @abstractmethod
+    def send(self, to_mobile: str, body: str, media_url: Optional[str] = None) -> str:
+        """Send one message and return the provider's message id"""
+
+class TwilioWhatsAppProvider(WhatsAppProvider):
+    def __init__(self, account_sid: str, auth_token: str, whatsapp_from: str, timeout: float):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.whatsapp_from = whatsapp_from
+        self.timeout = timeout
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        # Built by the first send, so the Twilio SDK stays out of workers that never send
+        with self._client_lock:
+            if self._client is None:
+                from twilio.rest import Client
+                from twilio.http.http_client import TwilioHttpClient
+
+                # One client, and so one pooled HTTP session, for the whole process
+                self._client = Client(self.account_sid, self.auth_token, http_client=TwilioHttpClient(timeout=self.timeout))
+            return self._client
+
+    def send(self, to_mobile: str, body: str, media_url: Optional[str] = None) -> str:
+        from twilio.base.exceptions import TwilioRestException
+
+        params = {"from_": self.whatsapp_from, "to": format_whatsapp_number(to_mobile), "body": body}
+        if media_url:
+            params["media_url"] = [media_url]
+        try:
+            return self.client.messages.create(**params).sid
+        except TwilioRestException as e:
+            # Bad numbers and auth errors will not fix themselves; throttling and outages might
+            raise WhatsAppSendError(str(e), retryable=e.status == 429 or e.status >= 500)
+        except Exception as e:
+            raise WhatsAppSendError(str(e))
+
+class FakeWhatsAppProvider(WhatsAppProvider):
+    """Records messages instead of sending them, for development and tests.
+    fail_next() makes the following sends raise."""
+
+    def __init__(self):
+        self.sent: List[dict] = []
+        self._failures: List[bool] = []
+        self._lock = threading.Lock()
+
+    def fail_next(self, count: int = 1, retryable: bool = True) -> None:
+        with self._lock:
+            self._failures.extend([retryable] * count)
+
+    def send(self, to_mobile: str, body: str, media_url: Optional[str] = None) -> str:
+        with self._lock:
+            if self._failures:
+                raise WhatsAppSendError("Simulated provider failure", retryable=self._failures.pop(0))
+            message_id = f"FAKE{len(self.sent) + 1:08d}"
+            self.sent.append({"sid": message_id, "to": format_whatsapp_number(to_mobile), "body": body, "media_url": media_url})
+            return message_id
+
+@lru_cache(maxsize=1)
+def get_whatsapp_provider() -> Optional[WhatsAppProvider]:
+    """Provider selected by WHATSAPP_PROVIDER, or None when Twilio is not configured"""
+    if settings.WHATSAPP_PROVIDER == "fake":
+        return FakeWhatsAppProvider()
+
+    account_sid = os.getenv('TWILIO_ACCOUNT_SID', '')
+    auth_token = os.getenv('TWILIO_AUTH_TOKEN', '')
+    if not (account_sid and auth_token):
+        return None
+    return TwilioWhatsAppProvider(
+        account_sid,
+        auth_token,
+        os.getenv('TWILIO_WHATSAPP_FROM', 'whatsapp:+14155238886'),
+        settings.WHATSAPP_HTTP_TIMEOUT
+    )
@@ -0,0 +1,57 @@
+"""
+Archive old months of the month-partitioned sales tables (Postgres)
+Detaches every month older than SALES_ARCHIVE_YEARS from sales / sales_items
+into the sales_archive schema, optionally moving it onto SALES_ARCHIVE_TABLESPACE
+(e.g. a tablespace on cheaper, compressed storage). Archived months are no
+longer scanned by day-to-day queries, but stay queryable for reports: sales
+and GST reports, exports and analytics whose range reaches back into them read
+the sales_archive.sales and sales_archive.sales_items views (live tables plus
+every archived month) instead.
+
+Also creates the coming months' partitions, as the sales_partitions job does
+(not with --dry-run, which changes nothing).
+
+Run `python migrate.py` first; it converts sales to partitioned tables.
+
+Usage: python archive_sales.py [--years N] [--tablespace NAME] [--dry-run]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.sales_archive_service import SalesArchiveService
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old monthly sales partitions")
+    parser.add_argument("--years", type=int, default=settings.SALES_ARCHIVE_YEARS)
+    parser.add_argument("--tablespace", default=settings.SALES_ARCHIVE_TABLESPACE)
+    parser.add_argument("--dry-run", action="store_true", help="List the months without archiving them")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        service = SalesArchiveService(db)
+        if not service.partitioned:
+            print("sales is not partitioned; run `python migrate.py` on Postgres first")
+            return
+        
+        created = 0 if args.dry_run else service.ensure_partitions(settings.SALES_PARTITION_MONTHS_AHEAD)
+        months = service.archive(args.years, args.tablespace, dry_run=args.dry_run)
+    finally:
+        db.close()
+    
+    if not args.dry_run:
+        print(f"✓ {created} future monthly partitions created")
+    label = "Would archive" if args.dry_run else "Archived"
+    for month in months:
+        print(f"  - {label} {month:%Y-%m}")
+    if not months:
+        print(f"  - Nothing older than {args.years} years")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: invoice PDF renders per second.
+
+"per-render setup" rebuilds the template (stylesheet, paragraph styles, shop
+header, table styles) for every invoice, which is what each render did before
+templates were precompiled. "precompiled" reuses the cached template.
+No database is needed; a synthetic sale is rendered into memory.
+
+Usage: python benchmarks/invoice_render_bench.py [--renders N] [--items N]
+"""
+import argparse
+import io
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the backend directory to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.core.gst import sale_tax_breakdown
+from app.models.sales import PaymentMode
+from app.schemas.invoice import ShopConfig
+from app.services.invoice_template import InvoiceTemplate, get_invoice_template
+
+def make_sale(item_count: int):
+    items = []
+    for idx in range(item_count):
+        unit_price = 2500.0 + idx * 100
+        items.append(SimpleNamespace(
+            tire=SimpleNamespace(brand="MRF", tire_size=f"{145 + idx}/80 R13"),
+            quantity=2,
+            unit_price=unit_price,
+            total_price=unit_price * 2,
+            gst_rate=18.0,
+            taxable_value=None,
+            cgst_amount=None,
+            sgst_amount=None
+        ))
+    return SimpleNamespace(
+        invoice_id="INV202601010001",
+        sale_date=datetime(2026, 1, 1, 10, 30),
+        customer_name="Benchmark Customer",
+        customer_mobile="9876543210",
+        payment_mode=PaymentMode.UPI,
+        discount_amount=0,
+        items=items
+    )
+
+def bench(label: str, render, renders: int) -> float:
+    render()  # warm-up
+    start = time.perf_counter()
+    for _ in range(renders):
+        render()
+    elapsed = time.perf_counter() - start
+    rate = renders / elapsed
+    print(f"  {label:<18} {rate:8.1f} renders/s  ({elapsed * 1000 / renders:.2f} ms each)")
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Invoice render benchmark")
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--items", type=int, default=3)
+    args = parser.parse_args()
+    
+    shop_config = ShopConfig()
+    sale = make_sale(args.items)
+    tax = sale_tax_breakdown(sale)
+    
+    def per_render_setup():
+        InvoiceTemplate(shop_config).render(sale, tax, io.BytesIO())
+    
+    def precompiled():
+        get_invoice_template(shop_config).render(sale, tax, io.BytesIO())
+    
+    print(f"Rendering {args.renders} invoices with {args.items} line items each")
+    before = bench("per-render setup", per_render_setup, args.renders)
+    after = bench("precompiled", precompiled, args.renders)
+    print(f"  speed-up: {after / before:.2f}x")
+
+if __name__ == "__main__":
+    main()
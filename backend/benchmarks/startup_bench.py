@@ -0,0 +1,81 @@
+"""
+Boot benchmark: time and memory to import the app, as each worker does at startup.
+
+Every run imports the module in a fresh interpreter and records the import
+time, the peak RSS afterwards, and whether any of the heavy optional
+dependencies (ReportLab, Twilio, ...) were loaded; those must only load on
+first use. Exits 1 when the median import time or RSS is over budget or a
+heavy dependency was loaded, so it can gate CI or a deploy.
+No database is needed; engines are created but never connect.
+
+Usage: python benchmarks/startup_bench.py [--runs N] [--module app.main]
+           [--max-import-ms MS] [--max-rss-mb MB]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded by the features that need them, never by importing the app
+LAZY_MODULES = ("reportlab", "PIL", "twilio", "pyarrow", "openpyxl", "boto3")
+
+# Run in the child interpreter; prints one JSON line
+MEASURE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in KB on Linux, bytes on macOS
+rss_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+loaded = sorted({name.split(".")[0] for name in sys.modules})
+print(json.dumps({"import_ms": elapsed * 1000, "rss_mb": rss_mb, "modules": loaded}))
+"""
+
+def measure(modules) -> dict:
+    result = subprocess.run([sys.executable, "-c", MEASURE, *modules], cwd=BACKEND_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"✗ Importing {', '.join(modules)} failed:\n{result.stderr}")
+    # The app prints its own startup lines; ours is the last one
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="App import time and memory benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", action="append", help="Module to import (repeatable); default app.main")
+    parser.add_argument("--max-import-ms", type=float, default=2500)
+    parser.add_argument("--max-rss-mb", type=float, default=120)
+    args = parser.parse_args()
+    modules = args.module or ["app.main"]
+
+    measure(modules)  # warm-up: writes .pyc files so runs measure imports, not compilation
+    runs = [measure(modules) for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    rss_mb = statistics.median(run["rss_mb"] for run in runs)
+    loaded = set().union(*(run["modules"] for run in runs))
+    eager = sorted(loaded.intersection(LAZY_MODULES))
+
+    print(f"Importing {', '.join(modules)} ({args.runs} runs, median)")
+    print(f"  import time  {import_ms:8.1f} ms  (budget {args.max_import_ms:.0f} ms)")
+    print(f"  peak RSS     {rss_mb:8.1f} MB  (budget {args.max_rss_mb:.0f} MB)")
+    print(f"  heavy deps   {', '.join(eager) if eager else 'none loaded'}")
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append("import time over budget")
+    if rss_mb > args.max_rss_mb:
+        failures.append("RSS over budget")
+    if eager:
+        failures.append(f"loaded at import: {', '.join(eager)}")
+    if failures:
+        print(f"✗ {'; '.join(failures)}")
+        sys.exit(1)
+    print("✓ Within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Export sales line items to month-partitioned Parquet files for BI / accounting
+Only months whose data changed since the last run are rewritten.
+
+Usage: python export_sales_parquet.py [--full] [--out DIR]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from app.core.database import SessionLocal
+from app.services.sales_export_service import SalesExportService
+
+def main():
+    parser = argparse.ArgumentParser(description="Export sales to Parquet")
+    parser.add_argument("--full", action="store_true", help="Rewrite every month")
+    parser.add_argument("--out", default=None, help="Export directory (defaults to EXPORT_DIR)")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        result = SalesExportService(db, export_dir=args.out).export_parquet(full=args.full)
+    finally:
+        db.close()
+    
+    print(f"✓ Export written to {result['export_dir']}")
+    print(f"  - Months written: {', '.join(result['months_written']) or 'none'}")
+    print(f"  - Months unchanged: {len(result['months_skipped'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Housekeeping for locally stored invoice PDFs (INVOICE_STORAGE=local)
+Packs months older than INVOICE_PACK_AFTER_MONTHS into one archive each and
+deletes cached PDFs older than INVOICE_RETENTION_MONTHS; evicted invoices are
+rendered again when next requested. Also clears PDFs left by the old flat layout.
+
+For S3 storage, configure a bucket lifecycle rule on INVOICE_S3_PREFIX instead.
+
+Usage: python invoice_maintenance.py [--pack-after-months N] [--retention-months N]
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.services.invoice_storage import LocalInvoiceStorage, get_invoice_storage, months_ago
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack and expire cached invoice PDFs")
+    parser.add_argument("--pack-after-months", type=int, default=settings.INVOICE_PACK_AFTER_MONTHS)
+    parser.add_argument("--retention-months", type=int, default=settings.INVOICE_RETENTION_MONTHS)
+    args = parser.parse_args()
+    
+    storage = get_invoice_storage()
+    if not isinstance(storage, LocalInvoiceStorage):
+        print("Invoice storage is not local; use bucket lifecycle rules for retention")
+        return
+    
+    today = date.today()
+    result = storage.apply_retention(
+        pack_before=months_ago(today, args.pack_after_months),
+        evict_before=months_ago(today, args.retention_months)
+    )
+    
+    print(f"✓ Invoice maintenance done in {storage.root}")
+    for month, count in result["packed"].items():
+        print(f"  - Packed {month}: {count} PDFs")
+    for month, count in result["evicted"].items():
+        print(f"  - Evicted {month}: {count} files")
+    if result["unsharded_evicted"]:
+        print(f"  - Removed {result['unsharded_evicted']} PDFs from the old flat layout")
+
+if __name__ == "__main__":
+    main()
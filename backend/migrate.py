@@ -0,0 +1,40 @@
+"""
+Bring the database schema up to date with the code (alembic upgrade head)
+Run before starting the app on every deploy; the app only checks the revision
+at startup. Databases created by create_all before migrations existed are
+taken over by the baseline revision, which adds whatever they are missing
+(what migrate_sales_discount.py, migrate_sales_gst.py and migrate_customers.py
+used to do).
+
+Usage: python migrate.py [--check]
+  --check   Only report the revisions; exits 1 if migrations are pending
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from alembic import command
+from app.core.database import engine
+from app.core.migrations import alembic_config, schema_revisions
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending database migrations")
+    parser.add_argument("--check", action="store_true", help="Report pending migrations without applying them")
+    args = parser.parse_args()
+    
+    current, head = schema_revisions(engine)
+    print(f"📋 Database at revision {current or 'none'}, code expects {head}")
+    if current == head:
+        print("✓ Schema is up to date")
+        return
+    if args.check:
+        sys.exit(1)
+    
+    command.upgrade(alembic_config(), "head")
+    print(f"✓ Migrated to revision {head}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 """
 Reset database - Drop all tables and recreate with current schema
 """
-from app.core.database import Base, engine
-from app.models import *  # Import all models
+from alembic import command
+from app.core.database import engine
+from app.core.migrations import alembic_config
 from sqlalchemy import text
 
 def reset_database():
@@ -15,7 +16,7 @@ def reset_database():
     print("✓ All tables dropped")
     
     print("Creating tables with new schema...")
-    Base.metadata.create_all(bind=engine)
+    command.upgrade(alembic_config(), "head")
     print("✓ All tables created")
     
     print("\nDatabase reset complete!")
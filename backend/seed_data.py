@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, engine
 from app.models.inventory import TireInventory
 from app.models.sales import Sales, SalesItem, PaymentMode
+from app.models.invoice_number import InvoiceNumber
 from app.models.purchase import Purchase, PaymentStatus
 from app.models.user import User
 from app.core.security import get_password_hash
@@ -163,6 +164,7 @@ def seed_sales(db: Session, tires):
             payment_mode=payment_mode,
             sale_date=sale_date
         )
+        db.add(InvoiceNumber(invoice_id=sale.invoice_id))
         db.add(sale)
         db.flush()
         
@@ -171,6 +173,7 @@ def seed_sales(db: Session, tires):
             qty = random.randint(1, 2)
             sale_item = SalesItem(
                 sale_id=sale.id,
+                sale_date=sale.sale_date,
                 tire_id=tire.id,
                 quantity=qty,
                 unit_price=tire.selling_price,
@@ -0,0 +1,120 @@
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Settings are read at import time, so point everything at a scratch
+# directory before the app is imported
+TEST_DIR = tempfile.mkdtemp(prefix="tire-shop-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DIR}/test.db"
+os.environ["WHATSAPP_PROVIDER"] = "fake"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["INVOICE_STORAGE"] = "local"
+os.environ["INVOICE_DIR"] = os.path.join(TEST_DIR, "invoices")
+os.environ["REPORT_CACHE_DIR"] = os.path.join(TEST_DIR, "report_cache")
+os.environ["EXPORT_DIR"] = os.path.join(TEST_DIR, "exports")
+
+import pytest
+from alembic import command
+from sqlalchemy import event
+from app.core.database import Base, SessionLocal, async_engine, engine
+from app.core.migrations import alembic_config
+from app.models import PaymentMode, Purchase, PurchaseItem, Sales, SalesItem, Supplier, TireInventory, TireType
+from app.models.customer import Customer
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    command.upgrade(alembic_config(), "head")
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+class QueryCounter:
+    """Counts statements on the sync and async engines"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+@pytest.fixture
+def queries():
+    counter = QueryCounter()
+    targets = (engine, async_engine.sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", counter)
+    yield counter
+    for target in targets:
+        event.remove(target, "before_cursor_execute", counter)
+
+@pytest.fixture
+def make_sales(db):
+    """Create `count` sales of three lines each, one every 7 hours from `start`"""
+    def make(count: int, start: datetime = datetime(2026, 1, 1, 9, 0)):
+        supplier = Supplier(name="Test Supplier")
+        db.add(supplier)
+        db.flush()
+        tires = [
+            TireInventory(
+                brand=f"Brand{idx}", tire_size=f"{145 + idx}/80 R13", tire_type=TireType.TUBELESS,
+                quantity=100, purchase_price=1000 + idx, selling_price=1500 + idx,
+                supplier_id=supplier.id, purchase_date=date(2026, 1, 1)
+            )
+            for idx in range(5)
+        ]
+        db.add_all(tires)
+        db.flush()
+
+        sales = []
+        for idx in range(count):
+            sale_date = start + timedelta(hours=idx * 7)
+            mobile = f"98765{idx % 7:05d}"
+            sale = Sales(
+                invoice_id=f"INV{idx:06d}", customer_name=f"Customer {idx % 7}", customer_mobile=mobile,
+                subtotal=0, total_amount=0, payment_mode=PaymentMode.CASH, sale_date=sale_date
+            )
+            db.add(sale)
+            db.flush()
+            total = 0
+            for line in range(3):
+                tire = tires[(idx + line) % len(tires)]
+                db.add(SalesItem(
+                    sale_id=sale.id, sale_date=sale_date, tire_id=tire.id, quantity=line + 1,
+                    unit_price=tire.selling_price, total_price=tire.selling_price * (line + 1)
+                ))
+                total += tire.selling_price * (line + 1)
+            sale.subtotal = total
+            sale.total_amount = total
+            sales.append(sale)
+
+            purchase = Purchase(supplier_name=supplier.name, total_amount=3, purchase_date=sale_date.date())
+            db.add(purchase)
+            db.flush()
+            for line in range(3):
+                db.add(PurchaseItem(purchase_id=purchase.id, tire_id=tires[line].id, quantity=1, purchase_price=1, total_price=1))
+
+        for idx in range(min(count, 7)):
+            db.add(Customer(mobile=f"98765{idx:05d}", name=f"Customer {idx}", visit_count=idx + 1, lifetime_spend=1000 * (idx + 1)))
+        db.commit()
+        return sales
+    return make
@@ -0,0 +1,18 @@
+from datetime import date, datetime
+from app.services.analytics_service import AnalyticsService
+
+def test_compare_periods_uses_shop_days(db, make_sales):
+    # 20:00 UTC on 1 January is 01:30 on 2 January in the shop (Asia/Kolkata)
+    make_sales(1, start=datetime(2026, 1, 1, 20, 0))
+
+    comparison = AnalyticsService(db).compare_periods(date(2026, 1, 2), date(2026, 1, 2))
+
+    assert comparison.current.transactions == 1
+    assert comparison.previous.transactions == 0
+
+def test_top_products_uses_shop_days(db, make_sales):
+    make_sales(1, start=datetime(2026, 1, 1, 20, 0))
+
+    service = AnalyticsService(db)
+    assert service.get_top_products(date(2026, 1, 1), date(2026, 1, 1)).items == []
+    assert len(service.get_top_products(date(2026, 1, 2), date(2026, 1, 2)).items) == 3
@@ -0,0 +1,9 @@
+from datetime import datetime
+from app.services.gst_service import GstService
+
+def test_month_follows_the_shop_calendar(db, make_sales):
+    # 20:00 UTC on 31 January is 01:30 on 1 February in the shop (Asia/Kolkata)
+    make_sales(1, start=datetime(2026, 1, 31, 20, 0))
+
+    assert GstService(db).get_monthly_summary("2026-01").invoice_count == 0
+    assert GstService(db).get_monthly_summary("2026-02").invoice_count == 1
@@ -0,0 +1,27 @@
+from app.services import invoice_service
+from app.services.invoice_storage import get_invoice_storage
+
+def test_unchanged_invoice_is_not_modified_without_rendering(client, make_sales, monkeypatch):
+    sale = make_sales(1)[0]
+    first = client.get(f"/invoice/generate/{sale.id}")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("storage touched for a 304")
+    monkeypatch.setattr(invoice_service.invoice_renders, "render", fail)
+    monkeypatch.setattr(invoice_service.InvoiceService, "iter_invoice_pdf", fail)
+    monkeypatch.setattr(type(get_invoice_storage()), "exists", fail)
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get(f"/invoice/generate/{sale.id}", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.headers["etag"] == etag
+
+def test_stale_etag_gets_the_pdf(client, make_sales):
+    sale = make_sales(1)[0]
+
+    response = client.get(f"/invoice/generate/{sale.id}", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
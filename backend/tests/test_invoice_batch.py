@@ -0,0 +1,31 @@
+import io
+import os
+import zipfile
+from datetime import date, datetime
+from app.services.invoice_batch import stream_invoice_zip
+from app.services.invoice_service import InvoiceService
+
+def test_invoice_deleted_after_planning_is_rendered_again(db, make_sales):
+    sales = make_sales(2, start=datetime(2026, 1, 1, 9, 0))
+    service = InvoiceService(db)
+    for sale in sales:
+        service.get_invoice_pdf(sale.id)
+    entries = service.plan_batch(date(2026, 1, 1), date(2026, 1, 1))
+    assert all(entry["stored"] for entry in entries)
+
+    # Pruned between planning and streaming
+    os.remove(os.path.join(service.storage.root, entries[0]["key"]))
+    content = b"".join(stream_invoice_zip(entries, service.shop_config, service.storage))
+
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert sorted(archive.namelist()) == sorted(f"invoice_{sale.invoice_id}.pdf" for sale in sales)
+        assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+    assert service.storage.exists(entries[0]["key"])
+
+
+def test_batch_covers_the_shop_calendar_day(db, make_sales):
+    # 19:30 UTC on 1 Jan is 01:00 on 2 Jan in the shop
+    [sale] = make_sales(1, start=datetime(2026, 1, 1, 19, 30))
+    service = InvoiceService(db)
+    assert service.plan_batch(date(2026, 1, 1), date(2026, 1, 1)) == []
+    assert [entry["invoice_id"] for entry in service.plan_batch(date(2026, 1, 2), date(2026, 1, 2))] == [sale.invoice_id]
@@ -0,0 +1,57 @@
+import boto3
+import pytest
+from moto import mock_aws
+from app.services.invoice_service import InvoiceService
+from app.services.invoice_storage import InvoiceStorage, S3InvoiceStorage
+
+BUCKET = "invoices-test"
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3InvoiceStorage(BUCKET, prefix="invoices/", region_name="us-east-1")
+
+def test_storage_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        InvoiceStorage()
+
+def test_s3_put_get_and_stream(s3_storage):
+    data = b"%PDF-1.4 " + b"x" * 200_000
+    assert not s3_storage.exists("2026/01/invoice_INV1.pdf")
+
+    s3_storage.put("2026/01/invoice_INV1.pdf", data)
+
+    assert s3_storage.exists("2026/01/invoice_INV1.pdf")
+    assert s3_storage.get("2026/01/invoice_INV1.pdf") == data
+    chunks = list(s3_storage.iter_chunks("2026/01/invoice_INV1.pdf"))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == data
+
+def test_s3_objects_live_under_prefix(s3_storage):
+    s3_storage.put("2026/01/invoice_INV1.pdf", b"pdf")
+
+    listed = boto3.client("s3", region_name="us-east-1").list_objects_v2(Bucket=BUCKET)
+    assert [item["Key"] for item in listed["Contents"]] == ["invoices/2026/01/invoice_INV1.pdf"]
+    assert "invoices/2026/01/invoice_INV1.pdf" in s3_storage.url("2026/01/invoice_INV1.pdf")
+
+def test_s3_missing_object_raises_file_not_found(s3_storage):
+    with pytest.raises(FileNotFoundError):
+        s3_storage.get("2026/01/missing.pdf")
+    with pytest.raises(FileNotFoundError):
+        list(s3_storage.iter_chunks("2026/01/missing.pdf"))
+
+def test_invoice_rendered_once_into_s3(db, make_sales, s3_storage, monkeypatch):
+    sale = make_sales(1)[0]
+    service = InvoiceService(db)
+    monkeypatch.setattr(service, "storage", s3_storage)
+
+    first = service.get_invoice_pdf(sale.id)
+    second = service.get_invoice_pdf(sale.id)
+
+    assert first.content.startswith(b"%PDF")
+    assert second.content is None  # Served from storage, not rendered again
+    assert second.digest == first.digest
+    assert b"".join(service.iter_invoice_pdf(second)) == first.content
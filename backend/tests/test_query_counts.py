@@ -0,0 +1,45 @@
+"""List endpoints must issue a fixed number of queries however many rows they
+return: line items, tires and suppliers are eager-loaded, never per row."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import purchase
+
+LIST_ENDPOINTS = [
+    ("/sales/history?limit={rows}", 3),
+    ("/inventory/all?limit={rows}", 1),
+    ("/profit/details?limit={rows}", 3),
+    ("/customers/top?limit={rows}", 1),
+    ("/reports/sales?start_date=2026-01-01&end_date={end_date}", 3),
+]
+
+# Sale n is made 7h after sale n-1 from 2026-01-01 09:00, so these ranges
+# cover 4 and 20 sales
+END_DATES = {4: "2026-01-02", 20: "2026-01-06"}
+
+def count_queries(client, queries, url: str) -> int:
+    queries.count = 0
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    return queries.count
+
+@pytest.mark.parametrize("url, max_queries", LIST_ENDPOINTS)
+def test_list_query_count_does_not_grow_with_rows(client, queries, make_sales, url, max_queries):
+    make_sales(20)
+    few = count_queries(client, queries, url.format(rows=4, end_date=END_DATES[4]))
+    many = count_queries(client, queries, url.format(rows=20, end_date=END_DATES[20]))
+
+    assert many == few
+    assert many <= max_queries
+
+def test_purchase_list_query_count_does_not_grow_with_rows(queries, make_sales):
+    # The purchase router is not mounted in app.main
+    app = FastAPI()
+    app.include_router(purchase.router)
+    make_sales(20)
+    with TestClient(app) as client:
+        few = count_queries(client, queries, "/purchase/all?limit=4")
+        many = count_queries(client, queries, "/purchase/all?limit=20")
+
+    assert many == few
+    assert many <= 3
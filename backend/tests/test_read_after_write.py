@@ -0,0 +1,49 @@
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from app.core import database
+from app.core.database import PRIMARY_STICKY_COOKIE, PRIMARY_STICKY_HEADER, get_read_db
+
+TIRE = {
+    "brand": "MRF", "tire_size": "145/80 R13", "tire_type": "tubeless", "quantity": 4,
+    "purchase_price": 1000, "selling_price": 1500, "purchase_date": "2026-01-01"
+}
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path):
+    """A separate read engine, as with READ_DATABASE_URL set"""
+    read_engine = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=read_engine))
+    yield read_engine
+    read_engine.dispose()
+
+def read_bind(headers: dict):
+    request = Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    })
+    sessions = get_read_db(request)
+    db = next(sessions)
+    bind = db.get_bind()
+    sessions.close()
+    return bind
+
+def test_write_pins_reads_to_the_primary(client, replica):
+    response = client.post("/inventory/add", json=TIRE)
+
+    assert response.status_code == 200, response.text
+    assert PRIMARY_STICKY_COOKIE in response.cookies
+    pinned_until = response.headers[PRIMARY_STICKY_HEADER]
+    assert float(pinned_until) > time.time()
+
+    # Either the cookie or, where the browser dropped it, the echoed header
+    assert read_bind({"Cookie": f"{PRIMARY_STICKY_COOKIE}=1"}) is database.engine
+    assert read_bind({PRIMARY_STICKY_HEADER: pinned_until}) is database.engine
+
+def test_reads_use_the_replica_without_a_recent_write(replica):
+    assert read_bind({}) is replica
+    assert read_bind({PRIMARY_STICKY_HEADER: str(int(time.time()) - 1)}) is replica
+    assert read_bind({PRIMARY_STICKY_HEADER: "garbage"}) is replica
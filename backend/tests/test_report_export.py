@@ -0,0 +1,27 @@
+import os
+from datetime import date
+import pytest
+from openpyxl import load_workbook
+from app.services.report_export_service import ReportExportService
+
+def test_empty_sales_report_still_has_headers(db):
+    path = ReportExportService(db).sales_report_xlsx(date(2026, 1, 1), date(2026, 1, 31))
+    try:
+        rows = list(load_workbook(path, read_only=True)["Sales"].values)
+    finally:
+        os.remove(path)
+
+    assert len(rows) == 1
+    assert rows[0][:3] == ("Sale Id", "Invoice Id", "Sale Date")
+
+def test_failed_save_leaves_no_temp_file(db, tmp_path, monkeypatch):
+    from openpyxl import Workbook
+
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    def fail(self, filename):
+        raise OSError("disk full")
+    monkeypatch.setattr(Workbook, "save", fail)
+
+    with pytest.raises(OSError):
+        ReportExportService(db).inventory_report_xlsx()
+    assert list(tmp_path.glob("*.xlsx")) == []
@@ -0,0 +1,34 @@
+import os
+import time
+from datetime import date, datetime
+from app.schemas.report_job import ReportJobSpec
+from app.services.report_job_service import JOB_RECORD_TTL, ReportJobQueue
+
+def wait_until_finished(queue, job_id):
+    for _ in range(100):
+        job_status = queue.get_status(job_id)
+        if job_status.status in ("done", "failed"):
+            return job_status
+        time.sleep(0.05)
+    raise AssertionError("report job did not finish")
+
+def test_expired_results_are_removed_from_the_cache(db, tmp_path):
+    queue = ReportJobQueue(str(tmp_path), max_workers=1)
+    spec = ReportJobSpec(kind="daily_closing", report_date=date(2026, 1, 1))
+    job_id = queue.submit(db, spec).job_id
+    assert wait_until_finished(queue, job_id).status == "done"
+    result_path, _ = queue.get_result(job_id)
+
+    # Left by another worker process, long ago
+    stale = tmp_path / ("0" * 32 + ".json")
+    stale.write_text("[]")
+    old = time.time() - JOB_RECORD_TTL.total_seconds() * 2
+    os.utime(stale, (old, old))
+
+    # This worker's own job expires too, and the next sweep is due
+    queue._jobs[job_id]["finished_at"] = datetime.utcnow() - JOB_RECORD_TTL * 2
+    queue._last_sweep = None
+    queue.submit(db, ReportJobSpec(kind="daily_closing", report_date=date(2026, 1, 2)))
+
+    assert not os.path.exists(result_path)
+    assert not stale.exists()
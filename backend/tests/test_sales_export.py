@@ -0,0 +1,23 @@
+import enum
+from datetime import datetime
+import pyarrow.parquet as pq
+from app.services.sales_export_service import SalesExportService
+
+class Mode(enum.Enum):
+    # Not a str subclass, so pyarrow cannot take it as a string itself
+    CASH = "cash"
+
+def test_enums_after_a_null_first_row_are_stored_by_value(db, make_sales, tmp_path, monkeypatch):
+    make_sales(2, start=datetime(2026, 1, 1, 9, 0))
+    service = SalesExportService(db, export_dir=str(tmp_path))
+    [(columns, rows)] = list(service.sales_repo.iter_line_rows_by_date_range(datetime(2026, 1, 1), datetime(2026, 2, 1)))
+    # A line with no payment mode comes first in the batch
+    mode = columns.index("payment_mode")
+    rows = [row[:mode] + (None if i == 0 else Mode.CASH,) + row[mode + 1:] for i, row in enumerate(rows)]
+    monkeypatch.setattr(service.sales_repo, "iter_line_rows_by_date_range", lambda *args: iter([(columns, rows)]))
+
+    assert service.export_parquet()["months_written"] == ["2026-01"]
+
+    table = pq.read_table(tmp_path / "sales_items" / "month=2026-01" / "part-0.parquet")
+    assert table.column("payment_mode").to_pylist() == [None] + ["cash"] * (len(rows) - 1)
+    assert set(table.column("tire_type").to_pylist()) == {"tubeless"}
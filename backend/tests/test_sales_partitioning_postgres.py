@@ -0,0 +1,123 @@
+"""Migration 0002 and partition maintenance against a real Postgres.
+
+Set TEST_POSTGRES_URL to a scratch database to run these; its schema is
+dropped and rebuilt.
+"""
+import os
+from datetime import date, datetime, timedelta
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.core.migrations import alembic_config
+from app.models import PaymentMode
+from app.repositories.sales_repository import SalesRepository
+from app.services.gst_service import GstService
+from app.services.sales_archive_service import SalesArchiveService
+from app.services.sales_service import SalesService
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+# One sale every 20 days, 2016-01-05 through 2026-09
+FIRST_SALE = datetime(2016, 1, 5, 6, 0)
+
+@pytest.fixture
+def pg_engine():
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA IF EXISTS sales_archive CASCADE"))
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    yield engine
+    engine.dispose()
+
+def migrate(engine, revision: str, downgrade: bool = False) -> None:
+    config = alembic_config()
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        (command.downgrade if downgrade else command.upgrade)(config, revision)
+
+def seed_legacy_sales(engine) -> int:
+    """Sales as a database at revision 0001 holds them; returns how many"""
+    count = 0
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO suppliers (name) VALUES ('Supplier')"))
+        conn.execute(text(
+            "INSERT INTO tire_inventory (brand, tire_size, tire_type, quantity, purchase_price, selling_price, "
+            "supplier_id, purchase_date, hsn_code, gst_rate) "
+            "VALUES ('MRF', '145/80 R13', 'TUBELESS', 100, 1000, 1500, 1, '2016-01-01', '4011', 18)"
+        ))
+        sale_date = FIRST_SALE
+        while sale_date < datetime(2026, 10, 1):
+            sale_id = conn.execute(text(
+                "INSERT INTO sales (invoice_id, customer_name, customer_mobile, subtotal, discount_value, discount_amount, "
+                "total_amount, payment_mode, sale_date) "
+                "VALUES (:invoice_id, 'Customer', '9876500000', 1500, 0, 0, 1770, 'CASH', :sale_date) RETURNING id"
+            ), {"invoice_id": f"INV{count:05d}", "sale_date": sale_date}).scalar()
+            conn.execute(text(
+                "INSERT INTO sales_items (sale_id, tire_id, quantity, unit_price, total_price, hsn_code, gst_rate, "
+                "taxable_value, cgst_amount, sgst_amount) VALUES (:sale_id, 1, 1, 1500, 1500, '4011', 18, 1500, 135, 135)"
+            ), {"sale_id": sale_id})
+            sale_date += timedelta(days=20)
+            count += 1
+    return count
+
+def scalar(engine, sql: str):
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).scalar()
+
+def test_partition_archive_and_downgrade(pg_engine):
+    migrate(pg_engine, "0001")
+    seeded = seed_legacy_sales(pg_engine)
+    migrate(pg_engine, "head")
+
+    assert scalar(pg_engine, "SELECT count(*) FROM pg_partitioned_table WHERE partrelid = 'public.sales'::regclass") == 1
+    assert scalar(pg_engine, "SELECT count(*) FROM sales") == seeded
+    assert scalar(pg_engine, "SELECT count(*) FROM sales_items") == seeded
+    assert scalar(pg_engine, "SELECT count(*) FROM invoice_numbers") == seeded
+
+    Session = sessionmaker(bind=pg_engine)
+    with Session() as db:
+        # Beyond every monthly partition: lands in the default partition...
+        sale = SalesRepository(db).create({
+            "invoice_id": "INVFUTURE", "customer_name": "Customer", "customer_mobile": "9876500000",
+            "subtotal": 1500, "total_amount": 1770, "payment_mode": PaymentMode.CASH,
+            "sale_date": datetime(2028, 3, 5, 10, 0)
+        }, [{"tire_id": 1, "quantity": 1, "unit_price": 1500, "total_price": 1500}])
+        assert scalar(pg_engine, "SELECT count(*) FROM sales_default") == 1
+        assert scalar(pg_engine, "SELECT count(*) FROM sales_items_default") == 1
+
+        # ...and moves into its month once that is created
+        assert SalesArchiveService(db).ensure_partitions(3, today=date(2028, 1, 10)) > 0
+        assert scalar(pg_engine, "SELECT count(*) FROM sales_default") == 0
+        assert scalar(pg_engine, "SELECT count(*) FROM sales_items_default") == 0
+        assert scalar(pg_engine, f"SELECT tableoid::regclass::text FROM sales WHERE id = {sale.id}") == "sales_y2028m03"
+
+    with Session() as db:
+        archived = SalesArchiveService(db).archive(8, today=date(2026, 10, 1))
+    assert archived[0] == date(2016, 1, 1) and archived[-1] == date(2018, 9, 1)
+    assert scalar(pg_engine, "SELECT to_regclass('sales_archive.sales_y2016m01')::text") == "sales_archive.sales_y2016m01"
+    archived_sales = scalar(pg_engine, "SELECT count(*) FROM sales_archive.sales_y2016m01")
+    assert archived_sales > 0
+    assert scalar(pg_engine, "SELECT count(*) FROM public.sales WHERE sale_date < '2018-10-01'") == 0
+
+    # Reports reaching back into archived months still cover them
+    with Session() as db:
+        assert GstService(db).get_monthly_summary("2016-01").invoice_count == archived_sales
+    with Session() as db:
+        report = SalesService(db).get_sales_report(date(2016, 1, 1), date(2016, 1, 31))
+        assert len(report) == archived_sales
+        assert all(len(sale.items) == 1 for sale in report)
+    with Session() as db:
+        # Recent ranges keep to the live partitions
+        assert not SalesArchiveService(db).include_archived(datetime(2026, 1, 1))
+
+    live = scalar(pg_engine, "SELECT count(*) FROM sales")
+    migrate(pg_engine, "0001", downgrade=True)
+
+    assert scalar(pg_engine, "SELECT count(*) FROM pg_partitioned_table") == 0
+    assert scalar(pg_engine, "SELECT count(*) FROM sales") == live
+    assert "sale_date" not in {column["name"] for column in inspect(pg_engine).get_columns("sales_items")}
+    assert not inspect(pg_engine).has_table("invoice_numbers")
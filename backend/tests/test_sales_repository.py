@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.models import PaymentMode
+from app.repositories.sales_repository import SalesRepository
+
+def sale_data(invoice_id: str, sale_date: datetime) -> dict:
+    return {
+        "invoice_id": invoice_id, "customer_name": "Walk-in", "customer_mobile": "9876500000","subtotal": 0,
+        "total_amount": 0, "payment_mode": PaymentMode.CASH, "sale_date": sale_date
+    }
+
+def test_invoice_ids_are_issued_in_sequence(db):
+    repository = SalesRepository(db)
+    first = repository.generate_invoice_id()
+    repository.create(sale_data(first, datetime.utcnow()), [])
+
+    second = repository.generate_invoice_id()
+
+    assert first.endswith("0001")
+    assert second == first[:-4] + "0002"
+
+def test_invoice_id_cannot_be_reused_on_another_date(db):
+    repository = SalesRepository(db)
+    repository.create(sale_data("INV202601010001", datetime(2026, 1, 1, 10, 0)), [])
+
+    # Partitioned sales only enforce (invoice_id, sale_date); invoice_numbers
+    # rejects the id whatever the date
+    with pytest.raises(IntegrityError, match="invoice_numbers"):
+        repository.create(sale_data("INV202601010001", datetime(2026, 1, 1, 10, 0) + timedelta(days=40)), [])
+    db.rollback()
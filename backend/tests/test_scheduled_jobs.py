@@ -0,0 +1,42 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from app.core.scheduler import CronSchedule
+from app.repositories.job_run_repository import JobRunRepository
+from app.services.profit_service import ProfitService
+
+IST = ZoneInfo("Asia/Kolkata")
+
+def test_closing_report_covers_the_shop_day(db, make_sales):
+    # 19:30 UTC on 1 January is 01:00 on 2 January in the shop
+    make_sales(1, start=datetime(2026, 1, 1, 19, 30))
+
+    service = ProfitService(db)
+    assert service.get_daily_closing_report(date(2026, 1, 1)).total_transactions == 0
+    assert service.get_daily_closing_report(date(2026, 1, 2)).total_transactions == 1
+
+def test_cron_next_after_daily():
+    schedule = CronSchedule("0 21 * * *")
+
+    assert schedule.next_after(datetime(2026, 10, 19, 20, 59, 30, tzinfo=IST)) == datetime(2026, 10, 19, 21, 0, tzinfo=IST)
+    # Strictly after: the matching minute itself moves on to the next day
+    assert schedule.next_after(datetime(2026, 10, 19, 21, 0, tzinfo=IST)) == datetime(2026, 10, 20, 21, 0, tzinfo=IST)
+
+def test_cron_next_after_weekday_and_day_fields():
+    # 2026-10-19 is a Monday; 03:30 on Sundays
+    assert CronSchedule("30 3 * * 0").next_after(datetime(2026, 10, 19, 12, 0, tzinfo=IST)) == datetime(2026, 10, 25, 3, 30, tzinfo=IST)
+    # Both day fields restricted: the 1st of the month or any Friday, whichever comes first
+    assert CronSchedule("0 0 1 * 5").next_after(datetime(2026, 10, 19, 12, 0, tzinfo=IST)) == datetime(2026, 10, 23, 0, 0, tzinfo=IST)
+    # Month rollover
+    assert CronSchedule("15 2 1 1 *").next_after(datetime(2026, 10, 19, tzinfo=IST)) == datetime(2027, 1, 1, 2, 15, tzinfo=IST)
+
+def test_each_occurrence_is_claimed_once(db):
+    scheduled_for = datetime(2026, 10, 19, 15, 30)
+    repository = JobRunRepository(db)
+
+    first = repository.claim("daily_closing_report", scheduled_for, "worker-a")
+    second = repository.claim("daily_closing_report", scheduled_for, "worker-b")
+
+    assert first is not None and first.worker == "worker-a"
+    assert second is None
+    # The next occurrence is a separate run
+    assert repository.claim("daily_closing_report", datetime(2026, 10, 20, 15, 30), "worker-b") is not None
@@ -0,0 +1,69 @@
+from datetime import datetime
+import pytest
+from app.core.database import SessionLocal
+from app.core.rate_limit import TokenBucket
+from app.models.whatsapp_broadcast import BroadcastStatus, RecipientStatus
+from app.repositories.whatsapp_broadcast_repository import WhatsAppBroadcastRepository
+from app.services.whatsapp_broadcast_service import STALE_HEARTBEAT_AFTER, BroadcastRunner
+from app.services.whatsapp_provider import get_whatsapp_provider
+
+CRITERIA = '{"months": 6, "tire_size": null, "brand": null}'
+
+@pytest.fixture
+def provider():
+    fake = get_whatsapp_provider()
+    fake.sent.clear()
+    fake._failures.clear()
+    return fake
+
+@pytest.fixture
+def queue_broadcast(db):
+    def queue(recipients: int = 3):
+        return WhatsAppBroadcastRepository(db).create(
+            {"body": "Hi {name}", "criteria": CRITERIA},
+            [(f"98765{idx:05d}", f"Customer {idx}") for idx in range(recipients)]
+        )
+    return queue
+
+def claim_id():
+    """Claim as a separate worker would, in its own session"""
+    session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        broadcast = WhatsAppBroadcastRepository(session).claim_next(now, now - STALE_HEARTBEAT_AFTER)
+        return broadcast.id if broadcast else None
+    finally:
+        session.close()
+
+def test_one_broadcast_sends_at_a_time(db, queue_broadcast):
+    first = queue_broadcast()
+    queue_broadcast()
+
+    assert claim_id() == first.id
+    # Another worker must wait, even though a second broadcast is queued
+    assert claim_id() is None
+
+    first = WhatsAppBroadcastRepository(db).get_by_id(first.id)
+    first.heartbeat_at = datetime.utcnow() - STALE_HEARTBEAT_AFTER * 2
+    db.commit()
+    # The first runner stopped reporting: its broadcast is taken over, still first
+    assert claim_id() == first.id
+
+def test_runner_heartbeats_after_every_recipient(db, provider, queue_broadcast, monkeypatch):
+    broadcast = queue_broadcast(3)
+    heartbeats = []
+    original = WhatsAppBroadcastRepository.heartbeat
+    monkeypatch.setattr(
+        WhatsAppBroadcastRepository, "heartbeat",
+        lambda repo, broadcast, now: heartbeats.append(now) or original(repo, broadcast, now)
+    )
+    runner = BroadcastRunner(TokenBucket(rate=1000, capacity=1000), poll_interval=1)
+
+    assert runner.run_next()
+
+    db.expire_all()
+    broadcast = WhatsAppBroadcastRepository(db).get_by_id(broadcast.id)
+    assert broadcast.status == BroadcastStatus.COMPLETED
+    assert WhatsAppBroadcastRepository(db).get_status_counts(broadcast.id) == {RecipientStatus.SENT.value: 3}
+    assert len(heartbeats) == 3
+    assert len(provider.sent) == 3
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.models.whatsapp_message import MessageStatus
+from app.repositories.whatsapp_outbox_repository import WhatsAppOutboxRepository
+from app.services.whatsapp_outbox_service import WhatsAppDispatcher
+from app.services.whatsapp_provider import FakeWhatsAppProvider, WhatsAppProvider, get_whatsapp_provider
+
+MAX_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 60
+
+@pytest.fixture
+def provider():
+    fake = get_whatsapp_provider()
+    assert isinstance(fake, FakeWhatsAppProvider)
+    fake.sent.clear()
+    fake._failures.clear()
+    return fake
+
+@pytest.fixture
+def dispatcher():
+    # Driven by calling dispatch_due directly; the thread is never started
+    return WhatsAppDispatcher(poll_interval=1, max_attempts=MAX_ATTEMPTS, retry_base_seconds=RETRY_BASE_SECONDS)
+
+@pytest.fixture
+def queue(db):
+    def queue_message(body: str = "Hello", sale_id=None):
+        return WhatsAppOutboxRepository(db).create({"to_number": "9876543210", "body": body, "sale_id": sale_id})
+    return queue_message
+
+def reload(db, message):
+    db.expire_all()
+    return WhatsAppOutboxRepository(db).get_by_id(message.id)
+
+def make_due(db, message):
+    """Skip the backoff wait"""
+    message.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+def test_provider_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        WhatsAppProvider()
+
+def test_message_is_sent(db, provider, dispatcher, queue):
+    message = queue("Your tyres are ready")
+
+    assert dispatcher.dispatch_due() == 1
+
+    message = reload(db, message)
+    assert message.status == MessageStatus.SENT
+    assert message.attempts == 1
+    assert message.provider_message_id == provider.sent[0]["sid"]
+    assert provider.sent[0]["to"] == "whatsapp:+919876543210"
+    assert provider.sent[0]["body"] == "Your tyres are ready"
+
+def test_retryable_failure_backs_off_then_sends(db, provider, dispatcher, queue):
+    message = queue()
+    provider.fail_next(1)
+
+    before = datetime.utcnow()
+    dispatcher.dispatch_due()
+
+    message = reload(db, message)
+    assert message.status == MessageStatus.PENDING
+    assert message.attempts == 1
+    assert message.last_error == "Simulated provider failure"
+    # First retry after the base delay, with +/-20% jitter
+    wait = (message.next_attempt_at - before).total_seconds()
+    assert RETRY_BASE_SECONDS * 0.8 - 1 <= wait <= RETRY_BASE_SECONDS * 1.2 + 1
+
+    # Not due yet
+    assert dispatcher.dispatch_due() == 0
+    assert provider.sent == []
+
+    make_due(db, message)
+    assert dispatcher.dispatch_due() == 1
+    message = reload(db, message)
+    assert message.status == MessageStatus.SENT
+    assert message.attempts == 2
+
+def test_dead_lettered_after_max_attempts(db, provider, dispatcher, queue):
+    message = queue()
+    provider.fail_next(MAX_ATTEMPTS)
+
+    for _ in range(MAX_ATTEMPTS):
+        make_due(db, reload(db, message))
+        dispatcher.dispatch_due()
+
+    message = reload(db, message)
+    assert message.status == MessageStatus.DEAD
+    assert message.attempts == MAX_ATTEMPTS
+    assert provider.sent == []
+
+    make_due(db, message)
+    assert dispatcher.dispatch_due() == 0
+
+def test_permanent_failure_is_dead_lettered_at_once(db, provider, dispatcher, queue):
+    message = queue()
+    provider.fail_next(1, retryable=False)
+
+    dispatcher.dispatch_due()
+
+    message = reload(db, message)
+    assert message.status == MessageStatus.DEAD
+    assert message.attempts == 1
+
+def test_local_invoice_without_public_base_url_is_not_sent(db, provider, dispatcher, queue, make_sales, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_BASE_URL", None)
+    sale = make_sales(1)[0]
+    message = queue(sale_id=sale.id)
+
+    dispatcher.dispatch_due()
+
+    message = reload(db, message)
+    assert message.status == MessageStatus.DEAD
+    assert "PUBLIC_BASE_URL" in message.last_error
+    assert provider.sent == []
+
+def test_local_invoice_link_uses_public_base_url(db, provider, dispatcher, queue, make_sales, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_BASE_URL", "https://shop.example.com/")
+    sale = make_sales(1)[0]
+    queue(sale_id=sale.id)
+
+    dispatcher.dispatch_due()
+
+    media_url = provider.sent[0]["media_url"]
+    assert media_url.startswith("https://shop.example.com/")
+    assert media_url.endswith(".pdf")
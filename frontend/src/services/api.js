@@ -4,6 +4,13 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
 console.log('API Base URL:', API_URL)
 
+// Read-your-writes with a read replica: after a write the API answers with the
+// time until which this client must read from the primary. It also sets a
+// cookie, but browsers may block that cross-site cookie (e.g. Safari ITP), so
+// the pin is echoed back as a header instead.
+const READ_PRIMARY_HEADER = 'x-read-primary-until'
+const READ_PRIMARY_KEY = 'readPrimaryUntil'
+
 const api = axios.create({
   baseURL: API_URL,
   headers: {
@@ -15,6 +22,10 @@ const api = axios.create({
 api.interceptors.request.use(
   (config) => {
     console.log('API Request:', config.method?.toUpperCase(), config.url)
+    const readPrimaryUntil = Number(sessionStorage.getItem(READ_PRIMARY_KEY) || 0)
+    if (readPrimaryUntil > Date.now() / 1000) {
+      config.headers[READ_PRIMARY_HEADER] = String(readPrimaryUntil)
+    }
     return config
   },
   (error) => {
@@ -26,6 +37,10 @@ api.interceptors.request.use(
 api.interceptors.response.use(
   (response) => {
     console.log('API Response:', response.status, response.config.url)
+    const readPrimaryUntil = response.headers[READ_PRIMARY_HEADER]
+    if (readPrimaryUntil) {
+      sessionStorage.setItem(READ_PRIMARY_KEY, readPrimaryUntil)
+    }
     return response
   },
   (error) => {